@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for building the pysat.Files list of instrument files."""
+import os
+import shutil
+import tempfile
+
+import pandas as pds
+
+import pysat
+
+# number of synthetic files
+num_files = 10000
+
+
+class TimeFilesRefresh(object):
+    """Time refreshing a list of synthetic pysat_testing filenames."""
+
+    def setup(self):
+        date_range = pds.date_range(pysat.datetime(1990, 1, 1),
+                                    periods=num_files, freq='D')
+        self.inst = pysat.Instrument(platform='pysat', name='testing',
+                                     clean_level='clean',
+                                     file_date_range=date_range,
+                                     temporary_file_list=True)
+
+    def time_refresh(self):
+        self.inst.files.refresh()
+
+
+class TimeFilesFromOS(object):
+    """Time parsing dates from filenames on disk."""
+
+    timeout = 300
+
+    def setup(self):
+        self.data_path = tempfile.mkdtemp()
+        self.format_str = 'pysat_bench_{year:04d}{month:02d}{day:02d}_v01.cdf'
+        date_range = pds.date_range(pysat.datetime(1990, 1, 1),
+                                    periods=num_files, freq='D')
+        for date in date_range:
+            fname = self.format_str.format(year=date.year, month=date.month,
+                                           day=date.day)
+            open(os.path.join(self.data_path, fname), 'w').close()
+
+    def teardown(self):
+        shutil.rmtree(self.data_path)
+
+    def time_from_os(self):
+        pysat.Files.from_os(data_path=self.data_path,
+                            format_str=self.format_str)
+
+
+class TimeFilesFromOSIncremental(object):
+    """Time an incremental search of files in unchanged year directories.
+    """
+
+    timeout = 300
+
+    def setup(self):
+        self.data_path = os.path.join(tempfile.mkdtemp(), '')
+        self.format_str = ''.join(('{year:04d}/pysat_bench_{year:04d}',
+                                   '{month:02d}{day:02d}_v01.cdf'))
+        date_range = pds.date_range(pysat.datetime(1990, 1, 1),
+                                    periods=num_files, freq='D')
+        for date in date_range:
+            fname = self.format_str.format(year=date.year, month=date.month,
+                                           day=date.day)
+            fname = os.path.join(self.data_path, fname)
+            if not os.path.isdir(os.path.dirname(fname)):
+                os.makedirs(os.path.dirname(fname))
+            open(fname, 'w').close()
+        # directories modified a while ago, as for a daily cron job
+        for sdir in os.listdir(self.data_path):
+            os.utime(os.path.join(self.data_path, sdir), (0, 0))
+        # directory state from a previous incremental search
+        self.state = {}
+        self.time_from_os_incremental()
+
+    def teardown(self):
+        shutil.rmtree(self.data_path)
+
+    def time_from_os(self):
+        pysat.Files.from_os(data_path=self.data_path,
+                            format_str=self.format_str)
+
+    def time_from_os_incremental(self):
+        pysat._files._scan.state = self.state
+        try:
+            pysat.Files.from_os(data_path=self.data_path,
+                                format_str=self.format_str)
+        finally:
+            pysat._files._scan.state = None
+
+
+class TimeParseFilenames(object):
+    """Time parsing dates from a list of a million filenames."""
+
+    def setup(self):
+        self.fixed_str = 'pysat_bench_{year:04d}{month:02d}{day:02d}_v01.cdf'
+        self.delimited_str = ''.join(('pysat_bench_{year:04d}_{month:02d}_',
+                                      '{day:02d}_v01.cdf'))
+        self.doy_str = 'pysat_bench_{year:04d}{doy:03d}_v01.cdf'
+        self.fixed = []
+        self.delimited = []
+        self.doy = []
+        for i in range(1000000):
+            year = 1000 + i // 365
+            month = 1 + (i // 28) % 12
+            day = 1 + i % 28
+            doy = 1 + i % 365
+            self.fixed.append(self.fixed_str.format(year=year, month=month,
+                                                    day=day))
+            self.delimited.append(self.delimited_str.format(year=year,
+                                                            month=month,
+                                                            day=day))
+            self.doy.append(self.doy_str.format(year=year, doy=doy))
+
+    def time_parse_fixed_width(self):
+        pysat._files.parse_fixed_width_filenames(self.fixed, self.fixed_str)
+
+    def time_parse_delimited(self):
+        pysat._files.parse_delimited_filenames(self.delimited,
+                                               self.delimited_str, '_')
+
+    def time_parse_process_doy(self):
+        stored = pysat._files.parse_fixed_width_filenames(self.doy,
+                                                          self.doy_str)
+        pysat._files.process_parsed_filenames(stored)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for loading data through pysat.Instrument.
+
+Run with airspeed velocity, e.g. `asv run` or `asv dev` from the repository
+root. Results are stored as JSON under .asv/results.
+
+Benchmarks are parametrized by test instrument and by the number of samples
+per day, which the pysat_testing instruments take from sat_id.
+"""
+import pandas as pds
+
+import pysat
+
+# test instruments supporting sat_id as the number of samples per day
+instruments = ['pysat_testing', 'pysat_testing_xarray']
+samples = ['8640', '86400']
+
+
+def custom_sum(inst):
+    """Custom function adding a variable to the Instrument."""
+    return inst['mlt'] + inst['longitude']
+
+
+def custom_modify(inst):
+    """Custom function modifying the Instrument in place."""
+    inst['mlt_deg'] = inst['mlt'] * 15.
+
+
+class TimePaddedLoad(object):
+    """Time and peak memory of padded loads of the pysat_testing instrument.
+    """
+
+    params = (instruments, samples)
+    param_names = ['instrument', 'sat_id']
+
+    def setup(self, name, sat_id):
+        self.inst = pysat.Instrument(platform='pysat', name=name[6:],
+                                     sat_id=sat_id, clean_level='clean',
+                                     pad=pds.DateOffset(minutes=5),
+                                     update_files=True)
+        self.date = pysat.datetime(2009, 1, 2)
+        # prime the padding window so next-day loads are measured separately
+        self.inst.load(date=self.date)
+
+    def time_load_padded(self, name, sat_id):
+        self.inst.load(date=self.date + pds.DateOffset(days=5))
+
+    def time_load_padded_next(self, name, sat_id):
+        self.inst.next()
+
+    def time_load_padded_verify(self, name, sat_id):
+        self.inst.load(date=self.date + pds.DateOffset(days=5),
+                       verifyPad=True)
+
+    def peakmem_load_padded(self, name, sat_id):
+        self.inst.load(date=self.date + pds.DateOffset(days=5))
+
+
+class TimeUnpaddedLoad(object):
+    """Time and peak memory of loads without padding, for reference."""
+
+    params = (instruments, samples)
+    param_names = ['instrument', 'sat_id']
+
+    def setup(self, name, sat_id):
+        self.inst = pysat.Instrument(platform='pysat', name=name[6:],
+                                     sat_id=sat_id, clean_level='clean',
+                                     update_files=True)
+        self.date = pysat.datetime(2009, 1, 2)
+
+    def time_load(self, name, sat_id):
+        self.inst.load(date=self.date)
+
+    def peakmem_load(self, name, sat_id):
+        self.inst.load(date=self.date)
+
+
+class TimeLoad2D(object):
+    """Time loads of the pysat_testing2d instrument, with DataFrame profiles.
+    """
+
+    def setup(self):
+        self.inst = pysat.Instrument(platform='pysat', name='testing2d',
+                                     clean_level='clean', update_files=True)
+        self.date = pysat.datetime(2009, 1, 2)
+
+    def time_load(self):
+        self.inst.load(date=self.date)
+
+
+class TimeIteration(object):
+    """Time iteration over a month of data, by day and by orbit."""
+
+    params = (instruments, samples)
+    param_names = ['instrument', 'sat_id']
+    timeout = 300
+
+    def setup(self, name, sat_id):
+        self.inst = pysat.Instrument(platform='pysat', name=name[6:],
+                                     sat_id=sat_id, clean_level='clean',
+                                     orbit_info={'index': 'mlt'},
+                                     update_files=True)
+
+    def time_iterate_month(self, name, sat_id):
+        self.inst.bounds = (pysat.datetime(2009, 1, 1),
+                            pysat.datetime(2009, 1, 31))
+        for inst in self.inst:
+            pass
+
+    def time_iterate_orbits(self, name, sat_id):
+        self.inst.bounds = (pysat.datetime(2009, 1, 1),
+                            pysat.datetime(2009, 1, 3))
+        for inst in self.inst.orbits:
+            pass
+
+
+class TimeCustom(object):
+    """Time application of custom functions to loaded data."""
+
+    params = (instruments, samples)
+    param_names = ['instrument', 'sat_id']
+
+    def setup(self, name, sat_id):
+        self.inst = pysat.Instrument(platform='pysat', name=name[6:],
+                                     sat_id=sat_id, clean_level='clean',
+                                     update_files=True)
+        self.inst.load(date=pysat.datetime(2009, 1, 2))
+        self.inst.custom.add(custom_sum, 'add')
+        self.inst.custom.add(custom_modify, 'modify')
+        self.data = self.inst.data.copy()
+
+    def time_apply_all(self, name, sat_id):
+        self.inst.data = self.data
+        self.inst.custom._apply_all(self.inst)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for assigning metadata with pysat.Meta."""
+import pysat
+
+# number of variables assigned
+num_vars = 200
+
+
+class TimeMetaSetItem(object):
+    """Time assigning metadata one variable at a time, and all at once."""
+
+    def setup(self):
+        self.names = ['var{:d}'.format(i) for i in range(num_vars)]
+
+    def time_setitem_single(self):
+        meta = pysat.Meta()
+        for name in self.names:
+            meta[name] = {'units': 'm/s', 'long_name': name}
+
+    def time_setitem_multiple(self):
+        meta = pysat.Meta()
+        meta[self.names] = {'units': ['m/s'] * num_vars,
+                            'long_name': self.names}
+
+    def time_setitem_higher_order(self):
+        meta = pysat.Meta()
+        for name in self.names[:20]:
+            sub = pysat.Meta()
+            sub['density'] = {'units': 'N/cc', 'long_name': 'density'}
+            sub['altitude'] = {'units': 'km', 'long_name': 'altitude'}
+            meta[name] = {'meta': sub}
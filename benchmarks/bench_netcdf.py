@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for writing and reading pysat netCDF4 files."""
+import os
+import shutil
+import tempfile
+
+import netCDF4
+import numpy as np
+import pandas as pds
+
+import pysat
+
+
+class TimeNetCDF4(object):
+    """Time netCDF4 round trips of one day of test instrument data."""
+
+    params = ['testing', 'testing2d']
+    param_names = ['instrument']
+    timeout = 300
+
+    def setup(self, name):
+        self.inst = pysat.Instrument(platform='pysat', name=name,
+                                     clean_level='clean', update_files=True)
+        self.inst.load(date=pysat.datetime(2009, 1, 2))
+        self.path = tempfile.mkdtemp()
+        self.fname = os.path.join(self.path, 'pysat_bench.nc')
+        self.inst.to_netcdf4(self.fname)
+        self.out_fname = os.path.join(self.path, 'pysat_bench_out.nc')
+
+    def teardown(self, name):
+        shutil.rmtree(self.path)
+
+    def time_to_netcdf4(self, name):
+        self.inst.to_netcdf4(self.out_fname)
+
+    def time_load_netcdf4(self, name):
+        pysat.utils.load_netcdf4(self.fname)
+
+    def peakmem_load_netcdf4(self, name):
+        pysat.utils.load_netcdf4(self.fname)
+
+
+class TimeLoadNetCDF4Profiles(object):
+    """Time loading profiles, 10k times by 100 altitude bins, from netCDF4.
+
+    Compare load_netcdf4 against an earlier commit with, e.g.,
+    `asv continuous <commit> HEAD -b TimeLoadNetCDF4Profiles`.
+    """
+
+    params = [1, 4]
+    param_names = ['variables']
+    timeout = 300
+
+    def setup(self, num_vars):
+        num_times = 10000
+        num_alts = 100
+        self.path = tempfile.mkdtemp()
+        self.fname = os.path.join(self.path, 'pysat_bench_profiles.nc')
+        epoch = pds.date_range(pysat.datetime(2009, 1, 1), periods=num_times,
+                               freq='10S')
+        with netCDF4.Dataset(self.fname, mode='w', format='NETCDF4') as data:
+            data.createDimension('Epoch', num_times)
+            data.createDimension('profiles', num_alts)
+            cdfkey = data.createVariable('Epoch', 'i8', dimensions=('Epoch'))
+            cdfkey.setncatts({'long_name': 'Epoch'})
+            cdfkey[:] = (epoch.values.astype(np.int64) *
+                         1.E-6).astype(np.int64)
+            for i in range(num_vars):
+                key = 'profiles_density{:d}'.format(i)
+                cdfkey = data.createVariable(key, 'f8',
+                                             dimensions=('Epoch', 'profiles'))
+                cdfkey.setncatts({'long_name': key})
+                cdfkey[:, :] = np.random.rand(num_times, num_alts)
+            cdfkey = data.createVariable('profiles', 'f8',
+                                         dimensions=('Epoch', 'profiles'))
+            cdfkey.setncatts({'long_name': 'altitude'})
+            cdfkey[:, :] = np.tile(np.arange(num_alts) * 5., (num_times, 1))
+
+    def teardown(self, num_vars):
+        shutil.rmtree(self.path)
+
+    def time_load_netcdf4(self, num_vars):
+        pysat.utils.load_netcdf4(self.fname)
+
+    def peakmem_load_netcdf4(self, num_vars):
+        pysat.utils.load_netcdf4(self.fname)
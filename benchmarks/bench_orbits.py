@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for determining orbit breaks in pysat.Orbits.
+
+Run with airspeed velocity, e.g. `asv run` or `asv dev` from the repository
+root.
+"""
+import numpy as np
+
+import pysat
+
+
+class TimeEquaBreaks(object):
+    """Time equatorial orbit breaks for a day of 1 Hz MLT, with noise."""
+
+    params = [0., 0.05, 0.5]
+    param_names = ['noise']
+
+    def setup(self, noise):
+        self.inst = pysat.Instrument(platform='pysat', name='testing',
+                                     clean_level='clean',
+                                     orbit_info={'index': 'mlt'},
+                                     update_files=True)
+        self.inst.load(date=pysat.datetime(2009, 1, 2))
+        rand = np.random.RandomState(0)
+        self.inst['mlt'] = (self.inst['mlt'] +
+                            rand.normal(0., noise, len(self.inst.index))) % 24.
+
+    def time_equa_breaks(self, noise):
+        self.inst.orbits._equaBreaks(orbit_index_period=24.)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks for seasonal analysis routines in pysat.ssnl."""
+import warnings
+
+import pysat
+
+
+class TimeMedian2D(object):
+    """Time the 2D median of data over a season."""
+
+    params = ['8640', '86400']
+    param_names = ['sat_id']
+    timeout = 600
+
+    def setup(self, sat_id):
+        self.inst = pysat.Instrument(platform='pysat', name='testing',
+                                     sat_id=sat_id, clean_level='clean',
+                                     update_files=True)
+        self.inst.bounds = (pysat.datetime(2009, 1, 1),
+                            pysat.datetime(2009, 1, 5))
+
+    def time_median2D(self, sat_id):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            pysat.ssnl.avg.median2D(self.inst, [0., 360., 24], 'longitude',
+                                    [0., 24., 24], 'mlt',
+                                    ['dummy1', 'dummy2', 'dummy3'])
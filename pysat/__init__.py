@@ -39,8 +39,13 @@ Main Features
 # -*- coding: utf-8 -*-
 from __future__ import print_function
 from __future__ import absolute_import
+import logging
 import os
 
+# pysat reports status through the logging module, silent unless configured,
+# e.g. logging.basicConfig(level=logging.INFO)
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 
 # set version
 here = os.path.abspath(os.path.dirname(__file__))
@@ -83,6 +88,7 @@ from ._meta import Meta
 from ._files import Files
 from ._custom import Custom
 from ._orbits import Orbits
+from ._cache import load_cache, orbit_cache
 from . import instruments
 from . import ssnl
 
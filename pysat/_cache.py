@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+"""Caches for loaded and processed Instrument data.
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+
+import functools
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
+# default size limit for on-disk processed data, 2 GB
+DEFAULT_DISK_CACHE_SIZE = 2 * 1024**3
+
+
+def _func_id(func):
+    """Identify a function by name and compiled code.
+
+    Parameters
+    ----------
+    func : function, functools.partial, or string
+        function to be identified
+
+    Returns
+    -------
+    tuple
+        module, name, and hash of bytecode (and constants) of function.
+        Partial functions also include the stored arguments.
+
+    Note
+    ----
+    Code objects nested in the function, e.g. comprehensions, lambdas, and
+    inner functions, are hashed by their bytecode and constants as well, so
+    the id is the same in every interpreter session. Stored arguments are
+    identified by repr, which for objects without a custom __repr__ includes
+    a memory address that differs between sessions.
+
+    """
+
+    if isinstance(func, functools.partial):
+        return (_func_id(func.func), tuple(repr(arg) for arg in func.args),
+                sorted((key, repr(val)) for key, val in
+                       (func.keywords or {}).items()))
+
+    module = getattr(func, '__module__', None)
+    name = getattr(func, '__name__', repr(func))
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return (module, name)
+    code_hash = hashlib.sha1()
+    _update_code_hash(code_hash, code)
+    return (module, name, code_hash.hexdigest())
+
+
+def _update_code_hash(code_hash, code):
+    """Add bytecode and constants of code, and any nested code, to hash."""
+
+    code_hash.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_hash(code_hash, const)
+        else:
+            code_hash.update(repr(const).encode('utf-8'))
+
+
+def make_key(*args):
+    """Hash supplied arguments into a key for the cache.
+
+    Parameters
+    ----------
+    *args :
+        values whose repr uniquely identify an item. Dictionaries are
+        sorted by key before hashing.
+
+    Returns
+    -------
+    str
+        sha1 hex digest
+
+    """
+
+    def _normalize(item):
+        if isinstance(item, dict):
+            return sorted((key, _normalize(val)) for key, val in item.items())
+        if isinstance(item, (list, tuple)):
+            return [_normalize(val) for val in item]
+        return repr(item)
+
+    return hashlib.sha1(repr(_normalize(args)).encode('utf-8')).hexdigest()
+
+
+class DiskCache(object):
+    """Least recently used on-disk store of processed data, one file per day.
+
+    Parameters
+    ----------
+    path : str
+        directory used to store data
+    max_size : int
+        Limit on total size of stored data in bytes. Least recently
+        used items are removed when exceeded. (default=2 GB)
+
+    Note
+    ----
+    Items are pickled (pandas and xarray objects are stored by data block)
+    and written atomically. Reads update the file modification time, which
+    is used to identify the least recently used items.
+
+    """
+
+    def __init__(self, path, max_size=None):
+        self.path = path
+        self.max_size = (DEFAULT_DISK_CACHE_SIZE if max_size is None
+                         else max_size)
+
+    def __repr__(self):
+        return ''.join(('pysat DiskCache(path=', repr(self.path),
+                        ', max_size=', str(self.max_size), ')'))
+
+    def _fname(self, date, key):
+        """Filename for item with date and key."""
+
+        return os.path.join(self.path, ''.join((date.strftime('%Y-%m-%d'),
+                                                '_', key, '.pkl')))
+
+    def get(self, date, key):
+        """Return stored item for date and key, or None if not present."""
+
+        fname = self._fname(date, key)
+        try:
+            with open(fname, 'rb') as fin:
+                item = pickle.load(fin)
+        except Exception:
+            # missing, or unreadable (e.g. written by another pandas version)
+            return None
+        # mark as recently used
+        try:
+            os.utime(fname, None)
+        except OSError:
+            pass
+        return item
+
+    def put(self, date, key, item):
+        """Store item under date and key, then enforce size limit."""
+
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                # created by another process
+                if not os.path.isdir(self.path):
+                    raise
+        fname = self._fname(date, key)
+        # write to temporary file first so readers never see partial items
+        fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fout:
+                pickle.dump(item, fout, protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                os.rename(tmp_name, fname)
+            except OSError:
+                # windows won't rename over an existing file
+                os.remove(fname)
+                os.rename(tmp_name, fname)
+        except Exception:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        self._evict()
+
+    def _items(self):
+        """List of (mtime, size, filename) for stored items."""
+
+        items = []
+        for fname in glob.glob(os.path.join(self.path, '*.pkl')):
+            try:
+                stat = os.stat(fname)
+            except OSError:
+                continue
+            items.append((stat.st_mtime, stat.st_size, fname))
+        return items
+
+    @property
+    def size(self):
+        """Total size of stored items in bytes."""
+
+        return sum(item[1] for item in self._items())
+
+    def _evict(self):
+        """Remove least recently used items until within max_size."""
+
+        items = sorted(self._items())
+        total = sum(item[1] for item in items)
+        for mtime, size, fname in items:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+            total -= size
+
+    def invalidate(self, date):
+        """Remove all stored items for date.
+
+        Parameters
+        ----------
+        date : datetime
+            date of items to be removed
+
+        """
+
+        pattern = os.path.join(self.path, ''.join((date.strftime('%Y-%m-%d'),
+                                                   '_*.pkl')))
+        for fname in glob.glob(pattern):
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all stored items."""
+
+        for mtime, size, fname in self._items():
+            try:
+                os.remove(fname)
+            except OSError:
+                pass
+
+
+def nbytes(data):
+    """Approximate memory used by pandas or xarray data, in bytes."""
+
+    try:
+        # pandas
+        return int(data.memory_usage(index=True).sum())
+    except AttributeError:
+        # xarray
+        return int(data.nbytes)
+
+
+class LoadCache(object):
+    """Least recently used in-memory store of loaded data, shared by process.
+
+    Parameters
+    ----------
+    max_size : int
+        Limit on memory used by stored data, in bytes. Least recently used
+        items are removed when exceeded. A limit of zero disables the cache.
+        (default=0)
+
+    Attributes
+    ----------
+    hits : int
+        number of successful lookups
+    misses : int
+        number of unsuccessful lookups
+
+    Note
+    ----
+    Copies are stored, and a copy is returned on every lookup, so loaded
+    data may be modified freely. Safe to use from multiple threads.
+
+    Examples
+    --------
+    ::
+
+        # keep up to 1 GB of files in memory across all Instruments
+        pysat.load_cache.max_size = 1024**3
+
+    """
+
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return ''.join(('pysat LoadCache(max_size=', str(self.max_size),
+                        ', size=', str(self.size), ', items=',
+                        str(len(self._items)), ', hits=', str(self.hits),
+                        ', misses=', str(self.misses), ')'))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def enabled(self):
+        """True if items will be stored."""
+
+        return self.max_size > 0
+
+    def get(self, key):
+        """Return a copy of the (data, meta) stored under key, or None."""
+
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # mark as most recently used
+            item = self._items.pop(key)
+            self._items[key] = item
+        data, meta, size = item
+        return data.copy(), meta.copy()
+
+    def put(self, key, data, meta):
+        """Store copies of data and meta under key."""
+
+        size = nbytes(data)
+        if size > self.max_size:
+            return
+        item = (data.copy(), meta.copy(), size)
+        with self._lock:
+            if key in self._items:
+                self.size -= self._items.pop(key)[2]
+            self._items[key] = item
+            self.size += size
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used items until within max_size."""
+
+        while (self.size > self.max_size) and (len(self._items) > 0):
+            self.size -= self._items.popitem(last=False)[1][2]
+
+    def clear(self):
+        """Remove all stored items and reset counters."""
+
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+class OrbitBreakCache(object):
+    """Least recently used in-memory store of orbit break indices.
+
+    Parameters
+    ----------
+    max_items : int
+        Limit on the number of days (or other loads) with stored breaks.
+        Least recently used items are removed when exceeded. A limit of
+        zero disables the cache. (default=10000)
+
+    Attributes
+    ----------
+    hits : int
+        number of successful lookups
+    misses : int
+        number of unsuccessful lookups
+
+    Note
+    ----
+    Items are keyed by Instrument, date, orbit_info, and a hash of the
+    times and orbit index values the breaks were determined from, so
+    modified or reprocessed data is never matched with stale breaks.
+    The cache may be stored with `save` and restored with `load`.
+
+    Examples
+    --------
+    ::
+
+        pysat.orbit_cache.load('orbit_breaks.pkl')
+        for inst in inst.orbits:
+            pass
+        pysat.orbit_cache.save('orbit_breaks.pkl')
+
+    """
+
+    def __init__(self, max_items=10000):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return ''.join(('pysat OrbitBreakCache(max_items=',
+                        str(self.max_items), ', items=',
+                        str(len(self._items)), ', hits=', str(self.hits),
+                        ', misses=', str(self.misses), ')'))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def enabled(self):
+        """True if items will be stored."""
+
+        return self.max_items > 0
+
+    def get(self, key):
+        """Return a copy of the orbit breaks stored under key, or None."""
+
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # mark as most recently used
+            breaks = self._items.pop(key)
+            self._items[key] = breaks
+        return breaks.copy()
+
+    def put(self, key, breaks):
+        """Store a copy of orbit breaks under key."""
+
+        if not self.enabled:
+            return
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = np.array(breaks)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Remove all stored items and reset counters."""
+
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, fname):
+        """Store the cached breaks in a file.
+
+        Parameters
+        ----------
+        fname : str
+            name of file
+
+        """
+
+        with self._lock:
+            items = list(self._items.items())
+        with open(fname, 'wb') as fout:
+            pickle.dump(items, fout, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, fname):
+        """Add the breaks stored in a file by `save` to the cache.
+
+        Parameters
+        ----------
+        fname : str
+            name of file
+
+        """
+
+        with open(fname, 'rb') as fin:
+            items = pickle.load(fin)
+        for key, breaks in items:
+            self.put(key, breaks)
+
+
+# in-memory cache of loaded files shared by all Instruments, off by default
+load_cache = LoadCache()
+
+# in-memory cache of orbit breaks shared by all Instruments
+orbit_cache = OrbitBreakCache()
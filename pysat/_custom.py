@@ -212,6 +212,8 @@ class Custom(object):
 
                     # modifying loaded data
                     if kind == 'modify':
+                        # may modify the data directly
+                        sat._copy_on_write()
                         t = func(sat, *arg, **kwarg)
                         if t is not None:
                             raise ValueError(''.join(('Modified functions',
@@ -6,10 +6,128 @@ import os
 import weakref
 import re
 import glob
+import logging
+import struct
+import tempfile
+import threading
+import time
 import numpy as np
 import pandas as pds
 from pysat import data_dir as data_dir
 
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+logger = logging.getLogger(__name__)
+
+# stored file lists are binary catalogs, a fixed size header followed by
+# int64 file times (ns) and NUL separated UTF-8 file names
+_CATALOG_MAGIC = b'PYSATCAT'
+_CATALOG_VERSION = 1
+# magic, version, reserved, number of files, size of file names in bytes
+_CATALOG_HEADER = struct.Struct('<8sIIQQ')
+
+# directory state of the file search in progress during an incremental
+# Files.refresh, used by Files.from_os
+_scan = threading.local()
+# directories modified this close to a search are searched again next time,
+# as later changes within the resolution of the file system may be missed
+_SCAN_RACY_SECONDS = 2.
+# format of the stored directory state
+_DIR_STATE_VERSION = 2
+# keys that may be parsed from filenames, in the order they are stored
+_PARSED_KEYS = ['year', 'month', 'day', 'doy', 'hour', 'minute', 'second',
+                'version', 'revision']
+
+
+def _write_atomic(fname, contents):
+    """Write bytes to a temporary file that replaces fname.
+
+    Readers never see a partially written file.
+
+    """
+
+    fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(fname),
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fout:
+            fout.write(contents)
+        try:
+            os.rename(tmp_name, fname)
+        except OSError:
+            # windows won't rename over an existing file
+            os.remove(fname)
+            os.rename(tmp_name, fname)
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def _write_catalog(fname, files):
+    """Store a list of files as a binary catalog.
+
+    Parameters
+    ----------
+    fname : string
+        full path of catalog
+    files : pandas.Series
+        file names indexed by datetime
+
+    Note
+    ----
+    The catalog is written to a temporary file that replaces fname, so
+    readers never see a partial catalog.
+
+    """
+
+    epochs = files.index.values.astype('datetime64[ns]').astype('<i8')
+    names = '\0'.join(files.values)
+    if not isinstance(names, bytes):
+        names = names.encode('utf-8')
+    header = _CATALOG_HEADER.pack(_CATALOG_MAGIC, _CATALOG_VERSION, 0,
+                                  len(files), len(names))
+    _write_atomic(fname, b''.join((header, epochs.tobytes(), names)))
+
+
+def _read_catalog(fname):
+    """Load a list of files from a binary catalog.
+
+    Parameters
+    ----------
+    fname : string
+        full path of catalog
+
+    Returns
+    -------
+    pandas.Series or NoneType
+        file names indexed by datetime, None if fname is not a catalog
+        of a supported version
+
+    """
+
+    raw = np.memmap(fname, dtype=np.uint8, mode='r')
+    try:
+        if len(raw) < _CATALOG_HEADER.size:
+            return None
+        magic, version, _, num, num_bytes = \
+            _CATALOG_HEADER.unpack(raw[:_CATALOG_HEADER.size].tobytes())
+        start = _CATALOG_HEADER.size
+        stop = start + 8 * num
+        if (magic != _CATALOG_MAGIC) or (version > _CATALOG_VERSION) or \
+                (len(raw) != stop + num_bytes):
+            return None
+        if num == 0:
+            return pds.Series([], dtype='a')
+        index = pds.DatetimeIndex(np.array(raw[start:stop].view('<i8'),
+                                           dtype='datetime64[ns]'))
+        names = raw[stop:].tobytes().decode('utf-8').split(u'\0')
+    finally:
+        del raw
+    return pds.Series(names, index=index)
+
 
 class Files(object):
     """Maintains collection of files for instrument object.
@@ -126,7 +244,16 @@ class Files(object):
         self.stored_file_name = ''.join((self._sat.platform, '_',
                                          self._sat.name, '_', self._sat.tag,
                                          '_', self._sat.sat_id,
-                                         '_stored_file_info.txt'))
+                                         '_stored_file_info.bin'))
+        # file lists stored as CSV by earlier versions of pysat
+        self._csv_file_name = ''.join((self.stored_file_name[:-4], '.txt'))
+        # catalogs most recently read or written, with the file status
+        # they were read at, so unchanged catalogs aren't read again
+        self._catalogs = {}
+        # directory state of file searches, for incremental refresh
+        self._dir_state_name = ''.join((self.stored_file_name[:-4],
+                                        '_dirs.pkl'))
+        self._dir_state = None
 
         # flag for setting simple organization of files, only
         # look under pysat_data_dir
@@ -196,8 +323,8 @@ class Files(object):
         # remove filenames as needed
         dropped_num = len(self.files.index) - len(keep_index)
         if dropped_num > 0:
-            print(' '.join(('Removing', str(dropped_num),
-                  'empty files from Instrument list.')))
+            logger.info(' '.join(('Removing', str(dropped_num),
+                                  'empty files from Instrument list.')))
             self.files = self.files.iloc[keep_index]
 
 
@@ -221,8 +348,9 @@ class Files(object):
                 estr = 'WARNING! Duplicate datetimes in provided file '
                 estr = '{:s}information.\nKeeping one of each '.format(estr)
                 estr = '{:s}of the duplicates, dropping the rest.'.format(estr)
-                print(estr)
-                print(files_info.index[files_info.index.duplicated()].unique())
+                logger.warning(estr)
+                logger.warning(str(files_info.index[
+                    files_info.index.duplicated()].unique()))
 
                 idx = np.unique(files_info.index, return_index=True)
                 files_info = files_info.iloc[idx[1]]
@@ -264,18 +392,55 @@ class Files(object):
         if new_flag:
 
             if self.write_to_disk:
-                stored_files.to_csv(os.path.join(self.home_path,
-                                                 'previous_'+name),
-                                    date_format='%Y-%m-%d %H:%M:%S.%f',
-                                    header=False)
-                self.files.to_csv(os.path.join(self.home_path, name),
-                                  date_format='%Y-%m-%d %H:%M:%S.%f',
-                                  header=False)
+                self._write_stored(os.path.join(self.home_path,
+                                                'previous_' + name),
+                                   stored_files)
+                self._write_stored(os.path.join(self.home_path, name),
+                                   self.files)
             else:
                 self._previous_file_list = stored_files
                 self._current_file_list = self.files.copy()
+        elif self.write_to_disk:
+            # file lists stored as CSV by earlier versions of pysat are
+            # replaced by a catalog, even if unchanged
+            fname = os.path.join(self.home_path, name)
+            if not os.path.isfile(fname):
+                self._write_stored(fname, self.files)
         return
 
+    def _write_stored(self, fname, files):
+        """Write a binary catalog of files and remember what was written"""
+
+        _write_catalog(fname, files)
+        stat = os.stat(fname)
+        self._catalogs[fname] = ((stat.st_mtime, stat.st_size, stat.st_ino),
+                                 files)
+
+    def _read_stored(self, fname):
+        """Read a binary catalog of files, unless already read
+
+        Returns
+        -------
+        pandas.Series or NoneType
+            Full path file names are indexed by datetime
+            None if fname is not a supported catalog
+        """
+
+        stat = os.stat(fname)
+        stat = (stat.st_mtime, stat.st_size, stat.st_ino)
+        if fname in self._catalogs:
+            stored_stat, files = self._catalogs[fname]
+            if stored_stat == stat:
+                return files
+        files = _read_catalog(fname)
+        if files is None:
+            logger.warning(' '.join(('Ignoring stored file list', fname,
+                                     'written by an unsupported version',
+                                     'of pysat.')))
+        else:
+            self._catalogs[fname] = (stat, files)
+        return files
+
     def _load(self, prev_version=False):
         """Load stored filelist and return as Pandas Series
 
@@ -289,28 +454,76 @@ class Files(object):
         pandas.Series
             Full path file names are indexed by datetime
             Series is empty if there is no file list to load
+
+        Note
+        ----
+        File lists stored as CSV by earlier versions of pysat are read if
+        there is no binary catalog, and are replaced by a catalog the next
+        time the list is stored, even if the list is unchanged.
         """
 
         fname = self.stored_file_name
+        csv_fname = self._csv_file_name
         if prev_version:
             fname = os.path.join(self.home_path, 'previous_'+fname)
+            csv_fname = os.path.join(self.home_path, 'previous_'+csv_fname)
         else:
             fname = os.path.join(self.home_path, fname)
+            csv_fname = os.path.join(self.home_path, csv_fname)
 
         if os.path.isfile(fname) and (os.path.getsize(fname) > 0):
-            if self.write_to_disk:
-                return pds.read_csv(fname, index_col=0, parse_dates=True,
+            csv_fname = None
+        elif not (os.path.isfile(csv_fname) and
+                  (os.path.getsize(csv_fname) > 0)):
+            return pds.Series([], dtype='a')
+
+        if self.write_to_disk:
+            if csv_fname is not None:
+                return pds.read_csv(csv_fname, index_col=0, parse_dates=True,
                                     squeeze=True, header=None)
-            else:
-                # grab files from memory
-                if prev_version:
-                    return self._previous_file_list
-                else:
-                    return self._current_file_list
+            files = self._read_stored(fname)
+            if files is None:
+                return pds.Series([], dtype='a')
+            return files
         else:
-            return pds.Series([], dtype='a')
+            # grab files from memory
+            if prev_version:
+                return self._previous_file_list
+            else:
+                return self._current_file_list
+
+    def _load_dir_state(self):
+        """Directory state of previous file searches, {} if unavailable"""
 
-    def refresh(self):
+        if self._dir_state is None:
+            self._dir_state = {}
+            fname = os.path.join(self.home_path, self._dir_state_name)
+            if self.write_to_disk and os.path.isfile(fname):
+                try:
+                    with open(fname, 'rb') as fin:
+                        version, state = pickle.load(fin)
+                    if version == _DIR_STATE_VERSION:
+                        self._dir_state = state
+                except Exception:
+                    # e.g. state written with other numpy or pandas versions
+                    logger.warning(' '.join(('Ignoring unreadable directory',
+                                             'state', fname)))
+        return self._dir_state
+
+    def _store_dir_state(self):
+        """Store directory state of file searches onto filesystem"""
+
+        # only keep searches of the current data path
+        self._dir_state = dict((key, value) for key, value
+                               in self._dir_state.items()
+                               if key[0] == self.data_path)
+        if self.write_to_disk:
+            fname = os.path.join(self.home_path, self._dir_state_name)
+            state = pickle.dumps((_DIR_STATE_VERSION, self._dir_state),
+                                 protocol=pickle.HIGHEST_PROTOCOL)
+            _write_atomic(fname, state)
+
+    def refresh(self, incremental=False):
         """Update list of files, if there are changes.
 
         Calls underlying list_rtn for the particular science instrument.
@@ -318,6 +531,28 @@ class Files(object):
         pysat_data_dir/platform/name/tag/,
         where pysat_data_dir is set by pysat.utils.set_data_dir(path=path).
 
+        Parameters
+        ----------
+        incremental : bool
+            If True, directories that have not changed since the last
+            incremental refresh are not searched again, and their files are
+            not parsed again. Applies to instruments that list files with
+            Files.from_os. (default=False)
+
+        Note
+        ----
+        Incremental refreshes record the modification time and link count
+        of each directory searched, in the user_home/.pysat directory.
+        A directory is searched again when either changes, which happens
+        when files or sub-directories are added, removed, or renamed.
+
+        Examples
+        --------
+        ::
+
+            # hourly update of the file list
+            inst = pysat.Instrument('cnofs', 'ivm')
+            inst.files.refresh(incremental=True)
 
         """
 
@@ -327,21 +562,29 @@ class Files(object):
                                        sat_id=self._sat.sat_id)
         output_str = " ".join(("pysat is searching for", output_str, "files."))
         output_str = " ".join(output_str.split())
-        print(output_str)
-
-        info = self._sat._list_rtn(tag=self._sat.tag, sat_id=self._sat.sat_id,
-                                   data_path=self.data_path,
-                                   format_str=self.file_format)
+        logger.info(output_str)
+
+        if incremental:
+            _scan.state = self._load_dir_state()
+        try:
+            info = self._sat._list_rtn(tag=self._sat.tag,
+                                       sat_id=self._sat.sat_id,
+                                       data_path=self.data_path,
+                                       format_str=self.file_format)
+        finally:
+            _scan.state = None
+        if incremental:
+            self._store_dir_state()
         info = self._remove_data_dir_path(info)
         if not info.empty:
             if self.ignore_empty_files:
                 self._filter_empty_files()
-            print('Found {ll:d} of them.'.format(ll=len(info)))
+            logger.info('Found {ll:d} of them.'.format(ll=len(info)))
         else:
             estr = "Unable to find any files that match the supplied template."
             estr += " If you have the necessary files please check pysat "
             estr += "settings and file locations (e.g. pysat.pysat_dir)."
-            print(estr)
+            logger.warning(estr)
         # attach to object
         self._attach_files(info)
         # store - to disk, if enabled
@@ -494,8 +737,8 @@ class Files(object):
         format_str : string with python format codes
             Provides the naming pattern of the instrument files and the
             locations of date information so an ordered list may be produced.
-            Supports 'year', 'month', 'day', 'hour', 'minute', 'second',
-            'version', and 'revision'
+            Supports 'year', 'month', 'day', 'doy', 'hour', 'minute',
+            'second', 'version', and 'revision'
             Ex: 'cnofs_cindi_ivm_500ms_{year:4d}{month:02d}{day:02d}_v01.cdf'
         two_digit_year_break : int
             If filenames only store two digits for the year, then
@@ -530,14 +773,20 @@ class Files(object):
         search_dict = construct_searchstring_from_format(format_str,
                                                          wildcard=wildcard)
         search_str = search_dict['search_string']
-        # perform local file search
-        files = search_local_system_formatted_filename(data_path, search_str)
-        # we have a list of files, now we need to extract the information
-        # pull of data from the areas identified by format_str
-        if delimiter is None:
-            stored = parse_fixed_width_filenames(files, format_str)
+        state = getattr(_scan, 'state', None)
+        if state is not None:
+            # incremental refresh, only search directories that changed
+            stored = _search_changed_directories(state, data_path,
+                                                 search_str, format_str,
+                                                 delimiter)
         else:
-            stored = parse_delimited_filenames(files, format_str, delimiter)
+            # perform local file search
+            files = search_local_system_formatted_filename(data_path,
+                                                           search_str)
+            # we have a list of files, now we need to extract the
+            # information pull of data from the areas identified by
+            # format_str
+            stored = _parse_filenames(files, format_str, delimiter)
         # process the parsed filenames and return a properly formatted Series
         return process_parsed_filenames(stored, two_digit_year_break)
 
@@ -568,6 +817,9 @@ def process_parsed_filenames(stored, two_digit_year_break=None):
         Series returned only has one file der datetime. Version is required
         for this filtering, revision is optional.
 
+        If the day of year ('doy') is supplied it is used in place of
+        the month and day.
+
     """
 
     from pysat.utils.time import create_datetime_index
@@ -613,10 +865,15 @@ def process_parsed_filenames(stored, two_digit_year_break=None):
         if stored['revision'] is None:
             stored['revision'] = np.zeros(len(files))
 
-        index = create_datetime_index(year=stored['year'],
-                                      month=stored['month'],
-                                      day=stored['day'],
-                                      uts=stored['second'])
+        if stored.get('doy') is not None:
+            index = create_datetime_index(year=stored['year'],
+                                          day=stored['doy'],
+                                          uts=stored['second'])
+        else:
+            index = create_datetime_index(year=stored['year'],
+                                          month=stored['month'],
+                                          day=stored['day'],
+                                          uts=stored['second'])
 
         # if version and revision are supplied
         # use these parameters to weed out files that have been replaced
@@ -652,15 +909,15 @@ def parse_fixed_width_filenames(files, format_str):
     format_str : string with python format codes
         Provides the naming pattern of the instrument files and the
         locations of date information so an ordered list may be produced.
-        Supports 'year', 'month', 'day', 'hour', 'minute', 'second', 'version',
-        and 'revision'
+        Supports 'year', 'month', 'day', 'doy', 'hour', 'minute', 'second',
+        'version', and 'revision'
         Ex: 'cnofs_cindi_ivm_500ms_{year:4d}{month:02d}{day:02d}_v01.cdf'
 
     Returns
     -------
     OrderedDict
         Information parsed from filenames
-        'year', 'month', 'day', 'hour', 'minute', 'second', 'version',
+        'year', 'month', 'day', 'doy', 'hour', 'minute', 'second', 'version',
         'revision'
         'files' - input list of files
 
@@ -669,15 +926,7 @@ def parse_fixed_width_filenames(files, format_str):
     import collections
 
     # create storage for data to be parsed from filenames
-    stored = collections.OrderedDict()
-    stored['year'] = []
-    stored['month'] = []
-    stored['day'] = []
-    stored['hour'] = []
-    stored['minute'] = []
-    stored['second'] = []
-    stored['version'] = []
-    stored['revision'] = []
+    stored = collections.OrderedDict([(key, []) for key in _PARSED_KEYS])
 
     if len(files) == 0:
         stored['files'] = []
@@ -707,15 +956,12 @@ def parse_fixed_width_filenames(files, format_str):
     key_str_idx = [np.array(begin_key, dtype=int) - max_len,
                    np.array(end_key, dtype=int) - max_len]
     # need to parse out dates for datetime index
-    for i, temp in enumerate(files):
-        for j, key in enumerate(keys):
-            val = temp[key_str_idx[0][j]:key_str_idx[1][j]]
-            stored[key].append(val)
-    # convert to numpy arrays
-    for key in stored.keys():
-        stored[key] = np.array(stored[key]).astype(int)
-        if len(stored[key]) == 0:
-            stored[key] = None
+    values = _parse_fixed_width_values(files, key_str_idx[0], key_str_idx[1])
+    if values is None:
+        # a field at the end of the name has an end index of zero
+        values = [[temp[begin:(end if end < 0 else None)] for temp in files]
+                  for begin, end in zip(key_str_idx[0], key_str_idx[1])]
+    _store_parsed_values(stored, keys, values)
     # include files in output
     stored['files'] = files
     # include format string as convenience for later functions
@@ -734,15 +980,15 @@ def parse_delimited_filenames(files, format_str, delimiter):
     format_str : string with python format codes
         Provides the naming pattern of the instrument files and the
         locations of date information so an ordered list may be produced.
-        Supports 'year', 'month', 'day', 'hour', 'minute', 'second', 'version',
-        and 'revision'
+        Supports 'year', 'month', 'day', 'doy', 'hour', 'minute', 'second',
+        'version', and 'revision'
         Ex: 'cnofs_cindi_ivm_500ms_{year:4d}{month:02d}{day:02d}_v01.cdf'
 
     Returns
     -------
     OrderedDict
         Information parsed from filenames
-        'year', 'month', 'day', 'hour', 'minute', 'second', 'version',
+        'year', 'month', 'day', 'doy', 'hour', 'minute', 'second', 'version',
         'revision'
         'files' - input list of files
         'format_str' - formatted string from input
@@ -752,9 +998,7 @@ def parse_delimited_filenames(files, format_str, delimiter):
     import collections
 
     # create storage for data to be parsed from filenames
-    ordered_keys = ['year', 'month', 'day', 'hour', 'minute', 'second',
-                    'version', 'revision']
-    stored = collections.OrderedDict({kk: list() for kk in ordered_keys})
+    stored = collections.OrderedDict([(key, []) for key in _PARSED_KEYS])
 
     # exit early if there are no files
     if len(files) == 0:
@@ -784,21 +1028,19 @@ def parse_delimited_filenames(files, format_str, delimiter):
         pblock.append('')
     parsed_block = pblock[:-1]
     # need to parse out dates for datetime index
-    for temp in files:
-        split_name = temp.split(delimiter)
-        idx = 0
-        for sname, bname in zip(split_name, parsed_block):
-            if bname == '':
-                # areas with data to be parsed are indicated with a
-                # '' in parsed_block
-                stored[keys[idx]].append(sname)
-                idx += 1
-
-    # convert to numpy arrays
-    for key in stored.keys():
-        stored[key] = np.array(stored[key]).astype(int)
-        if len(stored[key]) == 0:
-            stored[key] = None
+    values = _parse_delimited_values(files, parsed_block, delimiter)
+    if values is None:
+        values = [[] for bname in parsed_block if bname == '']
+        for temp in files:
+            split_name = temp.split(delimiter)
+            idx = 0
+            for sname, bname in zip(split_name, parsed_block):
+                if bname == '':
+                    # areas with data to be parsed are indicated with a
+                    # '' in parsed_block
+                    values[idx].append(sname)
+                    idx += 1
+    _store_parsed_values(stored, keys, values)
     # include files in output
     stored['files'] = files
     # include format string as convenience for later functions
@@ -807,6 +1049,200 @@ def parse_delimited_filenames(files, format_str, delimiter):
     return stored
 
 
+def _filename_chars(files):
+    """Characters of a list of filenames, as a single byte array.
+
+    Parameters
+    ----------
+    files : list
+        List of files
+
+    Returns
+    -------
+    chars : np.array or NoneType
+        ASCII codes of the names, separated by zeros. None if the names
+        aren't all ASCII.
+    starts : np.array
+        Position of the start of each name
+    ends : np.array
+        Position just after the end of each name
+
+    """
+
+    try:
+        chars = '\0'.join(files).encode('ascii')
+    except UnicodeError:
+        return None, None, None
+    chars = np.frombuffer(chars, dtype=np.uint8)
+    ends = np.append(np.flatnonzero(chars == 0), len(chars))
+    if len(ends) != len(files):
+        return None, None, None
+    starts = np.append(0, ends[:-1] + 1)
+    return chars, starts, ends
+
+
+def _parse_digits(chars, begin, end):
+    """Integers held in the same width field of each filename.
+
+    Parameters
+    ----------
+    chars : np.array
+        Characters of the filenames, from _filename_chars
+    begin : np.array
+        Position of the start of the field in each name
+    end : np.array
+        Position just after the end of the field in each name
+
+    Returns
+    -------
+    np.array or NoneType
+        Value of the field in each name. None if the fields aren't all
+        the same width or don't hold only digits.
+
+    """
+
+    width = end[0] - begin[0]
+    # int64 holds up to 18 digits
+    if not (0 < width <= 18) or np.any(end - begin != width):
+        return None
+    # uint8 wraps around, so anything other than a digit is above 9
+    digits = chars[begin[:, np.newaxis] + np.arange(width)] - ord('0')
+    if np.any(digits > 9):
+        return None
+    return digits.astype(int).dot(10**np.arange(width - 1, -1, -1))
+
+
+def _parse_fixed_width_values(files, begin, end):
+    """Integers held in fixed width fields of a list of filenames.
+
+    Parameters
+    ----------
+    files : list
+        List of files
+    begin : array-like of int
+        Start of each field, as a negative index from the end of the names
+    end : array-like of int
+        End of each field, as a negative index from the end of the names
+
+    Returns
+    -------
+    list of np.array or NoneType
+        Values of each field for all files. None if any field can't be
+        parsed as ASCII digits here, e.g. names with non-ASCII characters
+        or padded with spaces, which are left to the general parser.
+
+    Note
+    ----
+        The names are joined into a single byte array and the digits of each
+        field are gathered for all names at once.
+
+    """
+
+    chars, starts, ends = _filename_chars(files)
+    if chars is None:
+        return None
+    if (len(begin) > 0) and np.any(ends - starts < -min(begin)):
+        return None
+
+    values = []
+    for start, stop in zip(begin, end):
+        values.append(_parse_digits(chars, ends + start, ends + stop))
+        if values[-1] is None:
+            return None
+    return values
+
+
+def _parse_delimited_values(files, parsed_block, delimiter):
+    """Integers held in delimited fields of a list of filenames.
+
+    Parameters
+    ----------
+    files : list
+        List of files
+    parsed_block : list of str
+        Filename fields, '' for fields with data to be parsed
+    delimiter : string
+        Delimiter between fields
+
+    Returns
+    -------
+    list of np.array or NoneType
+        Values of each field with data for all files. None if any field
+        can't be parsed as ASCII digits here, the delimiter is longer than
+        a single character, or only some names hold a field, which are left
+        to the general parser. Fields that no name holds are empty.
+
+    Note
+    ----
+        The names are joined into a single byte array. Fields are located
+        from the positions of the delimiter and the digits of each field
+        are gathered for all names at once.
+
+    """
+
+    if len(delimiter) != 1:
+        return None
+    chars, starts, ends = _filename_chars(files)
+    if chars is None:
+        return None
+
+    # delimiters within each name
+    delims = np.flatnonzero(chars == ord(delimiter))
+    first = np.searchsorted(delims, starts)
+    count = np.searchsorted(delims, ends) - first
+    # padding keeps the delimiter lookup in bounds for the last name
+    delims = np.append(delims, len(chars))
+
+    values = []
+    for i, bname in enumerate(parsed_block):
+        if bname != '':
+            continue
+        # areas with data to be parsed are indicated with a
+        # '' in parsed_block, names may hold more or fewer fields
+        if np.all(count < i):
+            values.append([])
+            continue
+        elif np.any(count < i):
+            return None
+        begin = starts if i == 0 else delims[first + i - 1] + 1
+        end = np.where(count > i, delims[first + i], ends)
+        values.append(_parse_digits(chars, begin, end))
+        if values[-1] is None:
+            return None
+    return values
+
+
+def _store_parsed_values(stored, keys, values):
+    """Store values parsed from filenames as integer arrays.
+
+    Parameters
+    ----------
+    stored : OrderedDict
+        Storage for data parsed from filenames, updated in place
+    keys : list of str
+        Key of each parsed field, as from construct_searchstring_from_format
+    values : list
+        Values of each field for all files
+
+    Note
+    ----
+        Keys that appear more than once in the filenames hold the values of
+        each occurrence in turn, file by file. Keys that aren't parsed are
+        set to None.
+
+    """
+
+    for key in stored.keys():
+        fields = [value for value, vkey in zip(values, keys)
+                  if (vkey == key) and (len(value) > 0)]
+        if len(fields) == 1:
+            stored[key] = np.asarray(fields[0]).astype(int)
+        elif len(fields) > 1:
+            stored[key] = np.array(fields).T.ravel().astype(int)
+        if len(stored[key]) == 0:
+            stored[key] = None
+
+
 def construct_searchstring_from_format(format_str, wildcard=False):
     """
     Parses format file string and returns string formatted for searching.
@@ -816,8 +1252,8 @@ def construct_searchstring_from_format(format_str, wildcard=False):
     format_str : string with python format codes
         Provides the naming pattern of the instrument files and the
         locations of date information so an ordered list may be produced.
-        Supports 'year', 'month', 'day', 'hour', 'minute', 'second', 'version',
-        and 'revision'
+        Supports 'year', 'month', 'day', 'doy', 'hour', 'minute', 'second',
+        'version', and 'revision'
         Ex: 'cnofs_vefi_bfield_1sec_{year:04d}{month:02d}{day:02d}_v05.cdf'
     wildcard : bool
         if True, replaces the ? sequence with a * . This option may be well
@@ -889,6 +1325,119 @@ def construct_searchstring_from_format(format_str, wildcard=False):
             'string_blocks': snips}
 
 
+def _parse_filenames(files, format_str, delimiter=None):
+    """Parse fixed width or delimited filenames, as set by delimiter."""
+
+    if delimiter is None:
+        return parse_fixed_width_filenames(files, format_str)
+    else:
+        return parse_delimited_filenames(files, format_str, delimiter)
+
+
+def _merge_parsed_filenames(parsed, format_str):
+    """Combine information parsed from several lists of files.
+
+    Parameters
+    ----------
+    parsed : list of OrderedDicts
+        output from parse_fixed_width_filenames or parse_delimited_filenames
+    format_str : string
+        format_str used to parse the files
+
+    Returns
+    -------
+    OrderedDict
+        Information parsed from all files
+
+    """
+
+    import collections
+
+    parsed = [stored for stored in parsed if len(stored['files']) > 0]
+    if len(parsed) == 0:
+        return parse_fixed_width_filenames([], format_str)
+
+    merged = collections.OrderedDict()
+    for key in parsed[0].keys():
+        if key == 'files':
+            merged[key] = [fname for stored in parsed
+                           for fname in stored[key]]
+        elif key == 'format_str':
+            merged[key] = format_str
+        elif parsed[0][key] is None:
+            merged[key] = None
+        else:
+            # new arrays, later processing modifies them in place
+            merged[key] = np.concatenate([stored[key] for stored in parsed])
+    return merged
+
+
+def _search_changed_directories(state, data_path, search_str, format_str,
+                                delimiter=None):
+    """Search for and parse files, only in directories that have changed.
+
+    Parameters
+    ----------
+    state : dict
+        Directory state of previous searches, updated in place. For each
+        search, holds the status (modification time and link count) and
+        parsed files of each directory.
+    data_path : string
+        Top level directory to search files for
+    search_str : string
+        String to search local file system for, may include directories
+    format_str : string with python format codes
+        Provides the naming pattern of the instrument files
+    delimiter : string or NoneType
+        If set, then filenames are parsed using delimiter rather than
+        assuming a fixed width (default=None)
+
+    Returns
+    -------
+    OrderedDict
+        Information parsed from filenames, as from
+        parse_fixed_width_filenames
+
+    """
+
+    key = (data_path, search_str, format_str, delimiter)
+    previous = state.get(key, {})
+    current = {}
+    now = time.time()
+
+    # directories are searched separately, each for files in the directory
+    dir_str, file_str = os.path.split(search_str)
+    if dir_str == '':
+        dirs = ['']
+    else:
+        dirs = sorted([sdir.split(data_path)[-1] for sdir
+                       in glob.glob(os.path.join(data_path, dir_str))
+                       if os.path.isdir(sdir)])
+
+    parsed = []
+    for sdir in dirs:
+        try:
+            stat = os.stat(os.path.join(data_path, sdir))
+        except OSError:
+            # removed since directories were listed
+            continue
+        status = (stat.st_mtime, stat.st_nlink)
+        if (sdir in previous) and (previous[sdir][0] == status):
+            stored = previous[sdir][1]
+        else:
+            files = search_local_system_formatted_filename(
+                data_path, os.path.join(sdir, file_str))
+            stored = _parse_filenames(files, format_str, delimiter)
+        if now - stat.st_mtime < _SCAN_RACY_SECONDS:
+            # may change again without a change in modification time
+            status = None
+        current[sdir] = (status, stored)
+        parsed.append(stored)
+
+    state[key] = current
+    return _merge_parsed_filenames(parsed, format_str)
+
+
 def search_local_system_formatted_filename(data_path, search_str):
     """
     Parses format file string and returns string formatted for searching.
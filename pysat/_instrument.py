@@ -10,12 +10,20 @@ except NameError:
 import string
 import os
 import copy
-import sys
+import functools
+import inspect
+import threading
+import time
+import logging
+import multiprocessing
+import importlib
+from collections import OrderedDict
 import pandas as pds
 import numpy as np
 import xarray as xr
 import warnings
 
+from . import _cache
 from . import _custom
 from . import _files
 from . import _orbits
@@ -23,6 +31,8 @@ from . import _meta
 from . import utils
 from pysat import DataFrame
 
+logger = logging.getLogger(__name__)
+
 
 # main class for users
 class Instrument(object):
@@ -80,6 +90,35 @@ class Instrument(object):
         if True, the list of files found will be checked to
         ensure the filesizes are greater than zero. Empty files are
         removed from the stored list of files.
+    buffer_size : int
+        Number of days (or files) of loaded data retained in memory when
+        `pad` or `multi_file_day` are in use. Days already in the buffer
+        are not reloaded when they re-enter the padding window. Values
+        less than one disable buffering. Defaults to 3.
+    prefetch : bool
+        If True, the day (or file) that will enter the padding window on
+        the next call to load is read on a background thread while the
+        current day is processed. Most useful when iterating over a season.
+        Defaults to False.
+    load_variables : list-like or NoneType
+        Default subset of variables loaded by `load`. Instrument load
+        routines that support a `variables` keyword only read these
+        variables, other load routines have excess variables removed by
+        pysat. Variables required by the clean routine and custom functions
+        must be included. If None, all variables are loaded.
+        Defaults to None.
+    cache_processed : bool
+        If True, data loaded by date is stored on disk, under the pysat data
+        directory, after cleaning and custom functions are applied. Later
+        loads of the same day with the same instrument, clean level, pad,
+        load keywords, source files, and custom functions are read directly
+        from the store. Defaults to False. Custom function arguments are
+        identified by repr, so arguments whose repr includes a memory
+        address (objects without a custom __repr__) are only matched within
+        the same session.
+    cache_size : int
+        Size limit of stored processed data, in bytes. Least recently used
+        days are removed when exceeded. Defaults to 2 GB.
     units_label : str
         String used to label units in storage. Defaults to 'units'.
     name_label : str
@@ -126,6 +165,17 @@ class Instrument(object):
         interface to extracting data orbit-by-orbit
     custom : pysat.Custom
         interface to instrument nano-kernel
+    processed_cache : pysat._cache.DiskCache or NoneType
+        store of processed data, if cache_processed is True. Use
+        processed_cache.invalidate(date) or processed_cache.clear() to
+        remove stored days.
+    last_load_profile : OrderedDict
+        wall time in seconds spent in each stage of the most recent load:
+        files (file lookup), load_rtn (instrument load routine), pad,
+        default, clean, custom, pad_removal, and total
+    total_load_profile : OrderedDict
+        stage timings summed over all loads since the last call to
+        reset_load_profile, e.g. across an iteration over a season
     kwargs : dictionary
         keyword arguments passed to instrument loading routine
 
@@ -178,7 +228,8 @@ class Instrument(object):
                  orbit_info=None, inst_module=None, multi_file_day=None,
                  manual_org=None, directory_format=None, file_format=None,
                  temporary_file_list=False, strict_time_flag=False,
-                 ignore_empty_files=False,
+                 ignore_empty_files=False, buffer_size=3, prefetch=False,
+                 load_variables=None, cache_processed=False, cache_size=None,
                  units_label='units', name_label='long_name',
                  notes_label='notes', desc_label='desc',
                  plot_label='label', axis_label='axis', scale_label='scale',
@@ -295,6 +346,24 @@ class Instrument(object):
         self._prev_data = self._null_data.copy()
         self._prev_data_track = []
         self._curr_data = self._null_data.copy()
+        # ring buffer of recently loaded days/files, keyed by date or fid,
+        # along with the optional background prefetch of the next one
+        self.buffer_size = int(buffer_size)
+        self.prefetch = prefetch
+        self._load_buffer = OrderedDict()
+        self._prefetch_thread = None
+        self._prefetch_result = None
+
+        # wall time spent in each stage of loading, for the most recent load
+        # and summed over loads
+        self.last_load_profile = OrderedDict()
+        self.total_load_profile = OrderedDict()
+        self._load_profile = OrderedDict()
+        self._profile_thread = None
+
+        # subset of variables to load, default and for current load
+        self.load_variables = load_variables
+        self._variables = _filter_variables(load_variables)
 
         # multi file day, default set by assign_funcs
         if multi_file_day is not None:
@@ -339,6 +408,7 @@ class Instrument(object):
             else:
                 # default provided by instrument module
                 orbit_info = self.orbit_info
+        self.orbit_info = orbit_info
         self.orbits = _orbits.Orbits(self, **orbit_info)
 
         # Create empty placeholder for meta translation table
@@ -354,6 +424,18 @@ class Instrument(object):
         # store kwargs, passed to load routine
         self.kwargs = kwargs
 
+        # on-disk store of processed days
+        if cache_processed:
+            import pysat
+            cache_dir = '_'.join((self.platform, self.name, self.tag,
+                                  self.sat_id))
+            self.processed_cache = \
+                _cache.DiskCache(os.path.join(pysat.data_dir, '_pysat_cache',
+                                              cache_dir),
+                                 max_size=cache_size)
+        else:
+            self.processed_cache = None
+
         # run instrument init function, a basic pass function is used
         # if user doesn't supply the init function
         self._init_rtn(self)
@@ -519,6 +601,13 @@ class Instrument(object):
                     # subset of time, using label based indexing
                     return self.data.sel(time=key)
 
+    def _copy_on_write(self):
+        """Copy data that is a view of the day held by orbits, before it is
+        modified, so that other orbits of the day are unaffected."""
+
+        if self.orbits.is_view(self.data):
+            self.data = self.data.copy()
+
     def __setitem__(self, key, new):
         """Convenience method for adding data to instrument.
 
@@ -545,6 +634,8 @@ class Instrument(object):
 
         import numpy as np
 
+        self._copy_on_write()
+
         # add data to main pandas.DataFrame, depending upon the input
         # aka slice, and a name
         if self.pandas_format:
@@ -749,6 +840,8 @@ class Instrument(object):
     def copy(self):
         """Deep copy of the entire Instrument object."""
 
+        # thread objects can't be copied, finish any pending prefetch first
+        self._join_prefetch()
         return copy.deepcopy(self)
 
     def concat_data(self, data, *args, **kwargs):
@@ -798,8 +891,8 @@ class Instrument(object):
         """Assign all external science instrument methods to Instrument object.
         """
 
-        import importlib
         # set defaults
+        self._inst_module_name = None
         self._list_rtn = self._pass_func
         self._load_rtn = self._pass_func
         self._default_rtn = self._pass_func
@@ -826,6 +919,9 @@ class Instrument(object):
             # no module or name info, default pass functions assigned
             return
 
+        # name of module, used to recreate Instrument in other processes
+        self._inst_module_name = getattr(inst, '__name__', None)
+
         try:
             self._load_rtn = inst.load
             self._list_rtn = inst.list_files
@@ -1018,7 +1114,7 @@ class Instrument(object):
 
         return self.today() - pds.DateOffset(days=1)
 
-    def _load_data(self, date=None, fid=None):
+    def _load_data(self, date=None, fid=None, start=None, stop=None):
         """
         Load data for an instrument on given date or fid, dependng upon input.
 
@@ -1028,6 +1124,10 @@ class Instrument(object):
             file date
         fid : (int or NoneType)
             filename index value
+        start : (dt.datetime or NoneType)
+            start of time window, passed to load routines that accept it
+        stop : (dt.datetime or NoneType)
+            end of time window, passed to load routines that accept it
 
         Returns
         --------
@@ -1037,6 +1137,7 @@ class Instrument(object):
             pysat meta data
         """
 
+        start_time = time.time()
         date = self._filter_datetime_input(date)
         if fid is not None:
             # get filename based off of index value
@@ -1045,12 +1146,35 @@ class Instrument(object):
             fname = self.files[date:date+pds.DateOffset(days=1)]
         else:
             raise ValueError('Must supply either a date or file id number.')
+        start_time = self._profile_stage('files', start_time)
 
         if len(fname) > 0:
             load_fname = [os.path.join(self.files.data_path, f) for f in fname]
+            # load routines that support it only read the time window
+            window = {}
+            if (start is not None) and \
+                    _accepts_keyword(self._load_rtn, 'start') and \
+                    _accepts_keyword(self._load_rtn, 'stop'):
+                window = {'start': start, 'stop': stop}
             try:
-                data, mdata = self._load_rtn(load_fname, tag=self.tag,
-                                             sat_id=self.sat_id, **self.kwargs)
+                cache = _cache.load_cache
+                cached = None
+                if cache.enabled:
+                    cache_key = self._load_cache_key(load_fname, window)
+                    cached = cache.get(cache_key)
+                if cached is not None:
+                    data, mdata = cached
+                else:
+                    kwargs = dict(self.kwargs, **window)
+                    if (self._variables is not None) and \
+                            _accepts_keyword(self._load_rtn, 'variables'):
+                        kwargs['variables'] = self._variables
+                    data, mdata = self._load_rtn(load_fname, tag=self.tag,
+                                                 sat_id=self.sat_id,
+                                                 **kwargs)
+                    if cache.enabled and isinstance(data, self._data_library) \
+                            and isinstance(mdata, _meta.Meta):
+                        cache.put(cache_key, data, mdata)
                 # ensure units and name are named consistently in new Meta
                 # object as specified by user upon Instrument instantiation
                 mdata.accept_default_labels(self)
@@ -1083,10 +1207,6 @@ class Instrument(object):
                                max_label=self.max_label,
                                fill_label=self.fill_label)
 
-        output_str = '{platform} {name} {tag} {sat_id}'
-        output_str = output_str.format(platform=self.platform,
-                                       name=self.name, tag=self.tag,
-                                       sat_id=self.sat_id)
         # check that data and metadata are the data types we expect
         if not isinstance(data, self._data_library):
             raise TypeError(' '.join(('Data returned by instrument load',
@@ -1094,7 +1214,23 @@ class Instrument(object):
         if not isinstance(mdata, _meta.Meta):
             raise TypeError('Metadata returned must be a pysat.Meta object')
 
+        # remove any variables not requested
+        if self._variables is not None:
+            data, mdata = self._select_variables(data, mdata)
+
         # let user know if data was returned or not
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(self._load_message(data, date, fname, bad_datetime))
+        self._profile_stage('load_rtn', start_time)
+        return data, mdata
+
+    def _load_message(self, data, date, fname, bad_datetime=False):
+        """Status message describing data returned by _load_data."""
+
+        output_str = '{platform} {name} {tag} {sat_id}'
+        output_str = output_str.format(platform=self.platform,
+                                       name=self.name, tag=self.tag,
+                                       sat_id=self.sat_id)
         ind = data.index if self.pandas_format else data.indexes
         if len(ind) > 0:
             if date is not None:
@@ -1131,9 +1267,30 @@ class Instrument(object):
                                             fname[-1]))
 
         # remove extra spaces, if any
-        output_str = " ".join(output_str.split())
-        print(output_str)
-        return data, mdata
+        return " ".join(output_str.split())
+
+    def _load_cache_key(self, load_fname, window=None):
+        """Key for the output of the load routine in pysat.load_cache.
+
+        Parameters
+        ----------
+        load_fname : list of str
+            full path of files passed to the load routine
+        window : dict or NoneType
+            time window passed to the load routine
+
+        """
+
+        files = []
+        for fname in load_fname:
+            try:
+                mtime = os.path.getmtime(fname)
+            except OSError:
+                mtime = None
+            files.append((fname, mtime))
+        return _cache.make_key(self.platform, self.name, self.tag,
+                               self.sat_id, self.kwargs, self._variables,
+                               window, _cache._func_id(self._load_rtn), files)
 
     def _load_next(self):
         """Load the next days data (or file) without incrementing the date.
@@ -1146,9 +1303,9 @@ class Instrument(object):
         """
         if self._load_by_date:
             next_date = self.date + pds.DateOffset(days=1)
-            return self._load_data(date=next_date)
+            return self._buffered_load(date=next_date)
         else:
-            return self._load_data(fid=self._fid+1)
+            return self._buffered_load(fid=self._fid+1)
 
     def _load_prev(self):
         """Load the next days data (or file) without decrementing the date.
@@ -1162,9 +1319,406 @@ class Instrument(object):
 
         if self._load_by_date:
             prev_date = self.date - pds.DateOffset(days=1)
-            return self._load_data(date=prev_date)
+            return self._buffered_load(date=prev_date)
         else:
-            return self._load_data(fid=self._fid-1)
+            return self._buffered_load(fid=self._fid-1)
+
+    def _buffer_key(self, date=None, fid=None):
+        """Key used to store a day or file within the load buffer."""
+
+        variables = self._variables
+        if variables is not None:
+            variables = tuple(variables)
+        if fid is not None:
+            return ('fid', fid, variables)
+        return ('date', self._filter_datetime_input(date), variables)
+
+    def _select_variables(self, data, mdata):
+        """Restrict data and metadata to the variables being loaded.
+
+        Parameters
+        ----------
+        data : (pds.DataFrame or xr.Dataset)
+            pysat data
+        mdata : (pysat.Meta)
+            pysat meta data
+
+        Returns
+        -------
+        data, mdata
+            data and metadata for variables requested in load. Names are
+            matched case insensitively and names not present are ignored.
+
+        """
+
+        wanted = [var.lower() for var in self._variables]
+        if self.pandas_format:
+            names = data.columns
+        else:
+            names = list(data.data_vars.keys())
+        keep = [name for name in names if name.lower() in wanted]
+        if len(keep) < len(names):
+            data = data[keep]
+        drop = [name for name in mdata.keys() if name.lower() not in wanted]
+        if len(drop) > 0:
+            mdata.drop(drop)
+        return data, mdata
+
+    def _buffered_load(self, date=None, fid=None):
+        """Load data for a date or fid, using the load buffer if possible.
+
+        Parameters
+        ----------
+        date : (dt.datetime.date object or NoneType)
+            file date
+        fid : (int or NoneType)
+            filename index value
+
+        Returns
+        --------
+        data : (pds.DataFrame or xr.Dataset)
+            pysat data
+        meta : (pysat.Meta)
+            pysat meta data
+
+        Note
+        ----
+        Returned objects are shared with the buffer and must not be
+        modified in place by the caller.
+
+        """
+
+        # any background load must be finished before the buffer is used
+        self._join_prefetch()
+        if self.buffer_size < 1:
+            return self._load_data(date=date, fid=fid)
+
+        key = self._buffer_key(date=date, fid=fid)
+        if key in self._load_buffer:
+            # mark as most recently used
+            output = self._load_buffer.pop(key)
+        else:
+            output = self._load_data(date=date, fid=fid)
+        self._load_buffer[key] = output
+        # drop the least recently used days
+        while len(self._load_buffer) > self.buffer_size:
+            self._load_buffer.popitem(last=False)
+        return output
+
+    def _start_prefetch(self, date=None, fid=None):
+        """Start loading a date or fid on a background thread.
+
+        Result is moved into the load buffer by `_join_prefetch`.
+
+        """
+
+        self._join_prefetch()
+        if self.buffer_size < 1:
+            return
+        key = self._buffer_key(date=date, fid=fid)
+        if key in self._load_buffer:
+            return
+        if (fid is not None) and ((fid < 0) or (fid >= len(self.files.files))):
+            return
+
+        def _prefetch_worker():
+            try:
+                self._prefetch_result = (key, self._load_data(date=date,
+                                                              fid=fid))
+            except Exception:
+                # errors are raised by the regular load, if it is needed
+                self._prefetch_result = None
+
+        self._prefetch_thread = threading.Thread(target=_prefetch_worker)
+        self._prefetch_thread.daemon = True
+        self._prefetch_thread.start()
+
+    def _join_prefetch(self):
+        """Wait for any background load and store the result in the buffer.
+        """
+
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+        if self._prefetch_result is not None:
+            key, output = self._prefetch_result
+            self._prefetch_result = None
+            self._load_buffer[key] = output
+            while len(self._load_buffer) > self.buffer_size:
+                self._load_buffer.popitem(last=False)
+
+    def _profile_stage(self, stage, start_time):
+        """Add the wall time since start_time to a stage of the load profile.
+
+        Parameters
+        ----------
+        stage : str
+            name of loading stage
+        start_time : float
+            time stage started, from time.time()
+
+        Returns
+        -------
+        float
+            current time, which may be used as the start of the next stage
+
+        """
+
+        now = time.time()
+        # loads on the prefetch thread aren't part of the current load
+        if threading.current_thread().ident == self._profile_thread:
+            self._load_profile[stage] = (self._load_profile.get(stage, 0.) +
+                                         now - start_time)
+        return now
+
+    def _finish_profile(self, start_time):
+        """Store the profile of the completed load and add it to the total.
+        """
+
+        self._load_profile['total'] = time.time() - start_time
+        self.last_load_profile = self._load_profile
+        for stage, value in self._load_profile.items():
+            self.total_load_profile[stage] = \
+                self.total_load_profile.get(stage, 0.) + value
+        self._profile_thread = None
+
+    def reset_load_profile(self):
+        """Reset the stage timings summed in total_load_profile.
+
+        Examples
+        --------
+        ::
+
+            inst.reset_load_profile()
+            for inst in inst:
+                pass
+            print(inst.total_load_profile)
+
+        """
+
+        self.total_load_profile = OrderedDict()
+
+    def clear_buffer(self):
+        """Remove all days/files stored in the load buffer.
+
+        Note
+        ----
+        Use after changing the instrument files or load keywords so that
+        subsequent loads read data from disk again.
+
+        """
+
+        self._join_prefetch()
+        self._load_buffer.clear()
+        self._next_data = self._null_data.copy()
+        self._next_data_track = []
+        self._prev_data = self._null_data.copy()
+        self._prev_data_track = []
+        self._curr_data = self._null_data.copy()
+
+    @staticmethod
+    def _window_bounds(index, start, stop, include_stop=False):
+        """Integer bounds of the samples within a time window.
+
+        Parameters
+        ----------
+        index : pds.DatetimeIndex
+            monotonic time index
+        start : pds.datetime
+            first time in the window, inclusive
+        stop : pds.datetime
+            last time in the window
+        include_stop : boolean
+            if True, samples at `stop` are included in the window
+
+        Returns
+        -------
+        (int, int)
+            positional start and (exclusive) end of the window
+
+        """
+
+        side = 'right' if include_stop else 'left'
+        return (index.searchsorted(start, side='left'),
+                index.searchsorted(stop, side=side))
+
+    def _slice_data(self, data, start, stop):
+        """Positional slice of pandas or xarray data along time."""
+
+        if self.pandas_format:
+            return data.iloc[start:stop]
+        else:
+            return data.isel(time=slice(start, stop))
+
+    def _pad_window(self, first_pad, last_pad, want_last_pad=False):
+        """Assemble padded data from the previous, current, and next data.
+
+        Parameters
+        ----------
+        first_pad : pds.datetime
+            start of padded window, inclusive
+        last_pad : pds.datetime
+            end of padded window
+        want_last_pad : boolean
+            if True, samples at last_pad are included
+
+        Returns
+        -------
+        data : (pds.DataFrame or xr.Dataset)
+            Samples from the current data within the window, preceded by
+            samples from the previous data before the start of the current
+            data, and followed by samples from the next data after the end
+            of the current data. Always a new object that doesn't share
+            memory with the stored data.
+
+        Note
+        ----
+        Window bounds are located with a binary search on each index, so
+        stored data is only sliced (not copied) before the single
+        concatenation.
+
+        """
+
+        if self._empty(self._curr_data):
+            return self._null_data.copy()
+
+        curr_index = self._index(self._curr_data)
+        start, stop = self._window_bounds(curr_index, first_pad, last_pad,
+                                          want_last_pad)
+        pieces = []
+        # samples from previous day before the current data
+        if not self._empty(self._prev_data):
+            prev_index = self._index(self._prev_data)
+            pstart, pstop = self._window_bounds(prev_index, first_pad,
+                                                last_pad, want_last_pad)
+            pstop = min(pstop, prev_index.searchsorted(curr_index[0],
+                                                       side='left'))
+            if pstart < pstop:
+                pieces.append(self._slice_data(self._prev_data, pstart,
+                                               pstop))
+        if start < stop:
+            pieces.append(self._slice_data(self._curr_data, start, stop))
+        # samples from next day after the current data
+        if not self._empty(self._next_data):
+            next_index = self._index(self._next_data)
+            nstart, nstop = self._window_bounds(next_index, first_pad,
+                                                last_pad, want_last_pad)
+            nstart = max(nstart, next_index.searchsorted(curr_index[-1],
+                                                         side='right'))
+            if nstart < nstop:
+                pieces.append(self._slice_data(self._next_data, nstart,
+                                               nstop))
+
+        if len(pieces) == 0:
+            # keep variables even if no samples fall within the window
+            return self._slice_data(self._curr_data, 0, 0).copy()
+        elif len(pieces) == 1:
+            return pieces[0].copy()
+        return self.concat_data(pieces)
+
+    def _load_window(self, first, last):
+        """Load data within a time window.
+
+        Parameters
+        ----------
+        first : datetime
+            start of window, inclusive
+        last : datetime
+            end of window, exclusive
+
+        Returns
+        -------
+        data : (pds.DataFrame or xr.Dataset)
+            pysat data
+        meta : (pysat.Meta)
+            pysat meta data
+
+        Note
+        ----
+        Files are loaded day by day so load routines that only read a
+        single file are supported. The window is passed to load routines
+        accepting start and stop keywords.
+
+        """
+
+        first_day = self._filter_datetime_input(first)
+        last_day = self._filter_datetime_input(last)
+        if self.multi_file_day:
+            # data for a day may be in files for the adjacent days
+            first_day = first_day - pds.DateOffset(days=1)
+            last_day = last_day + pds.DateOffset(days=1)
+
+        pieces = []
+        meta = None
+        for day in pds.date_range(first_day, last_day, freq='D'):
+            data, mdata = self._load_data(date=day, start=first, stop=last)
+            if self._empty(data):
+                continue
+            if not self._index(data).is_monotonic_increasing:
+                data = data.sort_index()
+            istart, istop = self._window_bounds(self._index(data), first,
+                                                last)
+            if istart < istop:
+                # copy, so the rest of the file is released
+                pieces.append(self._slice_data(data, istart, istop).copy())
+                if meta is None:
+                    meta = mdata
+
+        if len(pieces) == 0:
+            return self._null_data.copy(), meta
+        elif len(pieces) == 1:
+            data = pieces[0]
+        else:
+            data = self.concat_data(pieces)
+            if self.multi_file_day:
+                # keep one of any times loaded from more than one file
+                index = self._index(data)
+                if not index.is_monotonic_increasing:
+                    data = data.sort_index()
+                    index = self._index(data)
+                if not index.is_unique:
+                    keep, = np.where(~index.duplicated())
+                    if self.pandas_format:
+                        data = data.iloc[keep]
+                    else:
+                        data = data.isel(time=keep)
+        return data, meta
+
+    def _processed_cache_key(self):
+        """Key for processed data of the current date in processed_cache.
+
+        Combines instrument identity, clean level, padding, load keywords,
+        instrument routines, custom functions and arguments, and the names
+        and modification times of all files that may contribute to the day.
+
+        """
+
+        # files for the day, and the days used for padding
+        start = self.date
+        stop = self.date + pds.DateOffset(days=1)
+        if (self.pad is not None) | self.multi_file_day:
+            start = start - pds.DateOffset(days=1)
+            stop = stop + pds.DateOffset(days=1)
+        files = []
+        for fname in self.files[start:stop]:
+            try:
+                mtime = os.path.getmtime(os.path.join(self.files.data_path,
+                                                      fname))
+            except OSError:
+                mtime = None
+            files.append((fname, mtime))
+
+        custom = [(_cache._func_id(func), kind, args, kwargs)
+                  for func, kind, args, kwargs in
+                  zip(self.custom._functions, self.custom._kind,
+                      self.custom._args, self.custom._kwargs)]
+        routines = [_cache._func_id(func) for func in
+                    (self._load_rtn, self._default_rtn, self._clean_rtn)]
+
+        return _cache.make_key(self.platform, self.name, self.tag,
+                               self.sat_id, self.clean_level, self.pad,
+                               self.multi_file_day, self.kwargs,
+                               self._variables, routines, custom, files)
 
     def _set_load_parameters(self, date=None, fid=None):
         # filter supplied data so that it is only year, month, and day
@@ -1184,7 +1738,7 @@ class Instrument(object):
             self._load_by_date = False
 
     def load(self, yr=None, doy=None, date=None, fname=None, fid=None,
-             verifyPad=False):
+             verifyPad=False, variables=None, start=None, stop=None):
         """Load instrument data into Instrument object .data.
 
         Parameters
@@ -1199,6 +1753,17 @@ class Instrument(object):
             filename to be loaded
         verifyPad : boolean
             if True, padding data not removed (debug purposes)
+        variables : list-like or NoneType
+            variables to be loaded. If None, the Instrument `load_variables`
+            default is used. Only the requested variables are passed
+            through padding, cleaning, and custom functions.
+        start : datetime object
+            Start of a time window to load, inclusive. Used with stop
+            instead of yr/doy, date, fname, or fid. Load routines that accept
+            start and stop keywords only read records within the (padded)
+            window, otherwise data is removed by pysat.
+        stop : datetime object
+            End of time window to load, exclusive.
 
         Returns
         --------
@@ -1212,8 +1777,21 @@ class Instrument(object):
         user in .data.
 
         """
+        load_start = time.time()
+        self._load_profile = OrderedDict()
+        self._profile_thread = threading.current_thread().ident
+
         # set options used by loading routine based upon user input
-        if date is not None:
+        if (start is not None) | (stop is not None):
+            if (start is None) | (stop is None):
+                raise ValueError('Must supply both start and stop.')
+            if stop <= start:
+                raise ValueError('stop must be later than start.')
+            # date is set to the day of start
+            self._set_load_parameters(date=start, fid=None)
+            inc = pds.DateOffset(days=1)
+            curr = self.date
+        elif date is not None:
             # ensure date portion from user is only year, month, day
             self._set_load_parameters(date=date,
                                       fid=None)
@@ -1244,18 +1822,53 @@ class Instrument(object):
             raise TypeError(estr)
 
         self.orbits._reset()
+
+        # select variables, data stored for padding must be reloaded when
+        # the selection changes
+        if variables is None:
+            variables = self.load_variables
+        variables = _filter_variables(variables)
+        if variables != self._variables:
+            self._join_prefetch()
+            self._variables = variables
+            self._next_data = self._null_data.copy()
+            self._prev_data = self._null_data.copy()
+
+        # processed days are cached by date only
+        cache_key = None
+        if (self.processed_cache is not None) & self._load_by_date & \
+                (not verifyPad) & (start is None):
+            cache_key = self._processed_cache_key()
+            cached = self.processed_cache.get(self.date, cache_key)
+            if cached is not None:
+                self.data, self.meta = cached
+                self.meta.transfer_attributes_to_instrument(self)
+                self._finish_profile(load_start)
+                return
+
         # if pad  or multi_file_day is true, need to have a three day/file load
         loop_pad = self.pad if self.pad is not None \
             else pds.DateOffset(seconds=0)
-        if (self.pad is not None) | self.multi_file_day:
+        if start is not None:
+            # time window, only records within window and padding are
+            # loaded, bypassing the day/file window used for padding
+            first_time = start
+            first_pad = start - loop_pad
+            last_time = stop
+            last_pad = stop + loop_pad
+            want_last_pad = False
+            self.data, meta = self._load_window(first_pad, last_pad)
+            if not self.empty:
+                self.meta = meta
+        elif (self.pad is not None) | self.multi_file_day:
             if self._empty(self._next_data) & self._empty(self._prev_data):
                 # data has not already been loaded for previous and next days
                 # load data for all three
-                print('Initializing three day/file window')
+                logger.info('Initializing three day/file window')
                 # using current date or fid
                 self._prev_data, self._prev_meta = self._load_prev()
                 self._curr_data, self._curr_meta = \
-                    self._load_data(date=self.date, fid=self._fid)
+                    self._buffered_load(date=self.date, fid=self._fid)
                 self._next_data, self._next_meta = self._load_next()
             else:
                 # moving forward in time
@@ -1282,10 +1895,11 @@ class Instrument(object):
                     del self._next_data
                     self._prev_data, self._prev_meta = self._load_prev()
                     self._curr_data, self._curr_meta = \
-                        self._load_data(date=self.date, fid=self._fid)
+                        self._buffered_load(date=self.date, fid=self._fid)
                     self._next_data, self._next_meta = self._load_next()
 
             # make sure datetime indices for all data is monotonic
+            stage_start = time.time()
             if not self._index(self._prev_data).is_monotonic_increasing:
                 self._prev_data.sort_index(inplace=True)
             if not self._index(self._curr_data).is_monotonic_increasing:
@@ -1293,18 +1907,27 @@ class Instrument(object):
             if not self._index(self._next_data).is_monotonic_increasing:
                 self._next_data.sort_index(inplace=True)
 
+            # read the day/file beyond the window, in the direction of travel,
+            # while the current day is processed
+            if self.prefetch:
+                if self._prev_data_track == curr:
+                    ahead = curr - inc - inc
+                else:
+                    ahead = curr + inc + inc
+                if self._load_by_date:
+                    self._start_prefetch(date=ahead)
+                else:
+                    self._start_prefetch(fid=ahead)
+
             # make tracking indexes consistent with new loads
             self._next_data_track = curr + inc
             self._prev_data_track = curr - inc
-            # attach data to object
+            # attach metadata to object
             if not self._empty(self._curr_data):
-                self.data = self._curr_data.copy()
                 self.meta = self._curr_meta.copy()
-            else:
-                self.data = self._null_data.copy()
-                # line below removed as it would delete previous meta, if any
-                # if you end a seasonal analysis with a day with no data, then
-                # no meta: self.meta = _meta.Meta()
+            # line below removed as it would delete previous meta, if any
+            # if you end a seasonal analysis with a day with no data, then
+            # no meta: self.meta = _meta.Meta()
 
             # multi file days can extend past a single day, only want data from
             # specific date if loading by day
@@ -1328,43 +1951,8 @@ class Instrument(object):
                                  "multi_file_day and load by file.")
 
             # pad data based upon passed parameter
-            if (not self._empty(self._prev_data)) & (not self.empty):
-                stored_data = self.data  # .copy()
-                temp_time = copy.deepcopy(self.index[0])
-                # pad data using access mechanisms that works
-                # for both pandas and xarray
-                self.data = self._prev_data.copy()
-                # __getitem__ used below to get data
-                # from instrument object. Details
-                # for handling pandas and xarray are different
-                # and handled by __getitem__
-                self.data = self[first_pad:temp_time]
-                if not self.empty:
-                    if (self.index[-1] == temp_time):
-                        self.data = self[:-1]
-                    self.data = self.concat_data([self.data, stored_data])
-                else:
-                    self.data = stored_data
-
-            if (not self._empty(self._next_data)) & (not self.empty):
-                stored_data = self.data  # .copy()
-                temp_time = copy.deepcopy(self.index[-1])
-                # pad data using access mechanisms that work
-                # for both pandas and xarray
-                self.data = self._next_data.copy()
-                self.data = self[temp_time:last_pad]
-                if not self.empty:
-                    if (self.index[0] == temp_time):
-                        self.data = self[1:]
-                    self.data = self.concat_data([stored_data, self.data])
-                else:
-                    self.data = stored_data
-
-            self.data = self[first_pad:last_pad]
-            # want exclusive end slicing behavior from above
-            if not self.empty:
-                if (self.index[-1] == last_pad) & (not want_last_pad):
-                    self.data = self[:-1]
+            self.data = self._pad_window(first_pad, last_pad, want_last_pad)
+            self._profile_stage('pad', stage_start)
 
         # if self.pad is False, load single day
         else:
@@ -1398,27 +1986,35 @@ class Instrument(object):
                                  ')')
 
         # apply default instrument routine, if data present
+        stage_start = time.time()
         if not self.empty:
             self._default_rtn(self)
+        stage_start = self._profile_stage('default', stage_start)
 
         # clean data, if data is present and cleaning requested
         if (not self.empty) & (self.clean_level != 'none'):
             self._clean_rtn(self)
+        stage_start = self._profile_stage('clean', stage_start)
 
         # apply custom functions via the nanokernel in self.custom
         if not self.empty:
             self.custom._apply_all(self)
+        stage_start = self._profile_stage('custom', stage_start)
 
         # remove the excess data padding, if any applied
         if (self.pad is not None) & (not self.empty) & (not verifyPad):
-            self.data = self[first_time: last_time]
-            if not self.empty:
-                if (self.index[-1] == last_time) & (not want_last_pad):
-                    self.data = self[:-1]
+            istart, istop = self._window_bounds(self.index, first_time,
+                                                last_time, want_last_pad)
+            self.data = self._slice_data(self.data, istart, istop)
+            self._profile_stage('pad_removal', stage_start)
+
+        if cache_key is not None:
+            self.processed_cache.put(self.date, cache_key,
+                                     (self.data, self.meta))
 
         # transfer any extra attributes in meta to the Instrument object
         self.meta.transfer_attributes_to_instrument(self)
-        sys.stdout.flush()
+        self._finish_profile(load_start)
         return
 
     def remote_file_list(self, year=None, month=None, day=None):
@@ -1863,6 +2459,208 @@ class Instrument(object):
             else:
                 self.load(fname=self._iter_list[-1], verifyPad=verifyPad)
 
+    def _load_spec(self):
+        """Picklable description used to recreate Instrument in a worker.
+        """
+
+        if self._inst_module_name is None:
+            raise ValueError(' '.join(('Parallel loading requires an',
+                                       'Instrument with an importable',
+                                       'instrument module.')))
+        init = {'tag': self.tag, 'sat_id': self.sat_id,
+                'clean_level': self.clean_level, 'pad': self.pad,
+                'orbit_info': self.orbit_info,
+                'multi_file_day': self.multi_file_day,
+                'manual_org': self.files.manual_org,
+                'directory_format': self.files.directory_format,
+                'file_format': self.file_format,
+                'strict_time_flag': self.strict_time_flag,
+                'ignore_empty_files': self.files.ignore_empty_files,
+                'load_variables': self.load_variables,
+                'cache_processed': self.processed_cache is not None,
+                'cache_size': getattr(self.processed_cache, 'max_size', None),
+                'units_label': self.units_label,
+                'name_label': self.name_label,
+                'notes_label': self.notes_label,
+                'desc_label': self.desc_label,
+                'plot_label': self.plot_label,
+                'axis_label': self.axis_label,
+                'scale_label': self.scale_label,
+                'min_label': self.min_label,
+                'max_label': self.max_label,
+                'fill_label': self.fill_label}
+        init.update(self.kwargs)
+        return {'inst_module': self._inst_module_name, 'init': init,
+                'files': self.files.files, 'custom': self.custom}
+
+    def _parallel_map(self, tasks, workers=None, func=None, *args, **kwargs):
+        """Load each task in a pool of processes, yielding results in order.
+
+        Parameters
+        ----------
+        tasks : list
+            list of ('date', datetime) or ('fname', filename) tuples
+        workers : int or NoneType
+            number of processes, if None uses the number of cpus. If 1,
+            tasks are loaded by this Instrument without a pool.
+        func : function or NoneType
+            function applied to the loaded Instrument in the worker,
+            func(inst, *args, **kwargs). If None, the loaded data is returned.
+
+        Returns
+        -------
+        generator
+            yields (date, result) for each task in the order supplied.
+            result is func output, or a (data, meta) tuple if func is None.
+
+        """
+
+        if workers is None:
+            workers = multiprocessing.cpu_count()
+        workers = max(1, min(int(workers), len(tasks)))
+
+        if workers == 1:
+            # serial, no need to recreate the Instrument
+            for task in tasks:
+                yield _load_task(self, task, func, args, kwargs)
+            return
+
+        # consecutive days go to the same process so padding loads
+        # are shared within each chunk
+        chunksize = max(1, len(tasks) // (4 * workers))
+        pool = multiprocessing.Pool(workers, initializer=_init_load_worker,
+                                    initargs=(self._load_spec(), func, args,
+                                              kwargs))
+        try:
+            for output in pool.imap(_load_worker, tasks,
+                                    chunksize=chunksize):
+                yield output
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def load_range(self, start=None, stop=None, workers=None, func=None,
+                   *args, **kwargs):
+        """Load a range of days in parallel, one process per worker.
+
+        Parameters
+        ----------
+        start : datetime or NoneType
+            first day to load. If None, first day of files is used.
+        stop : datetime or NoneType
+            last day to load, inclusive. If None, last day of files is used.
+        workers : int or NoneType
+            number of processes. If None, uses the number of cpus.
+        func : function or NoneType
+            If supplied, func(inst, *args, **kwargs) is evaluated in the worker
+            after each day is loaded and the results are returned. Otherwise,
+            the loaded days are attached to the Instrument. (default=None)
+        *args, **kwargs
+            passed along to func
+
+        Returns
+        -------
+        list or NoneType
+            list of func results in date order, if func supplied.
+            Otherwise, void and all days are concatenated into .data.
+
+        Note
+        ----
+        Each process creates its own copy of the Instrument, including
+        custom functions, from the platform/name/tag/sat_id and load keywords.
+        Custom functions, func, and the arguments must be picklable (e.g.,
+        defined at the top level of a module). Date and loading parameters
+        are set to `start` when data is attached.
+
+        Examples
+        --------
+        ::
+
+            def daily_mean(inst, label):
+                return inst[label].mean()
+
+            ivm = pysat.Instrument('cnofs', 'ivm')
+            means = ivm.load_range(pysat.datetime(2009, 1, 1),
+                                   pysat.datetime(2009, 12, 31),
+                                   workers=8, func=daily_mean,
+                                   label='ionVelmeridional')
+
+        """
+
+        if start is None:
+            start = self.files.start_date
+        if stop is None:
+            stop = self.files.stop_date
+        start = self._filter_datetime_input(start)
+        stop = self._filter_datetime_input(stop)
+        dates = utils.time.create_date_range(start, stop)
+        tasks = [('date', date) for date in dates]
+
+        results = self._parallel_map(tasks, workers, func, *args, **kwargs)
+        if func is not None:
+            return [result for date, result in results]
+
+        data = []
+        meta = None
+        for date, (ldata, lmeta) in results:
+            if not self._empty(ldata):
+                data.append(ldata)
+                if meta is None:
+                    meta = lmeta
+        self._set_load_parameters(date=start, fid=None)
+        if len(data) > 0:
+            self.data = self.concat_data(data)
+            self.meta = meta
+        else:
+            self.data = self._null_data.copy()
+        return
+
+    def parallel_iter(self, workers=None):
+        """Iterates over `bounds` with days or files loaded in parallel.
+
+        Parameters
+        ----------
+        workers : int or NoneType
+            number of processes. If None, uses the number of cpus.
+
+        Note
+        ----
+        Equivalent to iterating over the Instrument, though loading,
+        cleaning, and custom functions for upcoming days/files are performed
+        by other processes while the current day is processed. See
+        `load_range` for requirements on custom functions.
+
+        Examples
+        --------
+        ::
+
+            inst.bounds = (start, stop)
+            for inst in inst.parallel_iter(workers=8):
+                print('Another day loaded', inst.date)
+
+        """
+
+        if self._iter_type == 'file':
+            tasks = [('fname', fname) for fname in self._iter_list]
+        else:
+            tasks = [('date', date) for date in self._iter_list]
+
+        results = self._parallel_map(tasks, workers)
+        for (kind, value), (date, (data, meta)) in zip(tasks, results):
+            if kind == 'fname':
+                self._set_load_parameters(date=None,
+                                          fid=self.files.get_index(value))
+                self.date = date
+                self.yr, self.doy = utils.time.getyrdoy(date)
+            else:
+                self._set_load_parameters(date=date, fid=None)
+            self.orbits._reset()
+            self.data = data
+            if not self._empty(data):
+                self.meta = meta
+            yield self
+
     def _get_var_type_code(self, coltype):
         '''Determines the two-character type code for a given variable type
 
@@ -2070,6 +2868,177 @@ class Instrument(object):
                                 meta_dict[original_key]
         return export_dict
 
+    def _netcdf4_export_meta(self):
+        """Metadata and metadata labels used when writing netCDF4 files.
+
+        Returns
+        -------
+        export_meta : dict
+            metadata for each variable, from generic_meta_translator and any
+            instrument specific post-processing
+        export_labels : dict
+            lists of labels used for name, units, desc, and notes metadata,
+            keyed by 'name_label', 'units_label', 'desc_label', and
+            'notes_label'
+
+        """
+
+        # look to see if user supplied a list of export keys
+        # corresponding to internally tracked metadata within pysat
+        export_meta = self.generic_meta_translator(self.meta)
+        labels = ['name_label', 'units_label', 'desc_label', 'notes_label']
+        if self._meta_translation_table is None:
+            # didn't find a translation table, using the strings
+            # attached to the supplied pysat.Instrument object
+            export_labels = dict((label, [getattr(self, label)])
+                                 for label in labels)
+        else:
+            # user supplied labels in translation table
+            export_labels = dict((label,
+                                  self._meta_translation_table[label])
+                                 for label in labels)
+            logger.info('Using Metadata Translation Table: %s',
+                        self._meta_translation_table)
+        # Apply instrument specific post-processing to the export_meta
+        if hasattr(self._export_meta_post_processing, '__call__'):
+            export_meta = self._export_meta_post_processing(export_meta)
+        return export_meta, export_labels
+
+    def _netcdf4_epoch_meta(self, export_meta, export_labels, epoch_name):
+        """Metadata for the Epoch variable of netCDF4 files.
+
+        Parameters
+        ----------
+        export_meta : dict
+            output from _netcdf4_export_meta
+        export_labels : dict
+            output from _netcdf4_export_meta
+        epoch_name : str
+            Label in file for datetime index of Instrument object
+
+        Returns
+        -------
+        dict
+
+        """
+
+        # grab existing metadata for Epoch or create suitable info
+        if epoch_name in self.meta:
+            new_dict = export_meta[self.meta.var_case_name(epoch_name)]
+        else:
+            # create empty shell
+            new_dict = {}
+
+        # update required and basic information if not present
+        for export_name_label in export_labels['name_label']:
+            if export_name_label not in new_dict:
+                new_dict[export_name_label] = epoch_name
+
+        for export_units_label in export_labels['units_label']:
+            if export_units_label not in new_dict:
+                new_dict[export_units_label] = \
+                    'Milliseconds since 1970-1-1 00:00:00'
+
+        for export_desc_label in export_labels['desc_label']:
+            if export_desc_label not in new_dict:
+                new_dict[export_desc_label] = \
+                    'Milliseconds since 1970-1-1 00:00:00'
+
+        for export_notes_label in export_labels['notes_label']:
+            if export_notes_label not in new_dict:
+                new_dict[export_notes_label] = ''
+
+        new_dict['calendar'] = 'standard'
+        new_dict['Format'] = 'i8'
+        new_dict['Var_Type'] = 'data'
+        if self.index.is_monotonic_increasing:
+            new_dict['MonoTon'] = 'increase'
+        elif self.index.is_monotonic_decreasing:
+            new_dict['MonoTon'] = 'decrease'
+        new_dict['Time_Base'] = 'Milliseconds since 1970-1-1 00:00:00'
+        new_dict['Time_Scale'] = 'UTC'
+        return self._filter_netcdf4_metadata(new_dict, np.int64)
+
+    def _netcdf4_file_attrs(self, fname, base_instrument, start, stop):
+        """Global attributes of netCDF4 files.
+
+        Parameters
+        ----------
+        fname : string
+            full path of file
+        base_instrument : pysat.Instrument
+            used as a comparison, only attributes that are present with
+            self and not on base_instrument are written to netCDF
+        start : datetime
+            first time in file
+        stop : datetime
+            last time in file
+
+        Returns
+        -------
+        dict
+
+        """
+
+        import pysat
+
+        # store any non standard attributes
+        # compare this Instrument's attributes to base object
+        base_attrb = dir(base_instrument)
+        this_attrb = dir(self)
+        # filter out any 'private' attributes
+        # those that start with a _
+        adict = {}
+        for key in this_attrb:
+            if key not in base_attrb:
+                if key[0] != '_':
+                    adict[key] = self.__getattribute__(key)
+        # store any non-standard attributes attached to meta
+        base_attrb = dir(base_instrument.meta)
+        this_attrb = dir(self.meta)
+        for key in this_attrb:
+            if key not in base_attrb:
+                if key[0] != '_':
+                    adict[key] = self.meta.__getattribute__(key)
+        # Add additional metadata to conform to standards
+        adict['pysat_version'] = pysat.__version__
+        if 'Conventions' not in adict:
+            adict['Conventions'] = 'SPDF ISTP/IACG Modified for NetCDF'
+        if 'Text_Supplement' not in adict:
+            adict['Text_Supplement'] = ''
+        # remove any attributes with the names below
+        # pysat is responible for including them in the file.
+        items = ['Date_End', 'Date_Start', 'File', 'File_Date',
+                 'Generation_Date', 'Logical_File_ID']
+        for item in items:
+            if item in adict:
+                _ = adict.pop(item)
+
+        adict['Date_End'] = \
+            pysat.datetime.strftime(stop,
+                                    '%a, %d %b %Y,  ' +
+                                    '%Y-%m-%dT%H:%M:%S.%f')
+        adict['Date_End'] = adict['Date_End'][:-3] + ' UTC'
+
+        adict['Date_Start'] = \
+            pysat.datetime.strftime(start,
+                                    '%a, %d %b %Y,  ' +
+                                    '%Y-%m-%dT%H:%M:%S.%f')
+        adict['Date_Start'] = adict['Date_Start'][:-3] + ' UTC'
+        adict['File'] = os.path.split(fname)
+        adict['File_Date'] = \
+            stop.strftime('%a, %d %b %Y,  ' + '%Y-%m-%dT%H:%M:%S.%f')
+        adict['File_Date'] = adict['File_Date'][:-3] + ' UTC'
+        adict['Generation_Date'] = \
+            pysat.datetime.utcnow().strftime('%Y%m%d')
+        adict['Logical_File_ID'] = os.path.split(fname)[-1].split('.')[:-1]
+
+        # check for binary types, convert when found
+        for key in adict.keys():
+            if isinstance(adict[key], bool):
+                adict[key] = int(adict[key])
+        return adict
+
     def to_netcdf4(self, fname=None, base_instrument=None, epoch_name='Epoch',
                    zlib=False, complevel=4, shuffle=True, preserve_meta_case=False):
         """Stores loaded data into a netCDF4 file.
@@ -2126,7 +3095,6 @@ class Instrument(object):
         """
 
         import netCDF4
-        import pysat
 
         file_format = 'NETCDF4'
         # base_instrument used to define the standard attributes attached
@@ -2136,27 +3104,9 @@ class Instrument(object):
             else base_instrument
 
         # begin processing metadata for writing to the file
-        # look to see if user supplied a list of export keys
-        # corresponding to internally tracked metadata within pysat
-        export_meta = self.generic_meta_translator(self.meta)
-        if self._meta_translation_table is None:
-            # didn't find a translation table, using the strings
-            # attached to the supplied pysat.Instrument object
-            export_name_labels = [self.name_label]
-            export_units_labels = [self.units_label]
-            export_desc_labels = [self.desc_label]
-            export_notes_labels = [self.notes_label]
-        else:
-            # user supplied labels in translation table
-            export_name_labels = self._meta_translation_table['name_label']
-            export_units_labels = self._meta_translation_table['units_label']
-            export_desc_labels = self._meta_translation_table['desc_label']
-            export_notes_labels = self._meta_translation_table['notes_label']
-            print('Using Metadata Translation Table: ',
-                  self._meta_translation_table)
-        # Apply instrument specific post-processing to the export_meta
-        if hasattr(self._export_meta_post_processing, '__call__'):
-            export_meta = self._export_meta_post_processing(export_meta)
+        export_meta, export_labels = self._netcdf4_export_meta()
+        export_name_labels = export_labels['name_label']
+        export_units_labels = export_labels['units_label']
 
         # check if there are multiple variables with same characters
         # but with different case
@@ -2186,43 +3136,9 @@ class Instrument(object):
                                              zlib=zlib,
                                              complevel=complevel,
                                              shuffle=shuffle)
-            # grab existing metadata for Epoch or create suitable info
-            if epoch_name in self.meta:
-                new_dict = export_meta[self.meta.var_case_name(epoch_name)]
-            else:
-                # create empty shell
-                new_dict = {}
-
-            # update required and basic information if not present
-            for export_name_label in export_name_labels:
-                if export_name_label not in new_dict:
-                    new_dict[export_name_label] = epoch_name
-
-            for export_units_label in export_units_labels:
-                if export_units_label not in new_dict:
-                    new_dict[export_units_label] = \
-                        'Milliseconds since 1970-1-1 00:00:00'
-
-            for export_desc_label in export_desc_labels:
-                if export_desc_label not in new_dict:
-                    new_dict[export_desc_label] = \
-                        'Milliseconds since 1970-1-1 00:00:00'
-
-            for export_notes_label in export_notes_labels:
-                if export_notes_label not in new_dict:
-                    new_dict[export_notes_label] = ''
-
-            new_dict['calendar'] = 'standard'
-            new_dict['Format'] = 'i8'
-            new_dict['Var_Type'] = 'data'
-            if self.index.is_monotonic_increasing:
-                new_dict['MonoTon'] = 'increase'
-            elif self.index.is_monotonic_decreasing:
-                new_dict['MonoTon'] = 'decrease'
-            new_dict['Time_Base'] = 'Milliseconds since 1970-1-1 00:00:00'
-            new_dict['Time_Scale'] = 'UTC'
-            new_dict = self._filter_netcdf4_metadata(new_dict, np.int64)
             # attach metadata
+            new_dict = self._netcdf4_epoch_meta(export_meta, export_labels,
+                                                epoch_name)
             cdfkey.setncatts(new_dict)
 
             # attach data
@@ -2522,62 +3438,93 @@ class Instrument(object):
                                     self[key].iloc[i].index.to_native_types()
                             cdfkey[:, :] = temp_cdf_data.astype(coltype)
 
-            # store any non standard attributes
-            # compare this Instrument's attributes to base object
-            base_attrb = dir(base_instrument)
-            this_attrb = dir(self)
-            # filter out any 'private' attributes
-            # those that start with a _
-            adict = {}
-            for key in this_attrb:
-                if key not in base_attrb:
-                    if key[0] != '_':
-                        adict[key] = self.__getattribute__(key)
-            # store any non-standard attributes attached to meta
-            base_attrb = dir(base_instrument.meta)
-            this_attrb = dir(self.meta)
-            for key in this_attrb:
-                if key not in base_attrb:
-                    if key[0] != '_':
-                        adict[key] = self.meta.__getattribute__(key)
-            # Add additional metadata to conform to standards
-            adict['pysat_version'] = pysat.__version__
-            if 'Conventions' not in adict:
-                adict['Conventions'] = 'SPDF ISTP/IACG Modified for NetCDF'
-            if 'Text_Supplement' not in adict:
-                adict['Text_Supplement'] = ''
-            # remove any attributes with the names below
-            # pysat is responible for including them in the file.
-            items = ['Date_End', 'Date_Start', 'File', 'File_Date',
-                     'Generation_Date', 'Logical_File_ID']
-            for item in items:
-                if item in adict:
-                    _ = adict.pop(item)
-
-            adict['Date_End'] = \
-                pysat.datetime.strftime(self.index[-1],
-                                        '%a, %d %b %Y,  ' +
-                                        '%Y-%m-%dT%H:%M:%S.%f')
-            adict['Date_End'] = adict['Date_End'][:-3] + ' UTC'
-
-            adict['Date_Start'] = \
-                pysat.datetime.strftime(self.index[0],
-                                        '%a, %d %b %Y,  ' +
-                                        '%Y-%m-%dT%H:%M:%S.%f')
-            adict['Date_Start'] = adict['Date_Start'][:-3] + ' UTC'
-            adict['File'] = os.path.split(fname)
-            adict['File_Date'] = \
-                self.index[-1].strftime('%a, %d %b %Y,  ' +
-                                        '%Y-%m-%dT%H:%M:%S.%f')
-            adict['File_Date'] = adict['File_Date'][:-3] + ' UTC'
-            adict['Generation_Date'] = \
-                pysat.datetime.utcnow().strftime('%Y%m%d')
-            adict['Logical_File_ID'] = os.path.split(fname)[-1].split('.')[:-1]
-
-            # check for binary types, convert when found
-            for key in adict.keys():
-                if isinstance(adict[key], bool):
-                    adict[key] = int(adict[key])
+            adict = self._netcdf4_file_attrs(fname, base_instrument,
+                                             self.index[0], self.index[-1])
             # attach attributes
             out_data.setncatts(adict)
         return
+
+
+def _filter_variables(variables):
+    """Standard form of a variable selection, a list of names or None."""
+
+    if variables is None:
+        return None
+    if isinstance(variables, basestring):
+        return [variables]
+    return list(variables)
+
+
+def _accepts_keyword(func, keyword):
+    """True if func has a named argument keyword.
+
+    Parameters
+    ----------
+    func : function or functools.partial
+        function to check
+    keyword : str
+        name of keyword argument
+
+    Returns
+    -------
+    bool
+        Functions only accepting keyword through **kwargs return False.
+
+    """
+
+    while isinstance(func, functools.partial):
+        func = func.func
+    try:
+        if hasattr(inspect, 'signature'):
+            return keyword in inspect.signature(func).parameters
+        else:
+            # python 2
+            return keyword in inspect.getargspec(func).args
+    except (TypeError, ValueError):
+        return False
+
+
+# Instrument used by each process in Instrument._parallel_map
+_worker_inst = None
+_worker_func = None
+
+
+def _init_load_worker(spec, func, args, kwargs):
+    """Create the Instrument used by this process for parallel loads."""
+
+    global _worker_inst, _worker_func
+    inst_module = importlib.import_module(spec['inst_module'])
+    _worker_inst = Instrument(inst_module=inst_module,
+                              temporary_file_list=True, **spec['init'])
+    # use the same file list as the parent Instrument
+    _worker_inst.files._attach_files(spec['files'])
+    _worker_inst.custom = spec['custom']
+    _worker_func = (func, args, kwargs)
+
+
+def _load_worker(task):
+    """Load a single task with the Instrument for this process."""
+
+    func, args, kwargs = _worker_func
+    return _load_task(_worker_inst, task, func, args, kwargs)
+
+
+def _load_task(inst, task, func, args, kwargs):
+    """Load a ('date', date) or ('fname', fname) task into inst.
+
+    Returns
+    -------
+    (date, result)
+        loaded date and func(inst, *args, **kwargs), or (data, meta)
+        if func is None.
+
+    """
+
+    kind, value = task
+    if kind == 'fname':
+        inst.load(fname=value)
+    else:
+        inst.load(date=value)
+    if func is not None:
+        return inst.date, func(inst, *args, **kwargs)
+    return inst.date, (inst.data, inst.meta)
@@ -2,10 +2,15 @@ from __future__ import print_function
 from __future__ import absolute_import
 
 import functools
+import hashlib
+import logging
 
 import numpy as np
 import pandas as pds
 from pysat import Series
+from . import _cache
+
+logger = logging.getLogger(__name__)
 
 
 class Orbits(object):
@@ -106,6 +111,14 @@ class Orbits(object):
         self.num = 0
         self._current = 0
         self.orbit_index = index
+        self.kind = kind
+        # orbit data handed out as a view of the day, see is_view
+        self._view = None
+        # start times of orbits over the season, see index_season
+        self.season_starts = None
+        self._season_stop = None
+        # loads and orbits from the last iter_season
+        self.season_stats = None
 
     @property
     def current(self):
@@ -153,6 +166,21 @@ class Orbits(object):
         self._orbit_breaks = []
         self.num = 0
         self._current = 0
+        self._view = None
+        self._fullDayData = None
+
+    def is_view(self, data):
+        """True if data is an orbit that shares memory with the day of data
+        held by Orbits.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or xarray.Dataset
+            data to be checked, usually inst.data
+
+        """
+
+        return (self._view is not None) and (data is self._view)
 
     def _calcOrbits(self):
         """Prepares data structure for breaking data into orbits. Not intended
@@ -162,12 +190,57 @@ class Orbits(object):
         # require reloads of whole dataset
         if len(self._orbit_breaks) == 0:
             # determine orbit breaks
-            self._detBreaks()
-            # store a copy of data
-            self._fullDayData = self.sat.data.copy()
+            self._findBreaks()
+            # keep the data, orbits are handed out as positional views of
+            # it rather than copies. Instrument copies a view before it is
+            # modified, see Instrument._copy_on_write
+            self._fullDayData = self.sat.data
             # set current orbit counter to zero (default)
             self._current = 0
 
+    def _findBreaks(self):
+        """Determine orbit breaks, unless stored in pysat.orbit_cache for
+        the loaded data."""
+
+        key = self._breaks_key()
+        breaks = None
+        if key is not None:
+            breaks = _cache.orbit_cache.get(key)
+        if breaks is None:
+            self._detBreaks()
+            if key is not None:
+                _cache.orbit_cache.put(key, self._orbit_breaks)
+        else:
+            self._orbit_breaks = breaks
+            self.num = len(breaks)
+
+    def _breaks_key(self):
+        """Key for the orbit breaks of the loaded data in pysat.orbit_cache.
+
+        Returns
+        -------
+        str or NoneType
+            None if breaks for the loaded data should not be cached
+
+        """
+
+        if not _cache.orbit_cache.enabled or self.orbit_index is None:
+            return None
+        try:
+            values = np.asarray(self.sat[self.orbit_index])
+        except KeyError:
+            # error is raised when breaks are determined
+            return None
+        if values.dtype == np.object_:
+            return None
+        # version of the data the breaks are determined from
+        digest = hashlib.sha1(np.asarray(self.sat.index.values).tobytes())
+        digest.update(np.ascontiguousarray(values).tobytes())
+        return _cache.make_key(self.sat.platform, self.sat.name, self.sat.tag,
+                               self.sat.sat_id, self.sat.date, self.kind,
+                               self.orbit_index, self.orbit_period,
+                               len(values), digest.hexdigest())
+
     def _equaBreaks(self, orbit_index_period=24.):
         """Determine where breaks in an equatorial satellite orbit occur.
 
@@ -212,37 +285,14 @@ class Orbits(object):
             # done for robustness
             if len(ind) > 1:
                 if min(dist) == 1:
-                    print('There are orbit breaks right next to each other')
+                    logger.info(' '.join(('There are orbit breaks right',
+                                          'next to each other')))
                 ind = ind[:-1][dist > 1]
 
             # check for large positive gradients around the break that would
             # suggest not a true orbit break, but rather bad orbit_index values
-            new_ind = []
-            for idx in ind:
-                tidx, = np.where(lt_diff[idx - 5:idx + 6] > 0.1)
-
-                if len(tidx) != 0:
-                    # there are large changes, suggests a false alarm
-                    # iterate over samples and check
-                    for tidx in tidx:
-                        # look at time change vs local time change
-                        if(ut_diff[idx - 5:idx + 6].iloc[tidx] <
-                           lt_diff[idx - 5:idx + 6].iloc[tidx] /
-                           orbit_index_period * self.orbit_period):
-                            # change in ut is small compared to the change in
-                            # the orbit index this is flagged as a false alarm,
-                            # or dropped from consideration
-                            pass
-                        else:
-                            # change in UT is significant, keep orbit break
-                            new_ind.append(idx)
-                            break
-                else:
-                    # no large positive gradients, current orbit break passes
-                    # the first test
-                    new_ind.append(idx)
-            # replace all breaks with those that are 'good'
-            ind = np.array(new_ind)
+            ind = self._filterBreaks(ind, lt_diff, ut_diff,
+                                     orbit_index_period)
 
         # now, assemble some orbit breaks that are not triggered by changes in
         # the orbit index
@@ -269,7 +319,7 @@ class Orbits(object):
             ind = np.hstack((ind, ut_ind))
             ind = np.sort(ind)
             ind = np.unique(ind)
-            print('Time Gap')
+            logger.info('Time Gap')
 
         # now that most problems in orbits should have been caught, look at
         # the time difference between orbits (not individual orbits)
@@ -306,6 +356,57 @@ class Orbits(object):
         # set number of orbits for the day
         self.num = num_orbits
 
+    def _filterBreaks(self, ind, lt_diff, ut_diff, orbit_index_period):
+        """Remove false alarms from candidate equatorial orbit breaks.
+
+        A break is a false alarm if there are large positive gradients in
+        the orbit index within five samples of it, and at each of them the
+        change in UT is small compared to the change in the orbit index.
+
+        Parameters
+        ----------
+        ind : np.array
+            positions of candidate orbit breaks
+        lt_diff : pandas.Series
+            difference in orbit index between samples
+        ut_diff : pandas.Series
+            difference in time between samples
+        orbit_index_period : float
+           The change in value of supplied index parameter for a single orbit
+
+        Returns
+        -------
+        np.array
+            positions of orbit breaks that pass the test
+
+        """
+
+        num = len(lt_diff)
+        lt_vals = np.asarray(lt_diff, dtype=float)
+        # large positive gradients, and those where the UT change is
+        # significant compared to the change in the orbit index
+        with np.errstate(invalid='ignore'):
+            pos = lt_vals > 0.1
+            small_ut = np.asarray(ut_diff / self.orbit_period) < \
+                lt_vals / orbit_index_period
+        good = pos & ~small_ut
+
+        # count each kind of sample within lt_diff[idx - 5:idx + 6], using
+        # python slice rules for the window at the ends of the data
+        ind = np.asarray(ind, dtype=int)
+        start = ind - 5
+        start = np.where(start < 0, np.maximum(start + num, 0), start)
+        stop = np.minimum(ind + 6, num)
+        empty = stop <= start
+        pos_sum = np.hstack(([0], np.cumsum(pos)))
+        good_sum = np.hstack(([0], np.cumsum(good)))
+        num_pos = np.where(empty, 0, pos_sum[stop] - pos_sum[start])
+        num_good = np.where(empty, 0, good_sum[stop] - good_sum[start])
+
+        # keep breaks without large positive gradients, or where the change
+        # in UT is significant for at least one of them
+        return ind[(num_pos == 0) | (num_good > 0)]
+
     def _polarBreaks(self):
         """Determine where breaks in a polar orbiting satellite orbit occur.
 
@@ -359,7 +460,7 @@ class Orbits(object):
         """Determine where orbital breaks in a dataset with orbit numbers
         occur.
 
-        Looks for changes in unique values.
+        Looks for changes in value between consecutive samples.
 
         """
 
@@ -375,21 +476,16 @@ class Orbits(object):
                                           'Provided orbit index does not ',
                                           'appear to exist in loaded data')))
 
-        # determine where the orbit index changes from one value to the next
-        uniq_vals = np.unique(self.sat[self.orbit_index].values)
-        orbit_index = []
-        for val in uniq_vals:
-            idx, = np.where(val == self.sat[self.orbit_index].values)
-            orbit_index.append(idx[0])
+        # determine where the orbit index changes from one value to the next,
+        # in time order, so orbit numbers need not increase
+        vals = np.asarray(self.sat[self.orbit_index].values)
+        change = vals[1:] != vals[:-1]
+        if vals.dtype.kind == 'f':
+            # a run of missing orbit numbers is a single orbit
+            change &= ~(np.isnan(vals[1:]) & np.isnan(vals[:-1]))
 
         # create orbitbreak index, ensure first element is always 0
-        if len(orbit_index) > 0:
-            if orbit_index[0] != 0:
-                ind = np.hstack((np.array([0]), orbit_index))
-            else:
-                ind = orbit_index
-        else:
-            ind = np.array([0])
+        ind = np.hstack((np.array([0]), np.flatnonzero(change) + 1))
         # number of orbits
         num_orbits = len(ind)
         # set index of orbit breaks
@@ -452,6 +548,7 @@ class Orbits(object):
                     self.sat.data = []
                     raise ValueError('Requested an orbit past total orbits ' +
                                      'for day')
+                self._view = self.sat.data
             else:
                 raise ValueError('Must set an orbit')
 
@@ -561,14 +658,14 @@ class Orbits(object):
                     except StopIteration:
                         self._getBasicOrbit(orbit=1)
                         # includes hack to appear to be zero indexed
-                        print('Loaded Orbit:%i' % (self._current - 1))
+                        logger.info('Loaded Orbit:%i', self._current - 1)
                         # check if the first orbit is also the last orbit
 
                 elif orbit < self.num:
                     # load orbit data into data
                     self._getBasicOrbit(orbit)
                     # includes hack to appear to be zero indexed
-                    print('Loaded Orbit:%i' % (self._current - 1))
+                    logger.info('Loaded Orbit:%i', self._current - 1)
 
                 else:
                     # gone too far
@@ -578,7 +675,90 @@ class Orbits(object):
             else:
                 raise Exception('Must set an orbit')
         else:
-            print('No data loaded in instrument object to determine orbits.')
+            logger.warning('No data loaded in instrument object to '
+                           'determine orbits.')
+
+    def index_season(self):
+        """Determine the start time of every orbit over the season.
+
+        Loads each day (or file) within the Instrument bounds and records the
+        start time of each orbit in `season_starts`, so that any orbit of
+        the season may be loaded directly with `load_season`.
+
+        Returns
+        -------
+        pandas.DatetimeIndex
+            start time of each orbit, also stored as season_starts
+
+        Note
+        ----
+        The first orbit of a day continues the last orbit of the previous
+        day unless the data is separated by more than an orbital period.
+        Breaks determined here are stored in pysat.orbit_cache, and are
+        reused when iterating over the same days. The last day of the
+        season remains loaded.
+
+        Examples
+        --------
+        ::
+
+            inst.bounds = (start, stop)
+            inst.orbits.index_season()
+            # load the 100th orbit of the season
+            inst.orbits.load_season(99)
+
+        """
+
+        starts = []
+        last_time = None
+        for sat in self.sat:
+            if sat.empty:
+                continue
+            self._findBreaks()
+            times = sat.index[self._orbit_breaks]
+            if last_time is not None and \
+                    times[0] - last_time < self.orbit_period:
+                times = times[1:]
+            starts.extend(times)
+            last_time = sat.index[-1]
+            self._reset()
+
+        self.season_starts = pds.DatetimeIndex(starts)
+        if last_time is not None:
+            self._season_stop = last_time + pds.Timedelta(microseconds=1)
+        return self.season_starts
+
+    def load_season(self, orbit):
+        """Load a particular orbit of the season into .data.
+
+        Parameters
+        ----------
+        orbit : int
+            orbit number within the season, zero indexed. Negative
+            indexes allowed, -1 last orbit.
+
+        Note
+        ----
+        `index_season` must be run first. The orbit is loaded as a time
+        window, see Instrument.load, without loading any other orbits.
+
+        """
+
+        if self.season_starts is None:
+            raise ValueError('Orbits of the season must be found with '
+                             'index_season first.')
+        num = len(self.season_starts)
+        if orbit < 0:
+            orbit += num
+        if (orbit < 0) or (orbit >= num):
+            raise ValueError('Requested an orbit past total orbits for '
+                             'season')
+        start = self.season_starts[orbit]
+        if orbit + 1 < num:
+            stop = self.season_starts[orbit + 1]
+        else:
+            stop = self._season_stop
+        self.sat.load(start=start, stop=stop)
 
     def next(self, *arg, **kwarg):
         """Load the next orbit into .data.
@@ -634,7 +814,7 @@ class Orbits(object):
                         pass
                     del temp_orbit_data
                 # includes hack to appear to be zero indexed
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             elif self._current == (self.num):
                 # at the last orbit, need to be careful about getting the next
@@ -694,7 +874,7 @@ class Orbits(object):
 
                 del temp_orbit_data
                 # includes hack to appear to be zero indexed
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             elif self._current == 0:
                 # no current orbit set, grab the first one
@@ -707,7 +887,7 @@ class Orbits(object):
                 # orbit
                 self._getBasicOrbit(orbit=self._current + 1)
                 # includes hack to appear to be zero indexed
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             else:
                 raise Exception(' '.join(('You ended up where nobody should',
@@ -743,7 +923,7 @@ class Orbits(object):
             if (self._current > 2) & (self._current <= self.num):
                 # load orbit and put it into self.sat.data
                 self._getBasicOrbit(orbit=self._current - 1)
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             # if current orbit near the first, must be careful
             elif self._current == 2:
@@ -785,7 +965,7 @@ class Orbits(object):
 
                     del temp_orbit_data
 
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             elif self._current == 0:
                 self.load(orbit=-1)
@@ -831,7 +1011,7 @@ class Orbits(object):
                     self._getBasicOrbit(orbit=-1)
 
                 del temp_orbit_data
-                print('Loaded Orbit:%i' % (self._current - 1))
+                logger.info('Loaded Orbit:%i', self._current - 1)
 
             else:
                 raise Exception(' '.join(('You ended up where nobody should',
@@ -875,3 +1055,84 @@ class Orbits(object):
                 yield self.sat
             except StopIteration:
                 return
+
+    def iter_season(self):
+        """Iterate over the complete orbits of the season, loading each day
+        (or file) only once.
+
+        Days are loaded in turn and held in a rolling buffer with the
+        unfinished last orbit of the previous day, so orbits spanning day
+        boundaries are formed without reloading data. The number of loads
+        and orbits is reported in `season_stats`.
+
+        Examples
+        --------
+        ::
+
+            inst.bounds = (start, stop)
+            for inst in inst.orbits.iter_season():
+                print('next available orbit ', inst.data)
+            print(inst.orbits.season_stats['loads_per_orbit'])
+
+        Note
+        ----
+        Limits of iteration set by setting inst.bounds. The last orbit of
+        the season is not completed with data from after the bounds.
+
+        """
+
+        self.season_stats = {'loads': 0, 'orbits': 0,
+                             'loads_per_orbit': np.nan}
+        tail = None
+        for sat in self.sat:
+            self.season_stats['loads'] += 1
+            if sat.empty:
+                continue
+            buffer = sat.data
+            if tail is not None:
+                # drop any of the unfinished orbit also in the new data
+                first = sat.index[0]
+                _, stop = sat._window_bounds(sat._index(tail), first, first)
+                buffer = sat.concat_data([sat._slice_data(tail, 0, stop),
+                                          buffer])
+            for orbit in self._buffer_orbits(buffer):
+                if orbit == self.num:
+                    # last orbit may continue in the next day
+                    tail = self.sat.data
+                else:
+                    self._count_season_orbit()
+                    yield self.sat
+
+        if tail is not None:
+            for orbit in self._buffer_orbits(tail):
+                self._count_season_orbit()
+                yield self.sat
+
+    def _buffer_orbits(self, buffer):
+        """Set each orbit in buffer as the Instrument data, in turn.
+
+        Parameters
+        ----------
+        buffer : pandas.DataFrame or xarray.Dataset
+            data to be broken into orbits
+
+        Returns
+        -------
+        generator of int
+            orbit number within buffer, 1 indexed, loaded into .data
+
+        """
+
+        self.sat.data = buffer
+        self._orbit_breaks = []
+        self._calcOrbits()
+        for orbit in range(1, self.num + 1):
+            self._getBasicOrbit(orbit)
+            yield orbit
+
+    def _count_season_orbit(self):
+        """Update season_stats for an orbit handed out by iter_season."""
+
+        self.season_stats['orbits'] += 1
+        self.season_stats['loads_per_orbit'] = \
+            float(self.season_stats['loads']) / self.season_stats['orbits']
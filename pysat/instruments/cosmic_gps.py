@@ -137,7 +137,7 @@ def list_files(tag=None, sat_id=None, data_path=None, format_str=None):
         return pysat.Series(None)
 
 
-def load(fnames, tag=None, sat_id=None):
+def load(fnames, tag=None, sat_id=None, workers=1):
     """Load COSMIC GPS files.
 
     Parameters
@@ -148,6 +148,10 @@ def load(fnames, tag=None, sat_id=None):
         tag or None (default=None)
     sat_id : (str or NoneType)
         satellite id or None (default=None)
+    workers : (int)
+        Number of files read at the same time by a pool of processes. Set
+        through the Instrument, e.g. pysat.Instrument('cosmic', 'gps',
+        'ionprf', workers=4) (default=1)
 
     Returns
     -------
@@ -161,9 +165,10 @@ def load(fnames, tag=None, sat_id=None):
     num = len(fnames)
     # make sure there are files to read
     if num != 0:
-        # call separate load_files routine, segemented for possible
-        # multiprocessor load, not included and only benefits about 20%
-        output = pysat.DataFrame(load_files(fnames, tag=tag, sat_id=sat_id))
+        # call separate load_files routine, which may read several files
+        # at a time
+        output = pysat.DataFrame(load_files(fnames, tag=tag, sat_id=sat_id,
+                                            workers=workers))
         utsec = output.hour * 3600. + output.minute * 60. + output.second
         output.index = \
             pysat.utils.time.create_datetime_index(year=output.year,
@@ -199,15 +204,47 @@ def load(fnames, tag=None, sat_id=None):
         return pysat.DataFrame(None), pysat.Meta()
 
 
-# seperate routine for doing actual loading. This was broken off from main load
-# becuase I was playing around with multiprocessor loading
-# yielded about 20% improvement in execution time
-def load_files(files, tag=None, sat_id=None, altitude_bin=None):
+def _load_file(fname):
+    """Load a single COSMIC data file.
+
+    Parameters
+    ----------
+    fname : (str)
+        filename
+
+    Returns
+    -------
+    output : (dict)
+        file attributes, with the profile data as a DataFrame under
+        'profiles'
+
+    """
+
+    with netCDF4.Dataset(fname) as data:
+        # build up dictionary will all ncattrs
+        new = {}
+        # get list of file attributes
+        ncattrsList = data.ncattrs()
+        for d in ncattrsList:
+            new[d] = data.getncattr(d)
+        # load all of the variables in the netCDF
+        loadedVars = {}
+        keys = data.variables.keys()
+        for key in keys:
+            if data.variables[key][:].dtype.byteorder != '=':
+                loadedVars[key] = \
+                    data.variables[key][:].byteswap().newbyteorder()
+            else:
+                loadedVars[key] = data.variables[key][:]
+
+        new['profiles'] = pysat.DataFrame(loadedVars)
+    return new
+
+
+def load_files(files, tag=None, sat_id=None, altitude_bin=None, workers=1):
     """Load COSMIC data files directly from a given list.
 
-    May be directly called by user, but in general is called by load.  This is
-    separate from the main load function for future support of multiprocessor
-    loading.
+    May be directly called by user, but in general is called by load.
 
     Parameters
     ----------
@@ -220,6 +257,9 @@ def load_files(files, tag=None, sat_id=None, altitude_bin=None):
     altitude_bin : integer
         Number of kilometers to bin altitude profiles by when loading.
         Currently only supported for tag='ionprf'.
+    workers : (int)
+        Number of files read at the same time by a pool of processes, see
+        pysat.utils.read_files (default=1)
 
     Returns
     -------
@@ -227,41 +267,12 @@ def load_files(files, tag=None, sat_id=None, altitude_bin=None):
         Object containing satellite data
 
     """
-    output = [None] * len(files)
-    drop_idx = []
-    for (i, file) in enumerate(files):
-        try:
-            data = netCDF4.Dataset(file)
-            # build up dictionary will all ncattrs
-            new = {}
-            # get list of file attributes
-            ncattrsList = data.ncattrs()
-            for d in ncattrsList:
-                new[d] = data.getncattr(d)
-            # load all of the variables in the netCDF
-            loadedVars = {}
-            keys = data.variables.keys()
-            for key in keys:
-                if data.variables[key][:].dtype.byteorder != '=':
-                    loadedVars[key] = \
-                        data.variables[key][:].byteswap().newbyteorder()
-                else:
-                    loadedVars[key] = data.variables[key][:]
-
-            new['profiles'] = pysat.DataFrame(loadedVars)
-
-            output[i] = new
-            data.close()
-        except RuntimeError:
-            # some of the files have zero bytes, which causes a read error
-            # this stores the index of these zero byte files so I can drop
-            # the Nones the gappy file leaves behind
-            drop_idx.append(i)
-
-    # drop anything that came from the zero byte files
-    drop_idx.reverse()
-    for i in drop_idx:
-        del output[i]
+    # some of the files have zero bytes, which causes a read error.
+    # These files are dropped.
+    output, errors = pysat.utils.read_files(_load_file, files,
+                                            workers=workers, processes=True,
+                                            catch=RuntimeError)
+    output = [out for out in output if out is not None]
 
     if tag == 'ionprf':
         if altitude_bin is not None:
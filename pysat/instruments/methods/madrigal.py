@@ -28,7 +28,7 @@ def cedar_rules():
 
 
 # support load routine
-def load(fnames, tag=None, sat_id=None, xarray_coords=[]):
+def load(fnames, tag=None, sat_id=None, xarray_coords=[], variables=None):
     """Loads data from Madrigal into Pandas.
 
     This routine is called as needed by pysat. It is not intended
@@ -50,6 +50,10 @@ def load(fnames, tag=None, sat_id=None, xarray_coords=[]):
     xarray_coords : list
         List of keywords to use as coordinates if xarray output is desired
         instead of a Pandas DataFrame (default=[])
+    variables : list-like or NoneType
+        Names of variables to load, along with their metadata. Only these
+        fields, the time fields, and any xarray_coords are read from file.
+        If None, all variables are loaded. (default=None)
 
     Returns
     -------
@@ -84,6 +88,12 @@ def load(fnames, tag=None, sat_id=None, xarray_coords=[]):
     meta.info = {'acknowledgements': "See 'meta.Experiment_Notes' for " +
                  "instrument specific acknowledgements\n" + cedar_rules(),
                  'references': "See 'meta.Experiment_Notes' for references"}
+    # fields used to construct the time index, and coordinates
+    time_keys = np.array(['year', 'month', 'day', 'hour', 'min', 'sec'])
+    if variables is not None:
+        wanted = [var.lower() for var in variables]
+        wanted.extend(time_keys)
+        wanted.extend([xkey.lower() for xkey in xarray_coords])
     labels = []
     for item in file_meta:
         # handle difference in string output between python 2 and 3
@@ -94,6 +104,8 @@ def load(fnames, tag=None, sat_id=None, xarray_coords=[]):
             name_string = name_string.decode('UTF-8')
             unit_string = unit_string.decode('UTF-8')
             desc_string = desc_string.decode('UTF-8')
+        if (variables is not None) and (name_string.lower() not in wanted):
+            continue
         labels.append(name_string)
         meta[name_string.lower()] = {'long_name': name_string,
                                      'units': unit_string,
@@ -107,11 +119,13 @@ def load(fnames, tag=None, sat_id=None, xarray_coords=[]):
         if key != 'Data Parameters':
             setattr(meta, key.replace(' ', '_'), filed['Metadata'][key][:])
     # data into frame, with labels from metadata
+    if variables is not None:
+        # read only the selected fields from the table
+        file_data = file_data[tuple(labels)]
     data = pds.DataFrame.from_records(file_data, columns=labels)
     # lowercase variable names
     data.columns = [item.lower() for item in data.columns]
     # datetime index from times
-    time_keys = np.array(['year', 'month', 'day', 'hour', 'min', 'sec'])
     if not np.all([key in data.columns for key in time_keys]):
         time_keys = [key for key in time_keys if key not in data.columns]
         raise ValueError("unable to construct time index, missing " +
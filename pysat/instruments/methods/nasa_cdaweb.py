@@ -94,7 +94,7 @@ def list_files(tag=None, sat_id=None, data_path=None, format_str=None,
 
 def load(fnames, tag=None, sat_id=None,
          fake_daily_files_from_monthly=False,
-         flatten_twod=True):
+         flatten_twod=True, variables=None):
     """Load NASA CDAWeb CDF files.
 
     This routine is intended to be used by pysat instrument modules supporting
@@ -117,6 +117,9 @@ def load(fnames, tag=None, sat_id=None,
     flatted_twod : bool
         Flattens 2D data into different columns of root DataFrame rather
         than produce a Series of DataFrames
+    variables : list-like or NoneType
+        Names of variables to return, along with their metadata. If None,
+        all variables are returned. (default=None)
 
     Returns
     ---------
@@ -162,11 +165,19 @@ def load(fnames, tag=None, sat_id=None,
                 # select data from monthly
                 data = data.loc[date:date+pds.DateOffset(days=1)
                                 - pds.DateOffset(microseconds=1), :]
-                return data, meta
         else:
             # basic data return
             with pysatCDF.CDF(fnames[0]) as cdf:
-                return cdf.to_pysat(flatten_twod=flatten_twod)
+                data, meta = cdf.to_pysat(flatten_twod=flatten_twod)
+
+        if variables is not None:
+            # pysatCDF reads the full file, trim down before further
+            # processing by pysat
+            wanted = [var.lower() for var in variables]
+            data = data[[var for var in data.columns
+                         if var.lower() in wanted]]
+            meta.keep([var for var in meta.keys() if var.lower() in wanted])
+        return data, meta
 
 
 def download(supported_tags, date_array, tag, sat_id,
@@ -76,7 +76,7 @@ def init(self):
     return
 
 
-def load(fnames, tag=None, sat_id=None, **kwargs):
+def load(fnames, tag=None, sat_id=None, variables=None, **kwargs):
     """Loads TIEGCM data using xarray.
 
     This routine is called as needed by pysat. It is not intended
@@ -93,6 +93,9 @@ def load(fnames, tag=None, sat_id=None, **kwargs):
     sat_id : string ('')
         Satellite ID used to identify particular data set to be loaded.
         This input is nominally provided by pysat itself.
+    variables : list-like or NoneType
+        Names of variables to load. Other variables are not read from file.
+        If None, all variables are loaded. (default=None)
     **kwargs : extra keywords
         Passthrough for additional keyword arguments specified when
         instantiating an Instrument object. These additional keywords
@@ -143,6 +146,13 @@ def load(fnames, tag=None, sat_id=None, **kwargs):
     # remove these variables from xarray
     data = data.drop(['p0', 'p0_model', 'grav', 'mag', 'timestep'])
 
+    if variables is not None:
+        # data is read lazily, only requested variables are loaded
+        wanted = [var.lower() for var in variables]
+        data = data[[var for var in data.data_vars
+                     if var.lower() in wanted]]
+        meta.keep([var for var in meta.keys() if var.lower() in wanted])
+
     return data, meta
 
 
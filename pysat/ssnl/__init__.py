@@ -7,6 +7,8 @@ are independent of instrument type.
 Main Features
 -------------
 - Seasonal averaging routine for 1D and 2D data.
+- Mergeable quantile sketches for approximate seasonal medians.
+- Mergeable accumulators so a season may be split across processes.
 - Occurrence probability routines, daily or by orbit.
 - Scatterplot of data_label(s) as functions of labelx,y
     over a season.
@@ -14,6 +16,8 @@ Main Features
 """
 
 from . import occur_prob
+from . import accumulators
 from . import avg
 from . import plot
 from ._core import computational_form
+from ._sketch import QuantileSketch
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Mergeable streaming quantile sketch, used for approximate seasonal medians
+with bounded memory.
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+
+import numpy as np
+
+
+class QuantileSketch(object):
+    """KLL quantile sketch of a stream of values.
+
+    Parameters
+    ----------
+    k : int
+        Size parameter controlling accuracy and memory. At most about
+        3 * k values are stored regardless of the number of samples.
+        (default=200)
+    seed : int or NoneType
+        seed for the random choices made when values are compacted
+        (default=None)
+
+    Attributes
+    ----------
+    count : int
+        number of (finite) values added to the sketch
+
+    Note
+    ----
+    Implements the sketch of Karnin, Lang, and Liberty (2016). Values are
+    held in levels, where each value at level h stands for 2**h samples.
+    When a level is full it is sorted and every other value is promoted to
+    the next level. The rank of a value returned by `quantile` differs from
+    the requested rank by less than about 3.3 / k of the count (1.65% for
+    the default k) with 99% probability. The error does not grow with the
+    number of samples or with merges.
+
+    NaN and infinite values are ignored.
+
+    Sketches may be pickled, or converted to and from a dictionary with
+    `to_dict` and `from_dict`, and merged with sketches of other data using
+    the same k.
+
+    Examples
+    --------
+    ::
+
+        sketch = QuantileSketch()
+        sketch.update(inst['dummy1'])
+        sketch.merge(other_sketch)
+        median = sketch.quantile(0.5)
+
+    """
+
+    def __init__(self, k=200, seed=None):
+        if k < 2:
+            raise ValueError('Sketch size k must be at least 2.')
+        self.k = int(k)
+        self.count = 0
+        self._levels = [np.array([], dtype=float)]
+        self._rng = np.random.RandomState(seed)
+
+    def __repr__(self):
+        return ''.join(('pysat QuantileSketch(k=', str(self.k), ', count=',
+                        str(self.count), ', stored=', str(self.size), ')'))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def size(self):
+        """Number of values stored in the sketch."""
+
+        return sum(len(level) for level in self._levels)
+
+    def _capacity(self, level):
+        """Number of values that may be held at level before compaction."""
+
+        depth = len(self._levels) - level - 1
+        return max(int(np.ceil(self.k * (2. / 3.)**depth)), 2)
+
+    def _compress(self):
+        """Compact full levels until the sketch is within its capacity."""
+
+        while True:
+            full = [h for h in range(len(self._levels))
+                    if len(self._levels[h]) > self._capacity(h)]
+            if len(full) == 0:
+                return
+            h = full[0]
+            if h + 1 == len(self._levels):
+                self._levels.append(np.array([], dtype=float))
+            level = np.sort(self._levels[h])
+            # an odd value out remains at this level
+            if len(level) % 2 == 1:
+                keep = level[-1:]
+                level = level[:-1]
+            else:
+                keep = level[:0]
+            offset = self._rng.randint(2)
+            self._levels[h + 1] = np.hstack((self._levels[h + 1],
+                                             level[offset::2]))
+            self._levels[h] = keep
+
+    def update(self, values):
+        """Add values to the sketch.
+
+        Parameters
+        ----------
+        values : array-like
+            values to be added, NaN and infinite values are ignored
+
+        """
+
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self._levels[0] = np.hstack((self._levels[0], values))
+        self._compress()
+
+    def merge(self, other):
+        """Add the values summarized by another sketch to this sketch.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            sketch with the same k
+
+        """
+
+        if other.k != self.k:
+            raise ValueError('Only sketches with the same k may be merged.')
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.array([], dtype=float))
+        for h, level in enumerate(other._levels):
+            self._levels[h] = np.hstack((self._levels[h], level))
+        self.count += other.count
+        self._compress()
+
+    def _weighted(self):
+        """Sorted stored values and the number of samples each represents."""
+
+        values = np.hstack(self._levels)
+        weights = np.hstack([np.full(len(level), 2.**h)
+                             for h, level in enumerate(self._levels)])
+        order = np.argsort(values, kind='mergesort')
+        return values[order], weights[order]
+
+    @staticmethod
+    def _weighted_quantile(values, weights, q):
+        """Quantile q of sorted values with weights."""
+
+        cumulative = np.cumsum(weights)
+        ind = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1],
+                              side='left')
+        return values[np.minimum(ind, len(values) - 1)]
+
+    def quantile(self, q):
+        """Approximate quantile of the values added to the sketch.
+
+        Parameters
+        ----------
+        q : float or array-like
+            quantile(s) to be returned, between 0 and 1
+
+        Returns
+        -------
+        float or np.array
+            quantile(s), NaN if the sketch is empty
+
+        """
+
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) > 0 else np.nan
+        values, weights = self._weighted()
+        return self._weighted_quantile(values, weights, q)
+
+    def median(self):
+        """Approximate median of the values added to the sketch."""
+
+        return self.quantile(0.5)
+
+    def median_abs_dev(self):
+        """Approximate median absolute deviation from the median.
+
+        Note
+        ----
+        Computed from the deviations of the stored values from the
+        approximate median, weighted by the samples each value represents.
+
+        """
+
+        if self.count == 0:
+            return np.nan
+        values, weights = self._weighted()
+        median = self._weighted_quantile(values, weights, 0.5)
+        deviation = np.abs(values - median)
+        order = np.argsort(deviation, kind='mergesort')
+        return self._weighted_quantile(deviation[order], weights[order], 0.5)
+
+    def to_dict(self):
+        """Sketch as a dictionary of built-in types, e.g. to store as JSON.
+        """
+
+        return {'k': self.k, 'count': self.count,
+                'levels': [level.tolist() for level in self._levels]}
+
+    @classmethod
+    def from_dict(cls, info, seed=None):
+        """Create a sketch from the output of `to_dict`.
+
+        Parameters
+        ----------
+        info : dict
+            output from QuantileSketch.to_dict
+        seed : int or NoneType
+            seed for the random choices made when values are compacted
+            (default=None)
+
+        Returns
+        -------
+        QuantileSketch
+
+        """
+
+        sketch = cls(k=info['k'], seed=seed)
+        sketch.count = int(info['count'])
+        sketch._levels = [np.asarray(level, dtype=float)
+                          for level in info['levels']]
+        return sketch
@@ -0,0 +1,713 @@
+# -*- coding: utf-8 -*-
+"""
+Mergeable accumulators of seasonal statistics.
+
+Each accumulator is updated with one increment of data at a time (a day,
+file, or orbit) and holds the partial result for the data seen so far.
+Partial results from different parts of a season, e.g. computed by
+separate processes or machines, may be combined with `merge` before the
+statistics are calculated with `finalize`. Accumulators may be pickled, or
+stored with `save` and restored with `load`.
+
+Examples
+--------
+::
+
+    # monthly shards, run separately
+    acc = pysat.ssnl.accumulators.MedianAccumulator(
+        ['mlt'], [np.linspace(0., 24., 25)], ['dummy1'])
+    inst.bounds = (pysat.datetime(2009, 1, 1), pysat.datetime(2009, 1, 31))
+    for inst in inst:
+        acc.update(inst)
+    acc.save('2009_01.pkl')
+
+    # reduce
+    acc = pysat.ssnl.accumulators.load('2009_01.pkl')
+    acc.merge(pysat.ssnl.accumulators.load('2009_02.pkl'))
+    results = acc.finalize()
+
+"""
+
+from __future__ import print_function
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+import pandas as pds
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+import pysat
+from ._sketch import QuantileSketch
+
+
+def load(fname):
+    """Load an accumulator stored with `save`.
+
+    Parameters
+    ----------
+    fname : str
+        name of file
+
+    Returns
+    -------
+    accumulator
+
+    """
+
+    with open(fname, 'rb') as fin:
+        return pickle.load(fin)
+
+
+class Accumulator(object):
+    """Base class for accumulators of seasonal statistics."""
+
+    def update(self, inst):
+        """Add the data loaded in inst to the partial result.
+
+        Must be overridden by subclasses.
+
+        Parameters
+        ----------
+        inst : pysat.Instrument
+            instrument with data loaded
+
+        """
+
+        raise NotImplementedError('Accumulators must define update.')
+
+    def merge(self, other):
+        """Add the partial result from another accumulator to this one.
+
+        Must be overridden by subclasses.
+
+        Parameters
+        ----------
+        other : Accumulator
+            accumulator of the same type and setup
+
+        """
+
+        raise NotImplementedError('Accumulators must define merge.')
+
+    def finalize(self):
+        """Calculate statistics from the partial result.
+
+        Must be overridden by subclasses, which may accept further keywords.
+
+        """
+
+        raise NotImplementedError('Accumulators must define finalize.')
+
+    def update_all(self, iterator):
+        """Update with each increment of data from an iterator.
+
+        Parameters
+        ----------
+        iterator : pysat.Instrument, pysat.Orbits, or similar
+            iterated over to load data, e.g. inst or inst.orbits
+
+        """
+
+        for inst in iterator:
+            self.update(inst)
+
+    def save(self, fname):
+        """Store the partial result in a file, restored with `load`.
+
+        Parameters
+        ----------
+        fname : str
+            name of file
+
+        """
+
+        with open(fname, 'wb') as fout:
+            pickle.dump(self, fout, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _check_compatible(self, other, attrs):
+        """Raise ValueError if other doesn't have the same setup."""
+
+        if type(other) != type(self):
+            raise ValueError('Only accumulators of the same type may be '
+                             'merged.')
+        for attr in attrs:
+            mine = getattr(self, attr)
+            theirs = getattr(other, attr)
+            if attr == 'bins':
+                same = (len(mine) == len(theirs)) and \
+                    all(np.array_equal(edges1, edges2)
+                        for edges1, edges2 in zip(mine, theirs))
+            else:
+                same = mine == theirs
+            if not same:
+                raise ValueError(''.join(('Accumulators with different ',
+                                          attr, ' may not be merged.')))
+
+
+def _flat_bin_id(data, labels, bins):
+    """Flat bin number of each sample that falls within the bins.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        loaded data
+    labels : list of str
+        data column names that binning is performed over, one per dimension
+    bins : list of array-like
+        bin edges for each dimension
+
+    Returns
+    -------
+    index : np.array
+        positions of the samples within bins, in time order
+    bin_id : np.array
+        flat (C order) bin number of each sample in index
+
+    """
+
+    shape = tuple(len(edges) - 1 for edges in bins)
+    valid = np.ones(len(data), dtype=bool)
+    inds = []
+    for label, edges, num in zip(labels, bins, shape):
+        ind = np.digitize(data[label], edges) - 1
+        valid &= (ind >= 0) & (ind < num)
+        inds.append(ind)
+
+    index, = np.where(valid)
+    bin_id = np.ravel_multi_index([ind[index] for ind in inds], shape)
+    return index, bin_id
+
+
+def _bin_index(data, labels, bins):
+    """Sort samples by the bin they fall in.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        loaded data
+    labels : list of str
+        data column names that binning is performed over, one per dimension
+    bins : list of array-like
+        bin edges for each dimension
+
+    Returns
+    -------
+    index : np.array
+        positions of the samples within bins, ordered by bin and then time
+    bin_id : np.array
+        flat (C order) bin number of each sample in index
+
+    """
+
+    index, bin_id = _flat_bin_id(data, labels, bins)
+    # stable sort keeps samples within each bin in time order
+    order = np.argsort(bin_id, kind='mergesort')
+    return index[order], bin_id[order]
+
+
+def _split_bins(data, labels, bins):
+    """Locate the contiguous range of samples in each occupied bin.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        loaded data
+    labels : list of str
+        data column names that binning is performed over, one per dimension
+    bins : list of array-like
+        bin edges for each dimension
+
+    Returns
+    -------
+    index : np.array
+        positions of the samples within bins, ordered by bin and then time
+    bin_ids : np.array
+        flat (C order) number of each occupied bin
+    starts, stops : np.array
+        range of index for the samples in each occupied bin
+
+    """
+
+    index, bin_id = _bin_index(data, labels, bins)
+    # samples for each bin are contiguous after sorting
+    splits = np.flatnonzero(np.diff(bin_id)) + 1
+    starts = np.hstack(([0], splits)).astype(int)
+    stops = np.hstack((splits, [len(index)])).astype(int)
+    if len(index) == 0:
+        starts = stops = splits
+    return index, bin_id[starts], starts, stops
+
+
+def _grouped_median(values, groups, num):
+    """Median of values within each group.
+
+    Parameters
+    ----------
+    values : np.array
+        values to be averaged
+    groups : np.array of int
+        group number of each value
+    num : int
+        number of groups
+
+    Returns
+    -------
+    median : np.array
+        median of each group, NaN if group is empty
+    count : np.array
+        number of values in each group
+
+    """
+
+    # sort by group, then value
+    order = np.lexsort((values, groups))
+    values = values[order]
+    count = np.bincount(groups, minlength=num)
+    start = np.cumsum(count) - count
+    median = np.full(num, np.nan)
+    good, = np.where(count > 0)
+    # average of the middle two values, the same value for odd counts
+    low = values[start[good] + (count[good] - 1) // 2]
+    high = values[start[good] + count[good] // 2]
+    median[good] = 0.5 * (low + high)
+    return median, count
+
+
+def _nest(flat, shape):
+    """Nested lists (one level per dimension) from a flat C ordered list."""
+
+    if len(shape) == 1:
+        return flat
+    step = len(flat) // shape[0]
+    return [_nest(flat[i * step:(i + 1) * step], shape[1:])
+            for i in range(shape[0])]
+
+
+class MedianAccumulator(Accumulator):
+    """Median of data within bins over a season.
+
+    Parameters
+    ----------
+    labels : list of str
+        data column names that binning is performed over, one per dimension.
+        Output arrays are ordered the same way, e.g. [label_y, label_x].
+    bins : list of array-like
+        bin edges for each dimension
+    data_label : list-like
+        contains strings identifying data product(s) to be averaged
+    method : str
+        'exact' stores all data until finalized. 'sketch' summarizes
+        scalar data in each bin with a QuantileSketch, using bounded memory.
+        (default='exact')
+    sketch_size : int
+        size parameter k of the sketches used by method='sketch'
+        (default=200)
+
+    """
+
+    def __init__(self, labels, bins, data_label, method='exact',
+                 sketch_size=200):
+        if method not in ['exact', 'sketch']:
+            raise ValueError("method must be 'exact' or 'sketch'")
+        self.labels = list(labels)
+        self.bins = list(bins)
+        self.data_label = data_label
+        self.method = method
+        self.sketch_size = sketch_size
+        self.shape = tuple(len(edges) - 1 for edges in self.bins)
+        num_bins = int(np.prod(self.shape))
+        if method == 'exact':
+            # numpy arrays of values collected from each load, per bin
+            self._bins = [[[] for i in range(num_bins)]
+                          for label in data_label]
+        else:
+            self._bins = [[None] * num_bins for label in data_label]
+
+    def update(self, inst):
+        """Add the data loaded in inst to the bins."""
+
+        if len(inst.data) == 0:
+            return
+        index, bin_ids, starts, stops = _split_bins(inst.data, self.labels,
+                                                    self.bins)
+        for zk, label in enumerate(self.data_label):
+            values = np.asarray(inst.data[label])[index]
+            if self.method == 'exact':
+                for bi, start, stop in zip(bin_ids, starts, stops):
+                    self._bins[zk][bi].append(values[start:stop])
+            else:
+                if values.dtype == np.object_:
+                    raise ValueError('sketch method only supports scalar data')
+                for bi, start, stop in zip(bin_ids, starts, stops):
+                    if self._bins[zk][bi] is None:
+                        self._bins[zk][bi] = \
+                            QuantileSketch(k=self.sketch_size)
+                    self._bins[zk][bi].update(values[start:stop])
+
+    def merge(self, other):
+        """Add the binned data from another MedianAccumulator."""
+
+        self._check_compatible(other, ['labels', 'bins', 'data_label',
+                                       'method', 'sketch_size'])
+        for zk in range(len(self.data_label)):
+            for bi, item in enumerate(other._bins[zk]):
+                if self.method == 'exact':
+                    self._bins[zk][bi].extend(item)
+                elif item is not None:
+                    if self._bins[zk][bi] is None:
+                        self._bins[zk][bi] = \
+                            QuantileSketch(k=self.sketch_size)
+                    self._bins[zk][bi].merge(item)
+
+    def finalize(self, returnData=False):
+        """Calculate the median and average absolute deviation in each bin.
+
+        Parameters
+        ----------
+        returnData : bool
+            If True, binned data is included in the output. Not supported
+            by the sketch method. (default=False)
+
+        Returns
+        -------
+        dict
+            Indexed by data_label, each entry holds 'median', 'count', and
+            'avg_abs_dev'. Simple scalar data are numpy arrays with the
+            bin shape, pandas Series or DataFrame results are nested
+            lists. 'data' holds the binned data if returnData is True, and
+            'sketch' the sketches for method='sketch'.
+
+        """
+
+        if self.method == 'sketch':
+            if returnData:
+                raise ValueError('returnData not supported by the sketch '
+                                 'method')
+            return self._finalize_sketch()
+
+        shape = self.shape
+        num_bins = int(np.prod(shape))
+        output = {}
+        for zk, label in enumerate(self.data_label):
+            chunks = self._bins[zk]
+            # determine what kind of data is stored from the first
+            # nonempty bin
+            data_type = None
+            for chunk in chunks:
+                if len(chunk) > 0 and len(chunk[0]) > 0:
+                    data_type = type(chunk[0][0])
+                    break
+
+            if data_type in [pds.core.series.Series,
+                             pds.core.frame.DataFrame]:
+                # more complicated objects, averaged bin by bin
+                median = [None] * num_bins
+                count = [None] * num_bins
+                dev = [None] * num_bins
+                data = [[] for i in range(num_bins)]
+                for bi, chunk in enumerate(chunks):
+                    data[bi] = [item for values in chunk for item in values]
+                    if len(data[bi]) == 0:
+                        continue
+                    count[bi] = len(data[bi])
+                    if data_type == pds.core.series.Series:
+                        median[bi] = pds.DataFrame(data[bi]).median(axis=0)
+                        dev[bi] = pds.DataFrame([abs(temp - median[bi])
+                                                 for temp in
+                                                 data[bi]]).median(axis=0)
+                    else:
+                        test = pds.Panel.from_dict(dict([(i, temp)
+                                                         for i, temp in
+                                                         enumerate(data[bi])]))
+                        median[bi] = test.median(axis=0)
+                        dev[bi] = \
+                            (test.subtract(median[bi],
+                                           axis=0)).abs().median(axis=0,
+                                                                 skipna=True)
+                output[label] = {'median': _nest(median, shape),
+                                 'count': _nest(count, shape),
+                                 'avg_abs_dev': _nest(dev, shape)}
+                if returnData:
+                    output[label]['data'] = _nest(data, shape)
+            else:
+                # simple scalars, all bins averaged at once
+                sizes = [sum(len(values) for values in chunk)
+                         for chunk in chunks]
+                values = [values for chunk in chunks for values in chunk]
+                values = np.hstack(values) if len(values) > 0 \
+                    else np.array([])
+                groups = np.repeat(np.arange(num_bins), sizes)
+                # filter out any NaNs
+                idx, = np.where(np.isfinite(values))
+                values = values[idx]
+                groups = groups[idx]
+                median, count = _grouped_median(values, groups, num_bins)
+                dev, _ = _grouped_median(np.abs(values - median[groups]),
+                                         groups, num_bins)
+                count = np.where(count > 0, count, np.nan)
+                output[label] = {'median': median.reshape(shape),
+                                 'count': count.reshape(shape),
+                                 'avg_abs_dev': dev.reshape(shape)}
+                if returnData:
+                    splits = np.cumsum(np.bincount(groups,
+                                                   minlength=num_bins))[:-1]
+                    output[label]['data'] = _nest(np.split(values, splits),
+                                                  shape)
+
+        return output
+
+    def _finalize_sketch(self):
+        """Approximate statistics from the sketch in each bin."""
+
+        output = {}
+        for zk, label in enumerate(self.data_label):
+            sketches = self._bins[zk]
+            median = np.full(len(sketches), np.nan)
+            count = np.full(len(sketches), np.nan)
+            dev = np.full(len(sketches), np.nan)
+            for bi, sketch in enumerate(sketches):
+                if (sketch is not None) and (sketch.count > 0):
+                    median[bi] = sketch.median()
+                    count[bi] = sketch.count
+                    dev[bi] = sketch.median_abs_dev()
+            output[label] = {'median': median.reshape(self.shape),
+                             'count': count.reshape(self.shape),
+                             'avg_abs_dev': dev.reshape(self.shape),
+                             'sketch': _nest(list(sketches), self.shape)}
+        return output
+
+
+class MeanAccumulator(Accumulator):
+    """Mean of data for each day, file, or orbit over a season.
+
+    Parameters
+    ----------
+    data_label : str or list of str
+        string(s) identifying data product(s) to be averaged. All products
+        are averaged in the same pass through the data.
+    by : str
+        'day' labels each mean by the loaded date. 'orbit' or 'file' label
+        each mean by the first time in the loaded data. (default='day')
+    store : str or NoneType
+        Name of a CSV file that each mean is appended to as soon as it is
+        calculated. If the file exists, the means already in it are read and
+        those days, files, or orbits are skipped by `update`, so that an
+        interrupted run may be resumed. Only scalar means may be stored.
+        (default=None)
+
+    Note
+    ----
+    Means for each day, file, or orbit are kept in memory as they are
+    calculated and collected into a preallocated array by `finalize`.
+
+    """
+
+    def __init__(self, data_label, by='day', store=None):
+        if by not in ['day', 'orbit', 'file']:
+            raise ValueError('A choice must be made, by day, file, or orbit')
+        self.data_label = data_label
+        self.by = by
+        self.store = store
+        self._means = {}
+        if store is not None and os.path.isfile(store):
+            self._read_store()
+
+    @property
+    def _labels(self):
+        """data_label as a list."""
+
+        if isinstance(self.data_label, str):
+            return [self.data_label]
+        return list(self.data_label)
+
+    @property
+    def completed(self):
+        """Sorted days, or start of files or orbits, already averaged."""
+
+        return sorted(self._means.keys())
+
+    def _read_store(self):
+        """Read the means already appended to store."""
+
+        table = pds.read_csv(self.store, index_col=0, parse_dates=True)
+        if list(table.columns) != self._labels:
+            raise ValueError(''.join(('Store ', self.store, ' holds ',
+                                      ', '.join(table.columns),
+                                      ' rather than ',
+                                      ', '.join(self._labels))))
+        for key, row in zip(table.index, table.values):
+            self._means[key] = list(row)
+
+    def _append_store(self, key, means):
+        """Append the means for key to store, writing a header if new."""
+
+        if not all(np.isscalar(mean) for mean in means):
+            raise ValueError('Only scalar means may be stored.')
+        row = pds.DataFrame([means], index=[key], columns=self._labels)
+        row.to_csv(self.store, mode='a',
+                   header=not os.path.isfile(self.store))
+
+    def update(self, inst):
+        """Add the mean of the data loaded in inst."""
+
+        if inst.data.empty:
+            return
+        if self.by == 'day':
+            key = inst.date
+        else:
+            key = inst.data.index[0]
+        if self.store is not None and key in self._means:
+            # completed in an earlier run
+            return
+
+        means = []
+        for label in self._labels:
+            # compute mean absolute using pandas functions and store
+            # data could be an image, or lower dimension, account for 2D
+            # and lower
+            data = inst[label]
+            data.dropna(inplace=True)
+            # perform average
+            means.append(pysat.ssnl.computational_form(data).mean(axis=0,
+                                                                 skipna=True))
+        if self.store is not None:
+            self._append_store(key, means)
+        self._means[key] = means
+
+    def merge(self, other):
+        """Add the means from another MeanAccumulator.
+
+        Note
+        ----
+        Means for the same day, file, or orbit are replaced by those from
+        other. Means new to this accumulator are appended to its store.
+
+        """
+
+        self._check_compatible(other, ['data_label', 'by'])
+        for key in other.completed:
+            if self.store is not None and key not in self._means:
+                self._append_store(key, other._means[key])
+            self._means[key] = other._means[key]
+
+    def finalize(self):
+        """Means indexed by day, or start of each file or orbit.
+
+        Returns
+        -------
+        pandas Series or DataFrame
+            Series if data_label is a string, otherwise a DataFrame with a
+            column for each data_label
+
+        """
+
+        dates = self.completed
+        labels = self._labels
+        scalar = all(np.isscalar(mean) for means in self._means.values()
+                     for mean in means)
+        if scalar:
+            values = np.empty((len(dates), len(labels)))
+        else:
+            # Series or DataFrame means for higher order data
+            values = np.empty((len(dates), len(labels)), dtype=object)
+        for i, date in enumerate(dates):
+            for j, mean in enumerate(self._means[date]):
+                values[i, j] = mean
+
+        if isinstance(self.data_label, str):
+            return pds.Series(values[:, 0], index=dates)
+        return pds.DataFrame(dict((label, values[:, i])
+                                  for i, label in enumerate(labels)),
+                             index=dates, columns=labels)
+
+
+class OccurrenceAccumulator(Accumulator):
+    """Occurrence probability of data above a gate within bins over a season.
+
+    For each increment of data (day or orbit), a bin is counted if it holds
+    at least one finite value of data_label, and counted as a hit if any
+    value is greater than the gate.
+
+    Parameters
+    ----------
+    labels : list of str
+        data column names that binning is performed over, one per dimension.
+        Output arrays are ordered the same way, e.g. [label_y, label_x].
+    bins : list of array-like
+        bin edges for each dimension
+    data_label : list of str
+        identifies data product(s) to calculate occurrence probability
+    gate : list of values
+        values that data_label must exceed to be counted as an occurrence
+
+    """
+
+    def __init__(self, labels, bins, data_label, gate):
+        if not hasattr(data_label, '__iter__'):
+            raise ValueError('Data label must be list-like group of '
+                             'variable names.')
+        if not hasattr(gate, '__iter__'):
+            raise ValueError('Gate levels must be list-like group of '
+                             'variable names.')
+        if len(gate) != len(data_label):
+            raise ValueError('Must have a gate value for each data_label')
+        self.labels = list(labels)
+        self.bins = list(bins)
+        self.data_label = data_label
+        self.gate = gate
+        self.shape = tuple(len(edges) - 1 for edges in self.bins)
+        self.total = np.zeros((len(data_label),) + self.shape)
+        self.hits = np.zeros((len(data_label),) + self.shape)
+
+    def update(self, inst):
+        """Count the occupied bins and hits in the data loaded in inst."""
+
+        if len(inst.data) == 0:
+            return
+        index, bin_id = _flat_bin_id(inst.data, self.labels, self.bins)
+        num_bins = int(np.prod(self.shape))
+        total = self.total.reshape((len(self.data_label), num_bins))
+        hits = self.hits.reshape((len(self.data_label), num_bins))
+        for zk, label in enumerate(self.data_label):
+            values = np.asarray(inst.data[label])[index]
+            # bins with at least one finite sample
+            finite = np.isfinite(values)
+            occupied = np.bincount(bin_id[finite], minlength=num_bins) > 0
+            # and any sample above the gate
+            with np.errstate(invalid='ignore'):
+                above = values > self.gate[zk]
+            hit = np.bincount(bin_id[above], minlength=num_bins) > 0
+            total[zk] += occupied
+            hits[zk] += hit & occupied
+
+    def merge(self, other):
+        """Add the counts from another OccurrenceAccumulator."""
+
+        self._check_compatible(other, ['labels', 'bins', 'data_label',
+                                       'gate'])
+        self.total += other.total
+        self.hits += other.hits
+
+    def finalize(self):
+        """Occurrence probability in each bin.
+
+        Returns
+        -------
+        dict
+            Indexed by data_label, each entry holds 'prob' for the
+            probability and 'count' for the number of days or orbits with
+            any data in each bin.
+
+        """
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            prob = self.hits / self.total
+        output = {}
+        for i, label in enumerate(self.data_label):
+            output[label] = {'prob': prob[i], 'count': self.total[i]}
+        return output
@@ -20,6 +20,8 @@ object as the season of interest.
 import numpy as np
 import warnings
 
+from .accumulators import OccurrenceAccumulator
+
 
 def daily2D(inst, bin1, label1, bin2, label2, data_label, gate,
             returnBins=False):
@@ -122,63 +124,25 @@ def by_orbit2D(inst, bin1, label1, bin2, label2, data_label, gate,
 
 def _occurrence2D(inst, bin1, label1, bin2, label2, data_label, gate,
                   by_orbit=False, returnBins=False):
-    if not hasattr(data_label, '__iter__'):
-        raise ValueError('Data label must be list-like group of variable ' +
-                         'names.')
-    if not hasattr(gate, '__iter__'):
-        raise ValueError('Gate levels must be list-like group of variable ' +
-                         'names.')
-    if len(gate) != len(data_label):
-        raise ValueError('Must have a gate value for each data_label')
 
     # create bins
     binx = np.linspace(bin1[0], bin1[1], bin1[2] + 1)
     biny = np.linspace(bin2[0], bin2[1], bin2[2] + 1)
 
-    numx = len(binx) - 1
-    numy = len(biny) - 1
-    numz = len(data_label)
-    arrx = np.arange(numx)
-    arry = np.arange(numy)
-    arrz = np.arange(numz)
-
-    # create arrays to store all values
-    total = np.zeros((numz, numy, numx))
-    hits = np.zeros((numz, numy, numx))
+    # arrays are organized y, x
+    accumulator = OccurrenceAccumulator([label2, label1], [biny, binx],
+                                        data_label, gate)
     if by_orbit:
         inst.load(date=inst.bounds[0][0])
         iterator = inst.orbits
     else:
         iterator = inst
-
-    for i, inst in enumerate(iterator):
-        if len(inst.data) != 0:
-            xind = np.digitize(inst.data[label1], binx) - 1
-            for xi in arrx:
-                xindex, = np.where(xind == xi)
-                if len(xindex) > 0:
-                    yData = inst.data.iloc[xindex]
-                    yind = np.digitize(yData[label2], biny) - 1
-                    for yj in arry:
-                        yindex, = np.where(yind == yj)
-                        if len(yindex) > 0:
-                            # iterate over the different data_labels
-                            for zk in arrz:
-                                indlab = yData.columns.get_loc(data_label[zk])
-                                zdata = yData.iloc[yindex, indlab]
-                                if np.any(np.isfinite(zdata)):
-                                    total[zk, yj, xi] += 1.
-                                    if np.any(zdata > gate[zk]):
-                                        hits[zk, yj, xi] += 1.
+    accumulator.update_all(iterator)
 
     # all of the loading and storing data is done
-    # get probability
-    prob = hits/total
-    # make nicer dictionary output
-    output = {}
-    for i, label in enumerate(data_label):
-        output[label] = {'prob': prob[i, :, :], 'count': total[i, :, :]}
-        if returnBins:
+    output = accumulator.finalize()
+    if returnBins:
+        for label in output:
             output[label]['bin_x'] = binx
             output[label]['bin_y'] = biny
     # clean up
@@ -287,75 +251,25 @@ def by_orbit3D(inst, bin1, label1, bin2, label2, bin3, label3,
 def _occurrence3D(inst, bin1, label1, bin2, label2, bin3, label3,
                   data_label, gate, returnBins=False, by_orbit=False):
 
-    if not hasattr(data_label, '__iter__'):
-        raise ValueError('Data label must be list-like group of variable ' +
-                         'names.')
-    if not hasattr(gate, '__iter__'):
-        raise ValueError('Gate levels must be list-like group of variable ' +
-                         'names.')
-    if len(gate) != len(data_label):
-        raise ValueError('Must have a gate value for each data_label')
-
     # create bins
     binx = np.linspace(bin1[0], bin1[1], bin1[2] + 1)
     biny = np.linspace(bin2[0], bin2[1], bin2[2] + 1)
     binz = np.linspace(bin3[0], bin3[1], bin3[2] + 1)
 
-    numx = len(binx) - 1
-    numy = len(biny) - 1
-    numz = len(binz) - 1
-    numd = len(data_label)
-
-    # create array to store all values before taking median
-    yarr = np.arange(numy)
-    xarr = np.arange(numx)
-    zarr = np.arange(numz)
-    darr = np.arange(numd)
-
-    total = np.zeros((numd, numz, numy, numx))
-    hits = np.zeros((numd, numz, numy, numx))
-
+    # arrays are organized z, y, x
+    accumulator = OccurrenceAccumulator([label3, label2, label1],
+                                        [binz, biny, binx], data_label, gate)
     if by_orbit:
         iterator = inst.orbits
     else:
         iterator = inst
     # do loop to iterate over given season
-    for i, sat in enumerate(iterator):
-
-        if len(sat.data) != 0:
-            xind = np.digitize(sat.data[label1], binx) - 1
-            for xi in xarr:
-                xindex, = np.where(xind == xi)
-                if len(xindex) > 0:
-                    yData = sat.data.iloc[xindex]
-                    yind = np.digitize(yData[label2], biny) - 1
-                    for yj in yarr:
-                        yindex, = np.where(yind == yj)
-                        if len(yindex) > 0:
-                            zData = yData.iloc[yindex]
-                            zind = np.digitize(zData[label3], binz) - 1
-                            for zk in zarr:
-                                zindex, = np.where(zind == zk)
-                                if len(zindex) > 0:
-                                    for di in darr:
-                                        indlab = zData.columns.get_loc(data_label[di])
-                                        ddata = zData.iloc[zindex, indlab]
-                                        idx, = np.where(np.isfinite(ddata))
-                                        if len(idx) > 0:
-                                            total[di, zk, yj, xi] += 1
-                                            idx, = np.where(ddata > gate[di])
-                                            if len(idx) > 0:
-                                                hits[di, zk, yj, xi] += 1
+    accumulator.update_all(iterator)
 
     # all of the loading and storing data is done
-    # prob = np.zeros((numz, numy, numx))
-    prob = hits/total
-
-    # make nicer dictionary output
-    output = {}
-    for i, label in enumerate(data_label):
-        output[label] = {'prob': prob[i, :, :, :], 'count': total[i, :, :, :]}
-        if returnBins:
+    output = accumulator.finalize()
+    if returnBins:
+        for label in output:
             output[label]['bin_x'] = binx
             output[label]['bin_y'] = biny
             output[label]['bin_z'] = binz
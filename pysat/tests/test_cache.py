@@ -0,0 +1,280 @@
+"""
+tests the pysat data caches
+"""
+import numpy as np
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pds
+
+import pysat
+from pysat import _cache
+import pysat.instruments.pysat_testing
+
+if sys.version_info[0] >= 3:
+    from importlib import reload as re_load
+else:
+    re_load = reload
+
+
+class CallCounter(object):
+    """Records the number of times a custom function is applied"""
+    def __init__(self):
+        self.count = 0
+
+
+def custom_count(inst, counter, offset=0):
+    """Custom function that records the number of times it is applied"""
+    counter.count += 1
+
+
+class TestDiskCache():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.path = tempfile.mkdtemp()
+        self.cache = _cache.DiskCache(os.path.join(self.path, 'cache'))
+        self.date = pysat.datetime(2009, 1, 1)
+        self.data = pds.DataFrame({'a': np.arange(100.)})
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        shutil.rmtree(self.path)
+        del self.cache, self.data
+
+    def test_get_missing(self):
+        assert self.cache.get(self.date, 'key') is None
+
+    def test_put_get(self):
+        self.cache.put(self.date, 'key', self.data)
+        assert self.data.equals(self.cache.get(self.date, 'key'))
+        assert self.cache.get(self.date, 'other_key') is None
+
+    def test_no_temporary_files_left(self):
+        self.cache.put(self.date, 'key', self.data)
+        assert len(os.listdir(self.cache.path)) == 1
+
+    def test_evict_least_recently_used(self):
+        self.cache.put(self.date, 'key1', self.data)
+        size = self.cache.size
+        self.cache.max_size = 2 * size
+        self.cache.put(self.date, 'key2', self.data)
+        # make key1 the most recently used
+        fname = self.cache._fname(self.date, 'key1')
+        os.utime(fname, (os.path.getatime(fname),
+                         os.path.getmtime(fname) + 10))
+        self.cache.put(self.date, 'key3', self.data)
+        assert self.cache.get(self.date, 'key1') is not None
+        assert self.cache.get(self.date, 'key2') is None
+        assert self.cache.get(self.date, 'key3') is not None
+
+    def test_invalidate(self):
+        date2 = pysat.datetime(2009, 1, 2)
+        self.cache.put(self.date, 'key', self.data)
+        self.cache.put(date2, 'key', self.data)
+        self.cache.invalidate(self.date)
+        assert self.cache.get(self.date, 'key') is None
+        assert self.cache.get(date2, 'key') is not None
+
+    def test_clear(self):
+        self.cache.put(self.date, 'key', self.data)
+        self.cache.clear()
+        assert self.cache.size == 0
+
+    def test_make_key_dict_order(self):
+        assert (_cache.make_key({'a': 1, 'b': 2}) ==
+                _cache.make_key({'b': 2, 'a': 1}))
+
+    def test_func_id_changes_with_code(self):
+        def func(inst):
+            return 1
+
+        func1 = func
+
+        def func(inst):
+            return 2
+
+        assert _cache._func_id(func1) != _cache._func_id(func)
+
+    def test_func_id_stable_with_nested_code(self):
+        def func(inst):
+            return [val * 2 for val in inst['mlt']]
+
+        func1 = func
+
+        def func(inst):
+            return [val * 2 for val in inst['mlt']]
+
+        # separate but identical code objects, as in different sessions
+        assert func1.__code__ is not func.__code__
+        assert _cache._func_id(func1) == _cache._func_id(func)
+
+    def test_func_id_changes_with_nested_code(self):
+        def func(inst):
+            return [val * 2 for val in inst['mlt']]
+
+        func1 = func
+
+        def func(inst):
+            return [val * 3 for val in inst['mlt']]
+
+        assert _cache._func_id(func1) != _cache._func_id(func)
+
+
+class TestInstrumentProcessedCache():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.data_path = pysat.data_dir
+        self.temp_dir = tempfile.mkdtemp()
+        pysat.utils.set_data_dir(self.temp_dir, store=False)
+        re_load(pysat.instruments.pysat_testing)
+        self.testInst = \
+            pysat.Instrument(inst_module=pysat.instruments.pysat_testing,
+                             sat_id='100', clean_level='clean',
+                             pad={'minutes': 5}, cache_processed=True,
+                             update_files=True, temporary_file_list=True)
+        self.counter = CallCounter()
+        self.testInst.custom.add(custom_count, 'modify', counter=self.counter)
+        self.date = pysat.datetime(2009, 1, 2)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        pysat.utils.set_data_dir(self.data_path, store=False)
+        shutil.rmtree(self.temp_dir)
+        del self.testInst
+
+    def test_cache_hit(self):
+        self.testInst.load(date=self.date)
+        first = self.testInst.data.copy()
+        self.testInst.load(date=self.date)
+        assert self.counter.count == 1
+        assert first.equals(self.testInst.data)
+
+    def test_cache_path_under_data_dir(self):
+        assert self.testInst.processed_cache.path.startswith(self.temp_dir)
+
+    def test_cache_miss_with_new_custom_args(self):
+        self.testInst.load(date=self.date)
+        self.testInst.custom._kwargs[0]['offset'] = 1
+        self.testInst.load(date=self.date)
+        assert self.counter.count == 2
+
+    def test_cache_miss_with_new_clean_level(self):
+        self.testInst.load(date=self.date)
+        self.testInst.clean_level = 'dirty'
+        self.testInst.load(date=self.date)
+        assert self.counter.count == 2
+
+    def test_cache_invalidate(self):
+        self.testInst.load(date=self.date)
+        self.testInst.processed_cache.invalidate(self.date)
+        self.testInst.load(date=self.date)
+        assert self.counter.count == 2
+
+    def test_cache_not_used_with_verify_pad(self):
+        self.testInst.load(date=self.date)
+        self.testInst.load(date=self.date, verifyPad=True)
+        assert self.counter.count == 2
+        assert self.testInst.index[0] < self.date
+
+
+class TestLoadCache():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.data = pds.DataFrame({'a': np.arange(100.)})
+        self.meta = pysat.Meta()
+        self.cache = _cache.LoadCache(max_size=10 * _cache.nbytes(self.data))
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.cache, self.data, self.meta
+
+    def test_disabled_by_default(self):
+        assert not _cache.LoadCache().enabled
+
+    def test_get_missing(self):
+        assert self.cache.get('key') is None
+        assert self.cache.misses == 1
+
+    def test_put_get(self):
+        self.cache.put('key', self.data, self.meta)
+        data, meta = self.cache.get('key')
+        assert self.data.equals(data)
+        assert self.cache.hits == 1
+
+    def test_get_returns_copy(self):
+        self.cache.put('key', self.data, self.meta)
+        data, meta = self.cache.get('key')
+        data['a'] = 0.
+        data, meta = self.cache.get('key')
+        assert self.data.equals(data)
+
+    def test_size_limit(self):
+        for i in range(20):
+            self.cache.put(i, self.data, self.meta)
+        assert len(self.cache) == 10
+        assert self.cache.size <= self.cache.max_size
+        # oldest items removed first
+        assert self.cache.get(0) is None
+        assert self.cache.get(19) is not None
+
+    def test_item_larger_than_limit(self):
+        self.cache.max_size = 1
+        self.cache.put('key', self.data, self.meta)
+        assert len(self.cache) == 0
+
+    def test_clear(self):
+        self.cache.put('key', self.data, self.meta)
+        self.cache.get('key')
+        self.cache.clear()
+        assert (len(self.cache) == 0) & (self.cache.size == 0)
+        assert self.cache.hits == 0
+
+
+class TestInstrumentLoadCache():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        re_load(pysat.instruments.pysat_testing)
+        pysat.load_cache.clear()
+        pysat.load_cache.max_size = 1024**3
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         sat_id='100', clean_level='clean',
+                                         update_files=True)
+        self.date = pysat.datetime(2009, 1, 2)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        pysat.load_cache.max_size = 0
+        pysat.load_cache.clear()
+        del self.testInst
+
+    def test_shared_across_instruments(self):
+        self.testInst.load(date=self.date)
+        inst2 = pysat.Instrument(platform='pysat', name='testing',
+                                 sat_id='100', clean_level='clean')
+        inst2.load(date=self.date)
+        assert pysat.load_cache.hits == 1
+        assert self.testInst.data.equals(inst2.data)
+
+    def test_different_kwargs_not_shared(self):
+        self.testInst.load(date=self.date)
+        inst2 = pysat.Instrument(platform='pysat', name='testing',
+                                 sat_id='100', clean_level='clean',
+                                 malformed_index=True)
+        inst2.load(date=self.date)
+        assert pysat.load_cache.hits == 0
+
+    def test_loaded_data_not_shared_with_cache(self):
+        self.testInst.load(date=self.date)
+        self.testInst['mlt'] *= 0.
+        self.testInst.load(date=self.date)
+        assert np.any(self.testInst['mlt'] > 0.)
+
+    def test_back_and_forth(self):
+        self.testInst.load(date=self.date)
+        self.testInst.next()
+        self.testInst.prev()
+        self.testInst.next()
+        assert pysat.load_cache.hits == 2
+        assert pysat.load_cache.misses == 2
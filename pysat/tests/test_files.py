@@ -4,11 +4,13 @@ tests the pysat meta object and code
 import glob
 import numpy as np
 import os
+import shutil
 import sys
 
 from nose.tools import raises
 import pandas as pds
 import tempfile
+from unittest.case import SkipTest
 
 import pysat
 import pysat.instruments.pysat_testing
@@ -171,6 +173,76 @@ class TestBasics():
         assert (file_dict['version'] is None)
         assert (file_dict['revision'] is None)
 
+    def test_parse_delimited_filename_doy(self):
+        """Check ability to parse day of year from delimited files"""
+        fname = 'test_{year:04d}_{doy:03d}_{hour:02d}_v01.cdf'
+        year = np.array([2009, 2009, 2010])
+        doy = np.array([1, 365, 32])
+        hour = np.array([0, 23, 5])
+        file_list = [fname.format(year=year[i], doy=doy[i], hour=hour[i])
+                     for i in range(3)]
+
+        file_dict = pysat._files.parse_delimited_filenames(file_list, fname,
+                                                           '_')
+        assert np.all(file_dict['year'] == year)
+        assert np.all(file_dict['doy'] == doy)
+        assert np.all(file_dict['hour'] == hour)
+        assert (file_dict['month'] is None)
+        assert (file_dict['day'] is None)
+
+    def test_parse_fixed_width_filename(self):
+        """Check ability to parse fixed width files"""
+        fname = 'test_{year:04d}{month:02d}{day:02d}_v{version:02d}.cdf'
+        year = np.array([2009, 2009, 2010])
+        month = np.array([1, 12, 2])
+        day = np.array([1, 31, 28])
+        file_list = [os.path.join('dir_{:d}'.format(i),
+                                  fname.format(year=year[i], month=month[i],
+                                               day=day[i], version=i + 1))
+                     for i in range(3)]
+
+        file_dict = pysat._files.parse_fixed_width_filenames(file_list,
+                                                             fname)
+        assert np.all(file_dict['year'] == year)
+        assert np.all(file_dict['month'] == month)
+        assert np.all(file_dict['day'] == day)
+        assert np.all(file_dict['version'] == [1, 2, 3])
+        assert (file_dict['doy'] is None)
+        assert (file_dict['revision'] is None)
+
+    def test_parse_fixed_width_filename_padded(self):
+        """Check parsing of fixed width files with space padded values"""
+        fname = 'test_{year:4d}{month:2d}{day:2d}.cdf'
+        file_list = [u'test_2009 1 2.cdf', u'test_20091231.cdf',
+                     u'\xe9/test_2010 228.cdf']
+
+        file_dict = pysat._files.parse_fixed_width_filenames(file_list,
+                                                             fname)
+        assert np.all(file_dict['year'] == [2009, 2009, 2010])
+        assert np.all(file_dict['month'] == [1, 12, 2])
+        assert np.all(file_dict['day'] == [2, 31, 28])
+
+    def test_year_doy_key_files_direct_call_to_from_os(self):
+        # create a bunch of files by year and doy
+        start = pysat.datetime(2008, 1, 1)
+        stop = pysat.datetime(2009, 12, 31)
+        create_files(self.testInst, start, stop, freq='1D')
+        # use from_os function to get pandas Series of files and dates
+        files = pysat.Files.from_os(data_path=self.testInst.files.data_path,
+                                    format_str=''.join(('pysat_testing_junk_',
+                                                        '{year:04d}_gold_',
+                                                        '{doy:03d}_stuff.',
+                                                        'pysat_testing_file')))
+        # check overall length
+        check1 = len(files) == (365 + 366)
+        # check specific dates
+        check2 = pds.to_datetime(files.index[0]) == pysat.datetime(2008, 1, 1)
+        check3 = pds.to_datetime(files.index[365]) == \
+            pysat.datetime(2008, 12, 31)
+        check4 = pds.to_datetime(files.index[-1]) == \
+            pysat.datetime(2009, 12, 31)
+        assert(check1 & check2 & check3 & check4)
+
     def test_year_doy_files_direct_call_to_from_os(self):
         # create a bunch of files by year and doy
         start = pysat.datetime(2008, 1, 1)
@@ -659,6 +731,116 @@ class TestInstrumentWithFiles():
                              update_files=True,
                              temporary_file_list=self.temporary_file_list)
 
+    def test_stored_file_list(self):
+        """Check that the stored file list matches the files found"""
+        if self.temporary_file_list:
+            # file list is kept in memory
+            raise SkipTest
+        stored = self.testInst.files._load()
+        assert np.all(stored.index == self.testInst.files.files.index)
+        assert np.all(stored.values == self.testInst.files.files.values)
+
+    def test_stored_file_list_from_csv(self):
+        """Check that file lists stored as CSV by earlier versions are read"""
+        if self.temporary_file_list:
+            # file list is kept in memory
+            raise SkipTest
+        files = self.testInst.files
+        fname = os.path.join(files.home_path, files.stored_file_name)
+        csv_fname = os.path.join(files.home_path,
+                                 files.stored_file_name[:-4] + '.txt')
+        files.files.to_csv(csv_fname, date_format='%Y-%m-%d %H:%M:%S.%f',
+                           header=False)
+        if os.path.isfile(fname):
+            os.remove(fname)
+        try:
+            self.testInst = \
+                pysat.Instrument(inst_module=pysat.instruments.pysat_testing,
+                                 clean_level='clean',
+                                 temporary_file_list=self.temporary_file_list)
+            assert np.all(self.testInst.files.files.index == files.files.index)
+            assert np.all(self.testInst.files.files.values ==
+                          files.files.values)
+        finally:
+            os.remove(csv_fname)
+
+    def test_stored_file_list_from_csv_replaced(self):
+        """Check that a refresh replaces a CSV file list with a catalog"""
+        if self.temporary_file_list:
+            # file list is kept in memory
+            raise SkipTest
+        files = self.testInst.files
+        fname = os.path.join(files.home_path, files.stored_file_name)
+        csv_fname = os.path.join(files.home_path,
+                                 files.stored_file_name[:-4] + '.txt')
+        files.files.to_csv(csv_fname, date_format='%Y-%m-%d %H:%M:%S.%f',
+                           header=False)
+        if os.path.isfile(fname):
+            os.remove(fname)
+        try:
+            # file list is unchanged
+            files.refresh()
+            assert os.path.isfile(fname)
+            stored = pysat._files._read_catalog(fname)
+            assert np.all(stored.index == files.files.index)
+            assert np.all(stored.values == files.files.values)
+        finally:
+            os.remove(csv_fname)
+
+    def test_incremental_refresh_new_files(self):
+        """Check that incremental refresh finds the same files as refresh"""
+        self.testInst.files.refresh(incremental=True)
+        start = pysat.datetime(2008, 1, 11)
+        stop = pysat.datetime(2008, 1, 12)
+        create_files(self.testInst, start, stop, freq='100min',
+                     use_doy=False, root_fname=self.root_fname)
+        self.testInst.files.refresh(incremental=True)
+        files = self.testInst.files.files
+        self.testInst.files.refresh()
+        assert np.all(files.index == self.testInst.files.files.index)
+        assert np.all(files == self.testInst.files.files)
+
+    def test_incremental_refresh_unreadable_state(self):
+        """Check that an unreadable directory state is ignored"""
+        if self.temporary_file_list:
+            # directory state is kept in memory
+            raise SkipTest
+        files = self.testInst.files
+        fname = os.path.join(files.home_path, files._dir_state_name)
+        # refers to an attribute that doesn't exist, as may happen with
+        # state written by other numpy or pandas versions
+        with open(fname, 'wb') as fout:
+            fout.write(b'cos\nno_such_attribute\n.')
+        files._dir_state = None
+        files.refresh(incremental=True)
+        incremental = files.files
+        files.refresh()
+        assert np.all(incremental == files.files)
+        assert len(files.files) > 0
+
+    def test_incremental_refresh_unchanged(self):
+        """Check that unchanged directories are not searched again"""
+        racy = pysat._files._SCAN_RACY_SECONDS
+        search = pysat._files.search_local_system_formatted_filename
+        searches = []
+
+        def counted_search(data_path, search_str):
+            searches.append(search_str)
+            return search(data_path, search_str)
+
+        pysat._files._SCAN_RACY_SECONDS = 0.
+        pysat._files.search_local_system_formatted_filename = counted_search
+        try:
+            self.testInst.files.refresh(incremental=True)
+            assert len(searches) == 1
+            files = self.testInst.files.files
+            self.testInst.files.refresh(incremental=True)
+            assert len(searches) == 1
+            assert np.all(files == self.testInst.files.files)
+        finally:
+            pysat._files._SCAN_RACY_SECONDS = racy
+            pysat._files.search_local_system_formatted_filename = search
+
 
 class TestInstrumentWithFilesNoFileListStorage(TestInstrumentWithFiles):
     def __init__(self, temporary_file_list=True):
@@ -985,3 +1167,56 @@ class TestInstrumentWithVersionedFiles():
 class TestInstrumentWithVersionedFilesNoFileListStorage(TestInstrumentWithVersionedFiles):
     def __init__(self, temporary_file_list=True):
         self.temporary_file_list = temporary_file_list
+
+
+class TestFileCatalog():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.path = tempfile.mkdtemp()
+        self.fname = os.path.join(self.path, 'catalog.bin')
+        index = pysat.utils.time.create_date_range(pysat.datetime(2008, 1, 1),
+                                                   pysat.datetime(2008, 1, 10),
+                                                   freq='100min')
+        self.files = pds.Series(['pysat_testing_{:04d}.pysat_testing_file'
+                                 .format(i) for i in range(len(index))],
+                                index=index)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        shutil.rmtree(self.path)
+        del self.files
+
+    def test_catalog_round_trip(self):
+        """Check that files are the same after storage"""
+        pysat._files._write_catalog(self.fname, self.files)
+        files = pysat._files._read_catalog(self.fname)
+        assert np.all(files.index == self.files.index)
+        assert np.all(files.values == self.files.values)
+        # only the catalog is left behind
+        assert os.listdir(self.path) == ['catalog.bin']
+
+    def test_catalog_overwrite(self):
+        """Check that a stored catalog may be replaced"""
+        pysat._files._write_catalog(self.fname, self.files)
+        pysat._files._write_catalog(self.fname, self.files.iloc[:5])
+        files = pysat._files._read_catalog(self.fname)
+        assert np.all(files.values == self.files.values[:5])
+
+    def test_catalog_empty(self):
+        """Check storage of an empty list of files"""
+        pysat._files._write_catalog(self.fname, pds.Series([], dtype='a'))
+        files = pysat._files._read_catalog(self.fname)
+        assert files.empty
+
+    def test_catalog_unsupported_version(self):
+        """Check that catalogs from later versions are not read"""
+        pysat._files._write_catalog(self.fname, self.files)
+        with open(self.fname, 'r+b') as fout:
+            fout.seek(8)
+            fout.write(b'\xff')
+        assert pysat._files._read_catalog(self.fname) is None
+
+    def test_catalog_not_a_catalog(self):
+        """Check that other files are not read as catalogs"""
+        self.files.to_csv(self.fname, header=False)
+        assert pysat._files._read_catalog(self.fname) is None
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 # Test some of the basic _core functions
+import functools
+import logging
 import numpy as np
 import sys
 
@@ -973,6 +975,211 @@ class TestMalformedIndexXarray(TestMalformedIndex):
 # Test data padding, loading by file
 #
 # ------------------------------------------------------------------------------
+class TestLoadVariables():
+    def setup(self):
+        re_load(pysat.instruments.pysat_testing)
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         sat_id='100',
+                                         clean_level='clean',
+                                         update_files=True)
+        self.variables = ['mlt', 'longitude']
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_load_variables(self):
+        self.testInst.load(2009, 1, variables=self.variables)
+        assert sorted(self.testInst.variables) == sorted(self.variables)
+        assert 'latitude' not in self.testInst.meta
+        assert 'mlt' in self.testInst.meta
+
+    def test_load_variables_not_shared_in_buffer(self):
+        self.testInst.load(2009, 1, variables=['mlt'])
+        self.testInst.load(2009, 1, variables=['longitude'])
+        assert list(self.testInst.variables) == ['longitude']
+        assert len(self.testInst._load_buffer) == 2
+        for data, meta in self.testInst._load_buffer.values():
+            assert len(data.columns) == 1
+
+    def test_load_single_variable_name(self):
+        self.testInst.load(2009, 1, variables='mlt')
+        assert list(self.testInst.variables) == ['mlt']
+
+    def test_load_variables_case_insensitive(self):
+        self.testInst.load(2009, 1, variables=['MLT'])
+        assert list(self.testInst.variables) == ['mlt']
+
+    def test_load_variables_instrument_default(self):
+        inst = pysat.Instrument(platform='pysat', name='testing',
+                                sat_id='100', clean_level='clean',
+                                load_variables=self.variables)
+        inst.load(2009, 1)
+        assert sorted(inst.variables) == sorted(self.variables)
+        # override the default
+        inst.load(2009, 1, variables=['latitude'])
+        assert list(inst.variables) == ['latitude']
+
+    def test_load_variables_then_all(self):
+        self.testInst.load(2009, 1, variables=self.variables)
+        self.testInst.load(2009, 1)
+        assert 'latitude' in self.testInst.variables
+
+    def test_load_variables_custom(self):
+        def custom_func(inst):
+            return inst['mlt'] * 2.
+        self.testInst.custom.add(custom_func, 'add')
+        self.testInst.load(2009, 1, variables=self.variables)
+        assert sorted(self.testInst.variables) == \
+            sorted(self.variables + ['custom_func'])
+
+    def test_load_variables_padding(self):
+        inst = pysat.Instrument(platform='pysat', name='testing',
+                                sat_id='100', clean_level='clean',
+                                pad={'minutes': 5})
+        inst.load(2009, 2)
+        inst.load(2009, 3, variables=self.variables, verifyPad=True)
+        assert sorted(inst.variables) == sorted(self.variables)
+        assert inst.index[0] == inst.date - pds.DateOffset(minutes=5)
+
+    def test_accepts_keyword(self):
+        def func1(fnames, variables=None):
+            pass
+
+        def func2(fnames, **kwargs):
+            pass
+
+        assert pysat._instrument._accepts_keyword(func1, 'variables')
+        assert not pysat._instrument._accepts_keyword(func2, 'variables')
+        assert pysat._instrument._accepts_keyword(
+            functools.partial(func1, fnames=[]), 'variables')
+
+
+class TestLoadWindow():
+    def setup(self):
+        re_load(pysat.instruments.pysat_testing)
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         clean_level='clean',
+                                         update_files=True)
+        self.start = pysat.datetime(2009, 1, 2, 1)
+        self.stop = pysat.datetime(2009, 1, 2, 2)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_load_window(self):
+        self.testInst.load(start=self.start, stop=self.stop)
+        assert self.testInst.index[0] == self.start
+        assert self.testInst.index[-1] == \
+            self.stop - pds.DateOffset(seconds=1)
+        assert self.testInst.date == pysat.datetime(2009, 1, 2)
+
+    def test_load_window_matches_day(self):
+        self.testInst.load(start=self.start, stop=self.stop)
+        window = self.testInst.data.copy()
+        self.testInst.load(date=pysat.datetime(2009, 1, 2))
+        day = self.testInst[self.start:self.stop -
+                            pds.DateOffset(seconds=1)]
+        assert window.equals(day)
+
+    def test_load_window_across_days(self):
+        start = pysat.datetime(2009, 1, 2, 23)
+        stop = pysat.datetime(2009, 1, 3, 1)
+        self.testInst.load(start=start, stop=stop)
+        assert self.testInst.index[0] == start
+        assert self.testInst.index[-1] == stop - pds.DateOffset(seconds=1)
+        assert len(self.testInst.index) == 7200
+
+    def test_load_window_padding(self):
+        inst = pysat.Instrument(platform='pysat', name='testing',
+                                clean_level='clean', pad={'minutes': 5})
+        inst.load(start=self.start, stop=self.stop, verifyPad=True)
+        assert inst.index[0] == self.start - pds.DateOffset(minutes=5)
+        assert inst.index[-1] == self.stop + pds.DateOffset(minutes=4,
+                                                            seconds=59)
+        inst.load(start=self.start, stop=self.stop)
+        assert inst.index[0] == self.start
+        assert inst.index[-1] == self.stop - pds.DateOffset(seconds=1)
+
+    def test_load_window_empty(self):
+        self.testInst.load(start=pysat.datetime(2000, 1, 1, 1),
+                           stop=pysat.datetime(2000, 1, 1, 2))
+        assert self.testInst.empty
+
+    @raises(ValueError)
+    def test_load_window_requires_stop(self):
+        self.testInst.load(start=self.start)
+
+    @raises(ValueError)
+    def test_load_window_stop_before_start(self):
+        self.testInst.load(start=self.stop, stop=self.start)
+
+
+class RecordingHandler(logging.Handler):
+    """Stores log messages for inspection"""
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestLoadProfile():
+    def setup(self):
+        re_load(pysat.instruments.pysat_testing)
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         sat_id='100', clean_level='clean',
+                                         pad={'minutes': 5},
+                                         update_files=True)
+        self.stages = ['files', 'load_rtn', 'pad', 'default', 'clean',
+                       'custom', 'pad_removal', 'total']
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_last_load_profile(self):
+        self.testInst.load(2009, 2)
+        for stage in self.stages:
+            assert stage in self.testInst.last_load_profile
+            assert self.testInst.last_load_profile[stage] >= 0.
+
+    def test_total_load_profile(self):
+        self.testInst.load(2009, 2)
+        first = self.testInst.last_load_profile['total']
+        self.testInst.next()
+        second = self.testInst.last_load_profile['total']
+        assert np.isclose(self.testInst.total_load_profile['total'],
+                          first + second)
+
+    def test_reset_load_profile(self):
+        self.testInst.load(2009, 2)
+        self.testInst.reset_load_profile()
+        assert len(self.testInst.total_load_profile) == 0
+        self.testInst.next()
+        assert (self.testInst.total_load_profile['total'] ==
+                self.testInst.last_load_profile['total'])
+
+    def test_load_logged(self):
+        handler = RecordingHandler()
+        logger = logging.getLogger('pysat')
+        level = logger.level
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        try:
+            self.testInst.load(2009, 2)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+        assert any(message.startswith('Returning pysat testing')
+                   for message in handler.messages)
+
+
 class TestDataPaddingbyFile():
     def setup(self):
         re_load(pysat.instruments.pysat_testing)
@@ -1286,6 +1493,15 @@ class TestDataPadding():
                (self.testInst.index[-1] == self.testInst.date +
                 pds.DateOffset(hour=23, minutes=59, seconds=59))
 
+    def test_data_padding_not_shared_with_window(self):
+        """Modifying loaded data must not change the stored padding window"""
+        self.testInst.load(2009, 2)
+        self.testInst['mlt'] *= 0.
+        self.testInst.load(2009, 3)
+        self.testInst.prev(verifyPad=True)
+        assert np.all(self.testInst['mlt'] >= 0.)
+        assert np.any(self.testInst['mlt'] > 0.)
+
 
 class TestDataPaddingXarray(TestDataPadding):
     def setup(self):
@@ -1298,6 +1514,73 @@ class TestDataPaddingXarray(TestDataPadding):
                                          update_files=True)
 
 
+class TestDataPaddingPrefetch(TestDataPadding):
+    def setup(self):
+        re_load(pysat.instruments.pysat_testing)
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         clean_level='clean',
+                                         pad={'minutes': 5},
+                                         buffer_size=5,
+                                         prefetch=True,
+                                         update_files=True)
+
+    def test_buffer_size_limit(self):
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 10))
+        for inst in self.testInst:
+            pass
+        self.testInst._join_prefetch()
+        assert len(self.testInst._load_buffer) == 5
+
+    def test_prefetch_next_day_buffered(self):
+        self.testInst.load(2009, 2)
+        self.testInst._join_prefetch()
+        key = self.testInst._buffer_key(date=pysat.datetime(2009, 1, 4))
+        assert key in self.testInst._load_buffer
+
+    def test_prefetch_prev_day_buffered(self):
+        self.testInst.load(2009, 10)
+        self.testInst.prev()
+        self.testInst._join_prefetch()
+        key = self.testInst._buffer_key(date=pysat.datetime(2009, 1, 7))
+        assert key in self.testInst._load_buffer
+
+    def test_prefetch_matches_serial_load(self):
+        serial = pysat.Instrument(platform='pysat', name='testing',
+                                  clean_level='clean',
+                                  pad={'minutes': 5},
+                                  buffer_size=0,
+                                  update_files=True)
+        self.testInst.load(2009, 2)
+        self.testInst.next()
+        serial.load(2009, 3)
+        assert np.all(self.testInst.index == serial.index)
+        assert np.all(self.testInst['mlt'] == serial['mlt'])
+
+    def test_data_padding_buffered_jump(self):
+        self.testInst.load(2009, 2)
+        self.testInst.load(2009, 11)
+        self.testInst.load(2009, 2, verifyPad=True)
+        assert ((self.testInst.index[0] ==
+                 self.testInst.date - pds.DateOffset(minutes=5)) &
+                (self.testInst.index[-1] ==
+                 self.testInst.date
+                 + pds.DateOffset(hours=23, minutes=59, seconds=59)
+                 + pds.DateOffset(minutes=5)))
+
+    def test_clear_buffer(self):
+        self.testInst.load(2009, 2)
+        self.testInst.clear_buffer()
+        assert len(self.testInst._load_buffer) == 0
+        assert self.testInst._empty(self.testInst._next_data)
+
+    def test_copy_with_prefetch(self):
+        self.testInst.load(2009, 2)
+        inst_copy = self.testInst.copy()
+        assert inst_copy._prefetch_thread is None
+
+
 class TestMultiFileRightDataPaddingBasics(TestDataPadding):
     def setup(self):
         re_load(pysat.instruments.pysat_testing)
@@ -1363,3 +1646,79 @@ class TestMultiFileLeftDataPaddingBasicsXarray(TestDataPadding):
     def teardown(self):
         """Runs after every method to clean up previous testing."""
         del self.testInst
+
+
+def _mean_mlt(inst):
+    """Daily reduction used by the parallel loading tests"""
+    return inst['mlt'].mean()
+
+
+class TestParallelLoad():
+    def setup(self):
+        re_load(pysat.instruments.pysat_testing)
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument(platform='pysat', name='testing',
+                                         sat_id='100',
+                                         clean_level='clean',
+                                         pad={'minutes': 5},
+                                         update_files=True)
+        self.start = pysat.datetime(2009, 1, 1)
+        self.stop = pysat.datetime(2009, 1, 4)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_load_range_func_matches_serial(self):
+        parallel = self.testInst.load_range(self.start, self.stop, workers=2,
+                                            func=_mean_mlt)
+        serial = self.testInst.load_range(self.start, self.stop, workers=1,
+                                          func=_mean_mlt)
+        assert len(parallel) == 4
+        assert np.allclose(parallel, serial)
+
+    def test_load_range_attaches_data(self):
+        self.testInst.load_range(self.start, self.stop, workers=2)
+        assert self.testInst.date == self.start
+        assert self.testInst.index[0] >= self.start
+        assert self.testInst.index[-1] < self.stop + pds.DateOffset(days=1)
+        assert self.testInst.index.is_monotonic_increasing
+        assert self.testInst.index.is_unique
+
+    def test_load_range_with_custom(self):
+        def custom_func(inst):
+            return inst['mlt'] * 0.
+        self.testInst.custom.add(custom_func, 'add')
+        self.testInst.load_range(self.start, self.stop, workers=1)
+        assert np.all(self.testInst['custom_func'] == 0.)
+
+    def test_parallel_iter_order(self):
+        self.testInst.bounds = (self.start, self.stop)
+        dates = [inst.date for inst in self.testInst.parallel_iter(workers=2)]
+        assert pds.DatetimeIndex(dates).equals(self.testInst._iter_list)
+
+    def test_parallel_iter_data(self):
+        self.testInst.bounds = (self.start, self.stop)
+        for inst in self.testInst.parallel_iter(workers=2):
+            assert inst.index[0] >= inst.date
+            assert inst.index[-1] < inst.date + pds.DateOffset(days=1)
+
+    def test_parallel_iter_resets_orbits(self):
+        self.testInst.bounds = (self.start, self.stop)
+        # orbit information left from a previous day
+        self.testInst.orbits._orbit_breaks = [0, 10]
+        self.testInst.orbits.num = 2
+        for inst in self.testInst.parallel_iter(workers=2):
+            assert inst.orbits.num == 0
+            assert len(inst.orbits._orbit_breaks) == 0
+
+    def test_parallel_iter_by_file(self):
+        self.testInst.bounds = ('2009-01-01.nofile', '2009-01-04.nofile')
+        dates = [inst.date for inst in self.testInst.parallel_iter(workers=2)]
+        assert pds.DatetimeIndex(dates).equals(pds.date_range(self.start,
+                                                              self.stop))
+
+    @raises(ValueError)
+    def test_parallel_without_module(self):
+        inst = pysat.Instrument()
+        inst._load_spec()
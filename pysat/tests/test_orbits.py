@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+
 from dateutil.relativedelta import relativedelta as relativedelta
 from nose.tools import raises
 import numpy as np
@@ -238,6 +242,260 @@ class TestSpecificUTOrbits():
                 (pds.datetime(2009, 1, 1)-relativedelta(seconds=1)))
 
 
+class TestOrbitCache():
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'mlt'}
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        pysat.orbit_cache.clear()
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        pysat.orbit_cache.clear()
+        del self.testInst
+
+    def test_breaks_reused(self):
+        self.testInst.load(2009, 1)
+        self.testInst.orbits[2]
+        breaks = self.testInst.orbits._orbit_breaks
+        assert pysat.orbit_cache.misses == 1
+        self.testInst.load(2009, 1)
+        self.testInst.orbits[2]
+        assert pysat.orbit_cache.hits == 1
+        assert np.all(self.testInst.orbits._orbit_breaks == breaks)
+
+    def test_breaks_not_reused_for_modified_data(self):
+        self.testInst.load(2009, 1)
+        self.testInst.orbits[2]
+        self.testInst.load(2009, 1)
+        self.testInst['mlt'] = (self.testInst['mlt'] + 12.) % 24.
+        self.testInst.orbits[2]
+        assert pysat.orbit_cache.hits == 0
+
+    def test_save_load(self):
+        self.testInst.load(2009, 1)
+        self.testInst.orbits[2]
+        breaks = self.testInst.orbits._orbit_breaks
+        path = tempfile.mkdtemp()
+        fname = os.path.join(path, 'orbit_breaks.pkl')
+        try:
+            pysat.orbit_cache.save(fname)
+            pysat.orbit_cache.clear()
+            pysat.orbit_cache.load(fname)
+        finally:
+            shutil.rmtree(path)
+        self.testInst.load(2009, 1)
+        self.testInst.orbits[2]
+        assert pysat.orbit_cache.hits == 1
+        assert np.all(self.testInst.orbits._orbit_breaks == breaks)
+
+    def test_season_index_matches_iteration(self):
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 2))
+        season = self.testInst.orbits.index_season()
+        starts = [inst.index[0] for inst in self.testInst.orbits]
+        # last orbit of the season can't be completed with the next day
+        assert np.all(season[:len(starts) - 1] == starts[:-1])
+
+    def test_load_season_orbit(self):
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 2))
+        season = self.testInst.orbits.index_season()
+        self.testInst.orbits.load_season(16)
+        assert self.testInst.index[0] == season[16]
+        assert self.testInst.index[-1] < season[17]
+        self.testInst.orbits.load_season(-1)
+        assert self.testInst.index[0] == season[-1]
+
+    @raises(ValueError)
+    def test_load_season_orbit_without_index(self):
+        self.testInst.orbits.load_season(0)
+
+
+class TestSeasonOrbitIterator():
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'mlt'}
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 2))
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_orbits_complete_and_contiguous(self):
+        starts = []
+        stops = []
+        size = 0
+        for inst in self.testInst.orbits.iter_season():
+            starts.append(inst.index[0])
+            stops.append(inst.index[-1])
+            size += len(inst.index)
+        # every sample handed out once, in order
+        assert size == 2 * 86400
+        assert np.all(np.array(stops[:-1]) < np.array(starts[1:]))
+        # each orbit within an orbital period, one spanning midnight
+        period = self.testInst.orbits.orbit_period
+        assert np.all([stop - start < period
+                       for start, stop in zip(starts, stops)])
+        midnight = pysat.datetime(2009, 1, 2)
+        assert np.any([(start < midnight) & (stop > midnight)
+                       for start, stop in zip(starts, stops)])
+
+    def test_season_stats(self):
+        num = len([inst for inst in self.testInst.orbits.iter_season()])
+        stats = self.testInst.orbits.season_stats
+        assert stats['loads'] == 2
+        assert stats['orbits'] == num
+        assert stats['loads_per_orbit'] == 2. / num
+
+
+class TestSeasonOrbitIteratorXarray(TestSeasonOrbitIterator):
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'mlt'}
+        self.testInst = pysat.Instrument('pysat', 'testing_xarray',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 2))
+
+
+class TestEquaBreaksFilter():
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'mlt'}
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        self.period = self.testInst.orbits.orbit_period
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst, self.period
+
+    def reference_filter(self, ind, lt_diff, ut_diff):
+        """Loop over candidate breaks and nearby positive gradients"""
+        new_ind = []
+        for idx in ind:
+            tidx, = np.where(lt_diff[idx - 5:idx + 6] > 0.1)
+            if len(tidx) != 0:
+                for tidx in tidx:
+                    if(ut_diff[idx - 5:idx + 6].iloc[tidx] <
+                       lt_diff[idx - 5:idx + 6].iloc[tidx] / 24. *
+                       self.period):
+                        pass
+                    else:
+                        new_ind.append(idx)
+                        break
+            else:
+                new_ind.append(idx)
+        return np.array(new_ind, dtype=int)
+
+    def eval_noisy_mlt(self, num, noise):
+        """Compare filter to reference on noisy MLT with a time gap"""
+        rand = np.random.RandomState(num)
+        times = pds.date_range(pysat.datetime(2009, 1, 1), periods=num,
+                               freq='S')
+        times = times[np.sort(rand.choice(num, num - num // 10,
+                                          replace=False))]
+        mlt = (np.arange(len(times)) / (97. * 60.) * 24.) % 24. + \
+            rand.normal(0., noise, len(times))
+        mlt[rand.rand(len(times)) < 0.01] = np.nan
+        lt_diff = pds.Series(mlt, index=times).diff()
+        ut_diff = pds.Series(times).diff()
+        ind, = np.where(lt_diff < -0.1)
+        ans = self.testInst.orbits._filterBreaks(ind, lt_diff, ut_diff, 24.)
+        assert np.all(ans == self.reference_filter(ind, lt_diff, ut_diff))
+
+    def test_filter_matches_loop(self):
+        for num in [8, 12, 5000]:
+            for noise in [0.01, 0.2, 2.]:
+                yield self.eval_noisy_mlt, num, noise
+
+
+class TestOrbitNumberBreaks():
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'orbit_num', 'kind': 'orbit'}
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        self.testInst.load(2009, 1)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_breaks_at_first_sample_of_each_orbit(self):
+        self.testInst.orbits._orbitNumberBreaks()
+        vals = self.testInst['orbit_num'].values
+        uniq, first = np.unique(vals, return_index=True)
+        assert np.all(self.testInst.orbits._orbit_breaks == np.sort(first))
+        assert self.testInst.orbits.num == len(uniq)
+
+    def test_decreasing_orbit_numbers(self):
+        vals = self.testInst['orbit_num'].values
+        self.testInst['orbit_num'] = vals.max() - vals
+        self.testInst.orbits._orbitNumberBreaks()
+        breaks = self.testInst.orbits._orbit_breaks
+        assert np.all(np.diff(breaks) > 0)
+        assert np.all(breaks == np.hstack(([0], np.flatnonzero(np.diff(vals))
+                                           + 1)))
+
+
+def zero_mlt(inst):
+    """Custom function modifying data in place"""
+    inst.data['mlt'].values[:] = 0.
+
+
+class TestOrbitViews():
+
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        info = {'index': 'mlt'}
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean',
+                                         orbit_info=info, update_files=True)
+        self.testInst.load(2009, 1)
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_orbit_is_view(self):
+        self.testInst.orbits[1]
+        assert self.testInst.orbits.is_view(self.testInst.data)
+
+    def test_assignment_copies_view(self):
+        self.testInst.orbits[1]
+        mlt = self.testInst['mlt'].copy()
+        self.testInst['mlt'] = 0.
+        assert not self.testInst.orbits.is_view(self.testInst.data)
+        self.testInst.orbits[2]
+        self.testInst.orbits[1]
+        assert np.all(self.testInst['mlt'] == mlt)
+
+    def test_modify_custom_copies_view(self):
+        self.testInst.orbits[1]
+        mlt = self.testInst['mlt'].copy()
+        self.testInst.custom.add(zero_mlt, 'modify')
+        self.testInst.custom._apply_all(self.testInst)
+        assert np.all(self.testInst['mlt'] == 0.)
+        self.testInst.orbits[1]
+        assert np.all(self.testInst['mlt'] == mlt)
+
+
 class TestGeneralOrbitsMLT():
     def setup(self):
         """Runs before every method to create a clean testing setup."""
@@ -0,0 +1,149 @@
+"""
+tests the pysat seasonal statistic accumulators
+"""
+import os
+import shutil
+import tempfile
+
+from nose.tools import raises
+import numpy as np
+import pandas as pds
+
+import pysat
+from pysat.ssnl import accumulators, avg
+
+
+class TestAccumulators():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument('pysat', 'testing', sat_id='8640',
+                                         clean_level='clean',
+                                         update_files=True)
+        self.start = pysat.datetime(2008, 1, 1)
+        self.mid = pysat.datetime(2008, 1, 2)
+        self.stop = pysat.datetime(2008, 1, 3)
+        self.labels = ['mlt', 'longitude']
+        self.bins = [np.linspace(0., 24., 7), np.linspace(0., 360., 5)]
+        self.path = tempfile.mkdtemp()
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        shutil.rmtree(self.path)
+        del self.testInst
+
+    def run_shards(self, make_accumulator):
+        """Run accumulator over full season and two shards, merge shards"""
+        full = make_accumulator()
+        self.testInst.bounds = (self.start, self.stop)
+        full.update_all(self.testInst)
+        shards = []
+        for bounds in [(self.start, self.mid),
+                       (self.mid + pds.DateOffset(days=1), self.stop)]:
+            shard = make_accumulator()
+            self.testInst.bounds = bounds
+            shard.update_all(self.testInst)
+            shards.append(shard)
+        shards[0].merge(shards[1])
+        return full, shards[0]
+
+    def test_median_shards(self):
+        full, merged = self.run_shards(
+            lambda: accumulators.MedianAccumulator(self.labels, self.bins,
+                                                   ['dummy1', 'dummy4']))
+        full = full.finalize()
+        merged = merged.finalize()
+        for label in ['dummy1', 'dummy4']:
+            for key in ['median', 'count', 'avg_abs_dev']:
+                assert np.all(full[label][key] == merged[label][key])
+            assert full[label]['median'].shape == (6, 4)
+
+    def test_median_sketch_shards(self):
+        full, merged = self.run_shards(
+            lambda: accumulators.MedianAccumulator(self.labels, self.bins,
+                                                   ['dummy1'],
+                                                   method='sketch'))
+        assert np.all(full.finalize()['dummy1']['count'] ==
+                      merged.finalize()['dummy1']['count'])
+
+    def test_occurrence_shards(self):
+        full, merged = self.run_shards(
+            lambda: accumulators.OccurrenceAccumulator(self.labels,
+                                                       self.bins, ['slt'],
+                                                       [12.]))
+        full = full.finalize()
+        merged = merged.finalize()
+        assert np.all(full['slt']['count'] == merged['slt']['count'])
+        assert np.all(full['slt']['prob'] == merged['slt']['prob'])
+        # counted at most once per day
+        assert np.max(full['slt']['count']) <= 3
+
+    def test_mean_shards(self):
+        full, merged = self.run_shards(
+            lambda: accumulators.MeanAccumulator('dummy4'))
+        full = full.finalize()
+        assert len(full) == 3
+        assert full.equals(merged.finalize())
+
+    def test_mean_multiple_labels(self):
+        acc = accumulators.MeanAccumulator(['dummy4', 'mlt'])
+        self.testInst.bounds = (self.start, self.stop)
+        acc.update_all(self.testInst)
+        ans = acc.finalize()
+        assert list(ans.columns) == ['dummy4', 'mlt']
+        single = accumulators.MeanAccumulator('mlt')
+        single.update_all(self.testInst)
+        assert np.all(ans['mlt'].values == single.finalize().values)
+
+    def test_mean_store_resume(self):
+        fname = os.path.join(self.path, 'means.csv')
+        self.testInst.bounds = (self.start, self.mid)
+        first = avg.mean_by_day(self.testInst, ['dummy4', 'mlt'], store=fname)
+        assert len(first) == 2
+        # resumes after the stored days, and restores bounds
+        self.testInst.bounds = (self.start, self.stop)
+        resumed = avg.mean_by_day(self.testInst, ['dummy4', 'mlt'],
+                                  store=fname)
+        assert self.testInst.bounds == ([self.start], [self.stop])
+        full = avg.mean_by_day(self.testInst, ['dummy4', 'mlt'])
+        assert len(resumed) == 3
+        assert np.allclose(resumed.values, full.values)
+        assert len(pds.read_csv(fname, index_col=0)) == 3
+
+    @raises(ValueError)
+    def test_mean_store_different_labels(self):
+        fname = os.path.join(self.path, 'means.csv')
+        acc = accumulators.MeanAccumulator(['dummy4', 'mlt'], store=fname)
+        self.testInst.load(date=self.start)
+        acc.update(self.testInst)
+        accumulators.MeanAccumulator('mlt', store=fname)
+
+    def test_save_load(self):
+        acc = accumulators.MedianAccumulator(self.labels, self.bins,
+                                             ['dummy1'])
+        self.testInst.load(date=self.start)
+        acc.update(self.testInst)
+        fname = os.path.join(self.path, 'partial.pkl')
+        acc.save(fname)
+        restored = accumulators.load(fname)
+        assert np.all(restored.finalize()['dummy1']['count'] ==
+                      acc.finalize()['dummy1']['count'])
+
+    @raises(ValueError)
+    def test_merge_different_bins(self):
+        acc = accumulators.MedianAccumulator(self.labels, self.bins,
+                                             ['dummy1'])
+        other = accumulators.MedianAccumulator(self.labels,
+                                               [self.bins[0],
+                                                np.linspace(0., 360., 3)],
+                                               ['dummy1'])
+        acc.merge(other)
+
+    @raises(ValueError)
+    def test_merge_different_type(self):
+        acc = accumulators.MeanAccumulator('dummy4')
+        acc.merge(accumulators.MeanAccumulator('dummy4', by='orbit'))
+
+    @raises(ValueError)
+    def test_bad_method(self):
+        accumulators.MedianAccumulator(self.labels, self.bins, ['dummy1'],
+                                       method='bad')
@@ -6,7 +6,7 @@ import numpy as np
 import pandas as pds
 import warnings
 import pysat
-from pysat.ssnl import avg
+from pysat.ssnl import accumulators, avg
 
 
 class TestBasics():
@@ -623,3 +623,48 @@ class TestInstMed1D():
         pysat.ssnl.avg.median2D(self.testInst, ['0', 'd', '24', 'c'],
                                 self.test_label, self.test_data,
                                 auto_bin=False)
+
+
+class TestBinningEngine():
+    def setup(self):
+        """Runs before every method to create a clean testing setup"""
+        self.testInst = pysat.Instrument('pysat', 'testing', sat_id='1000',
+                                         clean_level='clean',
+                                         update_files=True)
+        self.testInst.bounds = (pysat.datetime(2008, 1, 1),
+                                pysat.datetime(2008, 1, 3))
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing"""
+        del self.testInst
+
+    def test_grouped_median(self):
+        """Test grouped median with odd, even, and empty groups"""
+        values = np.array([3., 1., 2., 4., 1., 2., 3., 10.])
+        groups = np.array([0, 0, 0, 2, 2, 2, 2, 3])
+        median, count = accumulators._grouped_median(values, groups, 5)
+        assert np.all(count == [3, 0, 4, 1, 0])
+        assert median[0] == 2.
+        assert median[2] == 2.5
+        assert median[3] == 10.
+        assert np.all(np.isnan(median[[1, 4]]))
+
+    def test_median2D_matches_bin_by_bin(self):
+        """Test 2D median against a bin by bin calculation"""
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', DeprecationWarning)
+            results = avg.median2D(self.testInst, [0., 360., 6], 'longitude',
+                                   [0., 24., 4], 'mlt', ['dummy2', 'dummy4'],
+                                   returnData=True)
+        for label in ['dummy2', 'dummy4']:
+            output = results[label]
+            for yj in range(4):
+                for xi in range(6):
+                    data = output['data'][yj][xi]
+                    if len(data) > 0:
+                        assert output['count'][yj, xi] == len(data)
+                        assert output['median'][yj, xi] == np.median(data)
+                        dev = np.median(np.abs(data - np.median(data)))
+                        assert output['avg_abs_dev'][yj, xi] == dev
+                    else:
+                        assert np.isnan(output['median'][yj, xi])
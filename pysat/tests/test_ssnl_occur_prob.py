@@ -3,6 +3,7 @@ tests the pysat occur_prob object and code
 """
 
 from nose.tools import raises
+import numpy as np
 import warnings
 import pysat
 from pysat.ssnl import occur_prob
@@ -108,6 +109,30 @@ class TestBasics():
         assert abs(ans['slt']['bin_y'] - [-60, -20, 20, 60]).max() < 1.0e-6
         assert abs(ans['slt']['bin_z'] - [0, 12, 24]).max() < 1.0e-6
 
+    def test_occur_prob_daily_2D_matches_loop(self):
+        """Compare daily 2D probability to a bin by bin calculation"""
+        self.testInst.bounds = (pysat.datetime(2008, 1, 1),
+                                pysat.datetime(2008, 1, 3))
+        binx = np.linspace(0, 360, 7)
+        biny = np.linspace(-60, 60, 5)
+        ans = occur_prob.daily2D(self.testInst, [0, 360, 6], 'longitude',
+                                 [-60, 60, 4], 'latitude', ['dummy1'], [20.])
+        total = np.zeros((4, 6))
+        hits = np.zeros((4, 6))
+        for inst in self.testInst:
+            xind = np.digitize(inst['longitude'], binx) - 1
+            yind = np.digitize(inst['latitude'], biny) - 1
+            for i in range(6):
+                for j in range(4):
+                    zdata = inst['dummy1'][(xind == i) & (yind == j)]
+                    if np.any(np.isfinite(zdata)):
+                        total[j, i] += 1
+                        if np.any(zdata > 20.):
+                            hits[j, i] += 1
+        assert np.array_equal(ans['dummy1']['count'], total)
+        assert np.allclose(ans['dummy1']['prob'], hits / total,
+                           equal_nan=True)
+
 
 class TestDeprecation():
     def setup(self):
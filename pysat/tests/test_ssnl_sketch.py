@@ -0,0 +1,146 @@
+"""
+tests the pysat quantile sketch
+"""
+import json
+import pickle
+
+from nose.tools import raises
+import numpy as np
+
+import pysat
+from pysat.ssnl import QuantileSketch
+
+
+class TestQuantileSketch():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.rng = np.random.RandomState(0)
+        self.values = self.rng.normal(size=100000)
+        self.sketch = QuantileSketch(k=200, seed=0)
+        # documented bound on the rank error
+        self.tol = 3.3 / 200.
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.rng, self.values, self.sketch
+
+    def rank_error(self, value, q):
+        """Difference between the rank of value and the requested rank"""
+        rank = np.searchsorted(np.sort(self.values), value) / \
+            float(len(self.values))
+        return abs(rank - q)
+
+    def test_empty(self):
+        assert np.isnan(self.sketch.median())
+        assert np.isnan(self.sketch.median_abs_dev())
+        assert len(self.sketch) == 0
+
+    def test_small_exact(self):
+        self.sketch.update([3., 1., 2.])
+        assert self.sketch.median() == 2.
+        assert self.sketch.quantile(0.) == 1.
+        assert self.sketch.quantile(1.) == 3.
+
+    def test_ignores_nan(self):
+        self.sketch.update([1., np.nan, np.inf, 2., 3.])
+        assert self.sketch.count == 3
+
+    def test_quantile_error(self):
+        for chunk in np.array_split(self.values, 20):
+            self.sketch.update(chunk)
+        for q in [0.1, 0.5, 0.9]:
+            assert self.rank_error(self.sketch.quantile(q), q) < self.tol
+
+    def test_bounded_size(self):
+        for chunk in np.array_split(self.values, 20):
+            self.sketch.update(chunk)
+        assert self.sketch.count == len(self.values)
+        # about 3 * k values at most
+        assert self.sketch.size < 4 * self.sketch.k
+
+    def test_median_abs_dev(self):
+        self.sketch.update(self.values)
+        # 0.6745 for a standard normal distribution
+        exact = np.median(np.abs(self.values - np.median(self.values)))
+        assert abs(self.sketch.median_abs_dev() - exact) < 0.05
+
+    def test_merge(self):
+        for chunk in np.array_split(self.values, 10):
+            part = QuantileSketch(k=200, seed=1)
+            part.update(chunk)
+            self.sketch.merge(part)
+        assert self.sketch.count == len(self.values)
+        assert self.rank_error(self.sketch.median(), 0.5) < self.tol
+
+    @raises(ValueError)
+    def test_merge_different_k(self):
+        self.sketch.merge(QuantileSketch(k=100))
+
+    def test_dict_round_trip(self):
+        self.sketch.update(self.values)
+        info = json.loads(json.dumps(self.sketch.to_dict()))
+        sketch = QuantileSketch.from_dict(info)
+        assert sketch.count == self.sketch.count
+        assert sketch.median() == self.sketch.median()
+
+    def test_pickle(self):
+        self.sketch.update(self.values)
+        sketch = pickle.loads(pickle.dumps(self.sketch))
+        assert sketch.median() == self.sketch.median()
+
+
+class TestSketchMedian():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.testInst = pysat.Instrument('pysat', 'testing',
+                                         clean_level='clean')
+        self.testInst.bounds = (pysat.datetime(2008, 1, 1),
+                                pysat.datetime(2008, 1, 3))
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.testInst
+
+    def test_median2D_sketch(self):
+        """Test approximate 2D median matches exact where values repeat"""
+        exact = pysat.ssnl.avg.median2D(self.testInst, [0., 360., 24],
+                                        'longitude', [0., 24, 24], 'mlt',
+                                        ['dummy1', 'dummy2'])
+        approx = pysat.ssnl.avg.median2D(self.testInst, [0., 360., 24],
+                                         'longitude', [0., 24, 24], 'mlt',
+                                         ['dummy1', 'dummy2'],
+                                         method='sketch')
+        for label in ['dummy1', 'dummy2']:
+            assert np.all(exact[label]['median'] == approx[label]['median'])
+            assert np.all(exact[label]['count'] == approx[label]['count'])
+            assert np.all(exact[label]['avg_abs_dev'] ==
+                          approx[label]['avg_abs_dev'])
+            assert isinstance(approx[label]['sketch'][0][0], QuantileSketch)
+
+    def test_median1D_sketch_merge(self):
+        """Test sketches from partial seasons merge to the full season"""
+        full = pysat.ssnl.avg.median1D(self.testInst, [0., 24, 24], 'mlt',
+                                       ['dummy1'], method='sketch')
+        parts = []
+        for day in [1, 2, 3]:
+            date = pysat.datetime(2008, 1, day)
+            self.testInst.bounds = (date, date)
+            parts.append(pysat.ssnl.avg.median1D(self.testInst, [0., 24, 24],
+                                                 'mlt', ['dummy1'],
+                                                 method='sketch'))
+        for i, sketch in enumerate(full['dummy1']['sketch']):
+            merged = QuantileSketch()
+            for part in parts:
+                merged.merge(part['dummy1']['sketch'][i])
+            assert merged.count == sketch.count
+            assert merged.median() == full['dummy1']['median'][i]
+
+    @raises(ValueError)
+    def test_sketch_return_data(self):
+        pysat.ssnl.avg.median1D(self.testInst, [0., 24, 24], 'mlt',
+                                ['dummy1'], method='sketch', returnData=True)
+
+    @raises(ValueError)
+    def test_bad_method(self):
+        pysat.ssnl.avg.median1D(self.testInst, [0., 24, 24], 'mlt',
+                                ['dummy1'], method='bad')
@@ -223,6 +223,68 @@ class TestScaleUnits():
             assert str(verr).find('unknown units') > 0
 
 
+def read_name(fname):
+    """Reader for TestReadFiles, defined here so processes may use it."""
+    if fname.startswith('bad'):
+        raise RuntimeError('unable to read ' + fname)
+    if fname.startswith('missing'):
+        raise IOError('no such file ' + fname)
+    return fname.upper()
+
+
+class TestReadFiles():
+    def setup(self):
+        """Runs before every method to create a clean testing setup."""
+        self.fnames = ['file{:d}'.format(i) for i in range(10)]
+
+    def teardown(self):
+        """Runs after every method to clean up previous testing."""
+        del self.fnames
+
+    def test_read_files(self):
+        """Test that results are in order for each pool"""
+        for workers, processes in [(1, False), (4, False), (4, True)]:
+            yield self.check_read_files, workers, processes
+
+    def check_read_files(self, workers, processes):
+        results, errors = pysat.utils.read_files(read_name, self.fnames,
+                                                 workers=workers,
+                                                 processes=processes)
+        assert results == [fname.upper() for fname in self.fnames]
+        assert errors == []
+
+    def test_read_files_catch(self):
+        """Test that errors for each file are captured"""
+        for workers, processes in [(1, False), (4, False), (4, True)]:
+            yield self.check_read_files_catch, workers, processes
+
+    def check_read_files_catch(self, workers, processes):
+        self.fnames[3] = 'bad3'
+        self.fnames[7] = 'bad7'
+        results, errors = pysat.utils.read_files(read_name, self.fnames,
+                                                 workers=workers,
+                                                 processes=processes,
+                                                 catch=RuntimeError)
+        assert results[3] is None
+        assert results[7] is None
+        assert results[4] == 'FILE4'
+        assert [fname for fname, err in errors] == ['bad3', 'bad7']
+        assert isinstance(errors[0][1], RuntimeError)
+
+    @raises(IOError)
+    def test_read_files_raise(self):
+        """Test that errors not captured are raised"""
+        self.fnames[3] = 'missing3'
+        pysat.utils.read_files(read_name, self.fnames, workers=4,
+                               catch=RuntimeError)
+
+    def test_read_files_empty(self):
+        """Test reading an empty list of files"""
+        results, errors = pysat.utils.read_files(read_name, [], workers=4)
+        assert results == []
+        assert errors == []
+
+
 class TestBasicNetCDF4():
     def setup(self):
         """Runs before every method to create a clean testing setup."""
@@ -390,6 +452,69 @@ class TestBasicNetCDF4():
         assert(np.all((test_inst.data == loaded_inst).all()))
         assert np.all(test_list)
 
+    def test_read_netcdf4_variables(self):
+        prep_dir(self.testInst)
+        outfile = os.path.join(self.testInst.files.data_path,
+                               'pysat_test_ncdf.nc')
+        self.testInst.load(2009, 1)
+        self.testInst.to_netcdf4(outfile)
+
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile,
+                                                     variables=['MLT',
+                                                                'longitude'])
+        assert sorted(loaded_inst.columns) == ['longitude', 'mlt']
+        assert 'mlt' in meta
+        assert 'latitude' not in meta
+        assert np.all(self.testInst['mlt'] == loaded_inst['mlt'])
+
+    def test_read_netcdf4_variables_higher_order(self):
+        test_inst = pysat.Instrument('pysat', 'testing2d')
+        prep_dir(test_inst)
+        outfile = os.path.join(test_inst.files.data_path, 'pysat_test_ncdf.nc')
+        test_inst.load(2009, 1)
+        test_inst.to_netcdf4(outfile)
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile,
+                                                     variables=['profiles'])
+        assert list(loaded_inst.columns) == ['profiles']
+        for frame1, frame2 in zip(test_inst.data['profiles'],
+                                  loaded_inst['profiles']):
+            assert np.all((frame1 == frame2).all())
+
+    def test_read_netcdf4_time_window(self):
+        prep_dir(self.testInst)
+        outfile = os.path.join(self.testInst.files.data_path,
+                               'pysat_test_ncdf.nc')
+        self.testInst.load(2009, 1)
+        self.testInst.to_netcdf4(outfile)
+
+        start = pysat.datetime(2009, 1, 1, 1)
+        stop = pysat.datetime(2009, 1, 1, 2)
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile, start=start,
+                                                     stop=stop)
+        assert loaded_inst.index[0] == start
+        assert loaded_inst.index[-1] < stop
+        assert len(loaded_inst) == 3600
+        assert np.all(self.testInst[start:stop - pds.DateOffset(seconds=1),
+                                    'mlt'] == loaded_inst['mlt'])
+
+    def test_read_netcdf4_time_window_higher_order(self):
+        test_inst = pysat.Instrument('pysat', 'testing2d')
+        prep_dir(test_inst)
+        outfile = os.path.join(test_inst.files.data_path, 'pysat_test_ncdf.nc')
+        test_inst.load(2009, 1)
+        test_inst.to_netcdf4(outfile)
+        start = pysat.datetime(2009, 1, 1, 1)
+        stop = pysat.datetime(2009, 1, 1, 1, 10)
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile, start=start,
+                                                     stop=stop)
+        # 100 second cadence
+        assert len(loaded_inst) == 6
+        for frame1, frame2 in zip(test_inst[start:stop -
+                                            pds.DateOffset(seconds=1),
+                                            'profiles'],
+                                  loaded_inst['profiles']):
+            assert np.all((frame1 == frame2).all())
+
     def test_write_and_read_netcdf4_default_format_higher_order_w_zlib(self):
         # create a bunch of files by year and doy
         test_inst = pysat.Instrument('pysat', 'testing2d')
@@ -474,3 +599,139 @@ class TestBasicNetCDF4():
 
         assert meta2.myattr
         assert not meta2.bespoke
+
+    def test_netcdf4_writer_season(self):
+        """Test that each day written is read back from one file"""
+        outfile = os.path.join(self.testInst.files.data_path,
+                               'pysat_test_ncdf.nc')
+        self.testInst.bounds = (pysat.datetime(2009, 1, 1),
+                                pysat.datetime(2009, 1, 2))
+        with pysat.utils.NetCDF4Writer(outfile) as writer:
+            writer.write_season(self.testInst)
+        assert writer.num == 2 * 86400
+
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile)
+        days = []
+        for date in [pysat.datetime(2009, 1, 1), pysat.datetime(2009, 1, 2)]:
+            self.testInst.load(date=date)
+            days.append(self.testInst.data)
+        data = pds.concat(days)
+        assert np.all(loaded_inst.index == data.index)
+        for key in data.columns:
+            assert np.all(data[key] == loaded_inst[key])
+        assert meta.Date_Start.find('2009-01-01T00:00:00.000') > 0
+        assert meta.Date_End.find('2009-01-02T23:59:59.000') > 0
+
+    def test_netcdf4_writer_matches_to_netcdf4(self):
+        """Test that a single write matches Instrument.to_netcdf4"""
+        outfile = os.path.join(self.testInst.files.data_path,
+                               'pysat_test_ncdf.nc')
+        outfile2 = os.path.join(self.testInst.files.data_path,
+                                'pysat_test_ncdf2.nc')
+        self.testInst.load(2009, 1)
+        self.testInst.to_netcdf4(outfile)
+        with pysat.utils.NetCDF4Writer(outfile2, zlib=True,
+                                       chunk_size=1000) as writer:
+            writer.write(self.testInst)
+
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile)
+        loaded_inst2, meta2 = pysat.utils.load_netcdf4(outfile2)
+        assert np.all(loaded_inst.index == loaded_inst2.index)
+        for key in loaded_inst.columns:
+            assert np.all(loaded_inst[key] == loaded_inst2[key])
+            assert meta[key, meta.units_label] == \
+                meta2[key, meta2.units_label]
+
+    def test_netcdf4_writer_higher_order(self):
+        """Test that a Series of DataFrames is appended across days"""
+        test_inst = pysat.Instrument('pysat', 'testing2d')
+        prep_dir(test_inst)
+        outfile = os.path.join(test_inst.files.data_path, 'pysat_test_ncdf.nc')
+        test_inst.bounds = (pysat.datetime(2009, 1, 1),
+                            pysat.datetime(2009, 1, 2))
+        with pysat.utils.NetCDF4Writer(outfile) as writer:
+            writer.write_season(test_inst)
+
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfile)
+        days = []
+        for date in [pysat.datetime(2009, 1, 1), pysat.datetime(2009, 1, 2)]:
+            test_inst.load(date=date)
+            days.append(test_inst.data)
+        data = pds.concat(days)
+        assert len(loaded_inst) == len(data)
+        for key in ['profiles', 'alt_profiles', 'series_profiles']:
+            for frame1, frame2 in zip(data[key], loaded_inst[key]):
+                assert np.all((frame1 == frame2).all())
+        data = data.drop(['profiles', 'alt_profiles', 'series_profiles'],
+                         axis=1)
+        for key in data.columns:
+            assert np.all(data[key] == loaded_inst[key])
+
+    @raises(ValueError)
+    def test_netcdf4_writer_different_variables(self):
+        """Test that each write must have the same variables"""
+        outfile = os.path.join(self.testInst.files.data_path,
+                               'pysat_test_ncdf.nc')
+        with pysat.utils.NetCDF4Writer(outfile) as writer:
+            self.testInst.load(2009, 1)
+            writer.write(self.testInst)
+            self.testInst.load(2009, 2)
+            self.testInst['new_variable'] = 1.
+            writer.write(self.testInst)
+
+    def test_read_netcdf4_multiple_files_higher_order(self):
+        """Test that higher order data from several files is combined"""
+        test_inst = pysat.Instrument('pysat', 'testing2d')
+        prep_dir(test_inst)
+        outfiles = []
+        days = []
+        for day in [1, 2]:
+            outfiles.append(os.path.join(test_inst.files.data_path,
+                                         'pysat_test_ncdf{:d}.nc'.format(day)))
+            test_inst.load(2009, day)
+            test_inst.to_netcdf4(outfiles[-1])
+            days.append(test_inst.data)
+        data = pds.concat(days)
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfiles,
+                                                     strict_meta=True)
+        assert len(loaded_inst) == len(data)
+        for key in ['profiles', 'alt_profiles', 'series_profiles']:
+            for frame1, frame2 in zip(data[key], loaded_inst[key]):
+                assert np.all(frame1.index == frame2.index)
+                assert np.all((frame1 == frame2).all())
+        assert np.all(loaded_inst['profiles'].iloc[-1].columns ==
+                      data['profiles'].iloc[-1].columns)
+        assert 'profiles' in meta.keys_nD()
+
+    @raises(ValueError)
+    def test_read_netcdf4_strict_meta(self):
+        """Test that differing metadata across files raises an error"""
+        outfiles = [os.path.join(self.testInst.files.data_path,
+                                 'pysat_test_ncdf{:d}.nc'.format(day))
+                    for day in [1, 2]]
+        self.testInst.load(2009, 1)
+        self.testInst.to_netcdf4(outfiles[0])
+        self.testInst.load(2009, 2)
+        self.testInst.meta['mlt'] = {self.testInst.units_label: 'minutes'}
+        self.testInst.to_netcdf4(outfiles[1])
+        pysat.utils.load_netcdf4(outfiles, strict_meta=True)
+
+    def test_read_netcdf4_workers(self):
+        """Test that reading files in parallel matches reading in turn"""
+        test_inst = pysat.Instrument('pysat', 'testing2d')
+        prep_dir(test_inst)
+        outfiles = []
+        for day in [1, 2, 3]:
+            outfiles.append(os.path.join(test_inst.files.data_path,
+                                         'pysat_test_ncdf{:d}.nc'.format(day)))
+            test_inst.load(2009, day)
+            test_inst.to_netcdf4(outfiles[-1])
+        loaded_inst, meta = pysat.utils.load_netcdf4(outfiles)
+        loaded_inst2, meta2 = pysat.utils.load_netcdf4(outfiles, workers=3)
+        assert np.all(loaded_inst.index == loaded_inst2.index)
+        assert meta == meta2
+        for frame1, frame2 in zip(loaded_inst['profiles'],
+                                  loaded_inst2['profiles']):
+            assert np.all((frame1 == frame2).all())
+        for key in ['mlt', 'slt', 'longitude', 'latitude']:
+            assert np.all(loaded_inst[key] == loaded_inst2[key])
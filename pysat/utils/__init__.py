@@ -11,3 +11,4 @@ for the pysat data directory structure.
 
 from . import coords, stats, time
 from ._core import set_data_dir, scale_units, load_netcdf4, computational_form
+from ._core import NetCDF4Writer, read_files
@@ -149,12 +149,97 @@ def scale_units(out_unit, in_unit):
     return unit_scale
 
 
+def _read_file(task):
+    """Apply a reading function to one file, capturing selected errors."""
+
+    func, fname, catch = task
+    try:
+        return func(fname), None
+    except catch as err:
+        return None, err
+
+
+def read_files(func, fnames, workers=1, processes=False, catch=()):
+    """Read a list of files, optionally several at a time.
+
+    Parameters
+    ----------
+    func : function
+        func(fname) reads a single file and returns its contents. Must be
+        defined at the top level of a module (or a functools.partial of such
+        a function) if processes is True.
+    fnames : list-like of strings
+        files to be read
+    workers : int
+        Number of files read at the same time. If 1, files are read in
+        turn without a pool. (default=1)
+    processes : bool
+        If True, files are read by a pool of processes rather than threads.
+        (default=False)
+    catch : exception class or tuple of exception classes
+        Errors raised while reading a file that are captured and returned
+        rather than raised, e.g. RuntimeError for a corrupt netCDF file.
+        (default=())
+
+    Returns
+    -------
+    results : list
+        output of func for each file, in the order of fnames. None for
+        files that raised a captured error.
+    errors : list
+        (fname, error) for each file that raised a captured error, in the
+        order of fnames
+
+    Note
+    ----
+    Threads avoid copying the results between processes and help when
+    reading releases the GIL, as for file input and most parsing done by
+    numpy and pandas. The netCDF C library is not thread-safe, so netCDF
+    files must be read by processes. Errors that are not captured are
+    raised for the first such file in the order of fnames.
+
+    Examples
+    --------
+    ::
+
+        results, errors = pysat.utils.read_files(netCDF4_reader, fnames,
+                                                 workers=4, processes=True,
+                                                 catch=RuntimeError)
+
+    """
+
+    import multiprocessing
+    import multiprocessing.pool
+
+    tasks = [(func, fname, catch) for fname in fnames]
+    workers = max(1, min(int(workers), len(tasks)))
+    if workers == 1:
+        output = [_read_file(task) for task in tasks]
+    else:
+        if processes:
+            pool = multiprocessing.Pool(workers)
+        else:
+            pool = multiprocessing.pool.ThreadPool(workers)
+        try:
+            output = pool.map(_read_file, tasks)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    results = [result for result, err in output]
+    errors = [(fname, err) for fname, (result, err) in zip(fnames, output)
+              if err is not None]
+    return results, errors
+
+
 def load_netcdf4(fnames=None, strict_meta=False, file_format=None,
                  epoch_name='Epoch', units_label='units',
                  name_label='long_name', notes_label='notes',
                  desc_label='desc', plot_label='label', axis_label='axis',
                  scale_label='scale', min_label='value_min',
-                 max_label='value_max', fill_label='fill'):
+                 max_label='value_max', fill_label='fill', variables=None,
+                 start=None, stop=None, workers=1):
     # unix_time=False, **kwargs):
     """Load netCDF-3/4 file produced by pysat.
 
@@ -188,6 +273,20 @@ def load_netcdf4(fnames=None, strict_meta=False, file_format=None,
         keyword for maximum in allowable value range
     fill_label : string ('fill')
         keyword for fill values
+    variables : list-like or NoneType
+        Names of variables to load, in addition to the epoch. Higher order
+        variables are selected by the name of their dimension. Only these
+        variables, and their metadata, are read from file. If None, all
+        variables are loaded. (default=None)
+    start : datetime or NoneType
+        If supplied, only records at or after start are read. The epoch is
+        searched for the first record and only the range of records between
+        start and stop is read for each variable. (default=None)
+    stop : datetime or NoneType
+        If supplied, only records before stop are read. (default=None)
+    workers : int
+        Number of files read at the same time by a pool of processes, see
+        read_files. (default=1)
 
     Returns
     --------
@@ -197,10 +296,8 @@ def load_netcdf4(fnames=None, strict_meta=False, file_format=None,
         Meta data
     """
 
-    import copy
-    import netCDF4
+    import functools
     import pandas as pds
-    import string
     import pysat
     try:
         basestring
@@ -217,271 +314,640 @@ def load_netcdf4(fnames=None, strict_meta=False, file_format=None,
     else:
         file_format = file_format.upper()
 
-    saved_mdata = None
-    running_idx = 0
-    running_store = []
-    two_d_keys = []
-    two_d_dims = []
-    three_d_keys = []
-    three_d_dims = []
-
-    for fname in fnames:
-        with netCDF4.Dataset(fname, mode='r', format=file_format) as data:
-            # build up dictionary with all global ncattrs
-            # and add those attributes to a pysat meta object
-            ncattrsList = data.ncattrs()
-            mdata = pysat.Meta(units_label=units_label, name_label=name_label,
-                               notes_label=notes_label, desc_label=desc_label,
-                               plot_label=plot_label, axis_label=axis_label,
-                               scale_label=scale_label,
-                               min_label=min_label, max_label=max_label,
-                               fill_label=fill_label)
-            for d in ncattrsList:
-                if hasattr(mdata, d):
-                    mdata.__setattr__(d+'_', data.getncattr(d))
-                else:
-                    mdata.__setattr__(d, data.getncattr(d))
-
-            # loadup all of the variables in the netCDF
-            loadedVars = {}
-            for key in data.variables.keys():
-                # load up metadata.  From here group unique
-                # dimensions and act accordingly, 1D, 2D, 3D
-                if len(data.variables[key].dimensions) == 1:
-                    # load 1D data variable
-                    # assuming basic time dimension
-                    loadedVars[key] = data.variables[key][:]
-                    # if key != epoch_name:
-                    # load up metadata
-                    meta_dict = {}
-                    for nc_key in data.variables[key].ncattrs():
-                        meta_dict[nc_key] = \
-                                data.variables[key].getncattr(nc_key)
-                    mdata[key] = meta_dict
-                if len(data.variables[key].dimensions) == 2:
-                    # part of dataframe within dataframe
-                    two_d_keys.append(key)
-                    two_d_dims.append(data.variables[key].dimensions)
-
-                if len(data.variables[key].dimensions) == 3:
-                    # part of full/dedicated dataframe within dataframe
-                    three_d_keys.append(key)
-                    three_d_dims.append(data.variables[key].dimensions)
-
-            # we now have a list of keys that need to go into a dataframe,
-            # could be more than one, collect unique dimensions for 2D keys
-            for dim in set(two_d_dims):
-                # first dimension should be epoch
-                # second dimension name used as variable name
-                obj_key_name = dim[1]
-                # collect variable names associated with dimension
-                idx_bool = [dim == i for i in two_d_dims]
-                idx, = np.where(np.array(idx_bool))
-                obj_var_keys = []
-                clean_var_keys = []
-                for i in idx:
-                    obj_var_keys.append(two_d_keys[i])
-                    clean_var_keys.append(
-                            two_d_keys[i].split(obj_key_name + '_')[-1])
-
-                # figure out how to index this data, it could provide its own
-                # index - or we may have to create simple integer based
-                # DataFrame access. If the dimension is stored as its own
-                # variable then use that info for index
-                if obj_key_name in obj_var_keys:
-                    # string used to indentify dimension also in data.variables
-                    # will be used as an index
-                    index_key_name = obj_key_name
-                    # if the object index uses UNIX time, process into datetime
-                    # index
-                    if data.variables[obj_key_name].getncattr(name_label) == \
-                            epoch_name:
-                        # name to be used in DataFrame index
-                        index_name = epoch_name
-                        time_index_flag = True
-                    else:
-                        time_index_flag = False
-                        # label to be used in DataFrame index
-                        index_name = \
-                            data.variables[obj_key_name].getncattr(name_label)
-                else:
-                    # dimension is not itself a variable
-                    index_key_name = None
-
-                # iterate over the variables and grab metadata
-                dim_meta_data = pysat.Meta(units_label=units_label,
-                                           name_label=name_label,
-                                           notes_label=notes_label,
-                                           desc_label=desc_label,
-                                           plot_label=plot_label,
-                                           axis_label=axis_label,
-                                           scale_label=scale_label,
-                                           min_label=min_label,
-                                           max_label=max_label,
-                                           fill_label=fill_label)
-
-                for key, clean_key in zip(obj_var_keys, clean_var_keys):
-                    # store attributes in metadata, exept for dim name
-                    meta_dict = {}
-                    for nc_key in data.variables[key].ncattrs():
-                        meta_dict[nc_key] = \
-                            data.variables[key].getncattr(nc_key)
-                    dim_meta_data[clean_key] = meta_dict
-
-                dim_meta_dict = {'meta': dim_meta_data}
-                if index_key_name is not None:
-                    # add top level meta
-                    for nc_key in data.variables[obj_key_name].ncattrs():
-                        dim_meta_dict[nc_key] = \
-                            data.variables[obj_key_name].getncattr(nc_key)
-                    mdata[obj_key_name] = dim_meta_dict
-
-                # iterate over all variables with this dimension and store data
-                # data storage, whole shebang
-                loop_dict = {}
-                # list holds a series of slices, parsed from dict above
-                loop_list = []
-                for key, clean_key in zip(obj_var_keys, clean_var_keys):
-                    # data
-                    loop_dict[clean_key] = \
-                        data.variables[key][:, :].flatten(order='C')
-                # number of values in time
-                loop_lim = data.variables[obj_var_keys[0]].shape[0]
-                # number of values per time
-                step_size = len(data.variables[obj_var_keys[0]][0, :])
-                # check if there is an index we should use
-                if not (index_key_name is None):
-                    # an index was found
-                    time_var = loop_dict.pop(index_key_name)
-                    if time_index_flag:
-                        # create datetime index from data
-                        if file_format == 'NETCDF4':
-                            time_var = pds.to_datetime(1E6*time_var)
-                        else:
-                            time_var = pds.to_datetime(1E6*time_var)
-                    new_index = time_var
-                    new_index_name = index_name
-                else:
-                    # using integer indexing
-                    new_index = np.arange(loop_lim*step_size,
-                                          dtype=int) % step_size
-                    new_index_name = 'index'
-                # load all data into frame
-                if len(loop_dict.keys()) > 1:
-                    loop_frame = pds.DataFrame(loop_dict,
-                                               columns=clean_var_keys)
-                    if obj_key_name in loop_frame:
-                        del loop_frame[obj_key_name]
-                    # break massive frame into bunch of smaller frames
-                    for i in np.arange(loop_lim, dtype=int):
-                        loop_list.append(loop_frame.iloc[step_size*i:step_size*(i+1), :])
-                        loop_list[-1].index = new_index[step_size*i:step_size*(i+1)]
-                        loop_list[-1].index.name = new_index_name
-                else:
-                    loop_frame = pds.Series(loop_dict[clean_var_keys[0]],
-                                            name=obj_var_keys[0])
-                    # break massive series into bunch of smaller series
-                    for i in np.arange(loop_lim, dtype=int):
-                        loop_list.append(loop_frame.iloc[step_size*i:step_size*(i+1)])
-                        loop_list[-1].index = new_index[step_size*i:step_size*(i+1)]
-                        loop_list[-1].index.name = new_index_name
-
-                # add 2D object data, all based on a unique dimension within
-                # netCDF, to loaded data dictionary
-                loadedVars[obj_key_name] = loop_list
-                del loop_list
-
-            # we now have a list of keys that need to go into a dataframe,
-            # could be more than one, collect unique dimensions for 2D keys
-            for dim in set(three_d_dims):
-                # collect variable names associated with dimension
-                idx_bool = [dim == i for i in three_d_dims]
-                idx, = np.where(np.array(idx_bool))
-                obj_var_keys = []
-                for i in idx:
-                    obj_var_keys.append(three_d_keys[i])
-
-                for obj_key_name in obj_var_keys:
-                    # store attributes in metadata
-                    meta_dict = {}
-                    for nc_key in data.variables[obj_key_name].ncattrs():
-                        meta_dict[nc_key] = \
-                            data.variables[obj_key_name].getncattr(nc_key)
-                    mdata[obj_key_name] = meta_dict
-
-                    # iterate over all variables with this dimension and store data
-                    # data storage, whole shebang
-                    loop_dict = {}
-                    # list holds a series of slices, parsed from dict above
-                    loop_list = []
-                    loop_dict[obj_key_name] = \
-                        data.variables[obj_key_name][:, :, :]
-                    # number of values in time
-                    loop_lim = data.variables[obj_key_name].shape[0]
-                    # number of values per time
-                    step_size_x = len(data.variables[obj_key_name][0, :, 0])
-                    step_size_y = len(data.variables[obj_key_name][0, 0, :])
-                    step_size = step_size_x
-                    loop_dict[obj_key_name] = \
-                        loop_dict[obj_key_name].reshape((loop_lim*step_size_x,
-                                                         step_size_y))
-                    # check if there is an index we should use
-                    if not (index_key_name is None):
-                        # an index was found
-                        time_var = loop_dict.pop(index_key_name)
-                        if time_index_flag:
-                            # create datetime index from data
-                            if file_format == 'NETCDF4':
-                                time_var = pds.to_datetime(1E6*time_var)
-                            else:
-                                time_var = pds.to_datetime(1E6*time_var)
-                        new_index = time_var
-                        new_index_name = index_name
-                    else:
-                        # using integer indexing
-                        new_index = np.arange(loop_lim*step_size,
-                                              dtype=int) % step_size
-                        new_index_name = 'index'
-                    # load all data into frame
-                    loop_frame = pds.DataFrame(loop_dict[obj_key_name])
-                    # del loop_frame['dimension_1']
-                    # break massive frame into bunch of smaller frames
-                    for i in np.arange(loop_lim, dtype=int):
-                        loop_list.append(loop_frame.iloc[step_size*i:step_size*(i+1), :])
-                        loop_list[-1].index = new_index[step_size*i:step_size*(i+1)]
-                        loop_list[-1].index.name = new_index_name
-
-                    # add 2D object data, all based on a unique dimension within netCDF,
-                    # to loaded data dictionary
-                    loadedVars[obj_key_name] = loop_list
-                    del loop_list
-
-            # prepare dataframe index for this netcdf file
-            time_var = loadedVars.pop(epoch_name)
-
-            # convert from GPS seconds to seconds used in pandas (unix time,
-            # no leap)
-            # time_var = convert_gps_to_unix_seconds(time_var)
-            if file_format == 'NETCDF4':
-                loadedVars[epoch_name] = pds.to_datetime((1E6 *
-                                                          time_var).astype(int))
-            else:
-                loadedVars[epoch_name] = pds.to_datetime((time_var *
-                                                          1E6).astype(int))
-            # loadedVars[epoch_name] = pds.to_datetime((time_var*1E6).astype(int))
-            running_store.append(loadedVars)
-            running_idx += len(loadedVars[epoch_name])
-
-            if strict_meta:
-                if saved_mdata is None:
-                    saved_mdata = copy.deepcopy(mdata)
-                elif (mdata != saved_mdata):
-                    raise ValueError('Metadata across filenames is not the ' +
-                                     'same.')
-
-    # combine all of the data loaded across files together
-    out = []
-    for item in running_store:
-        out.append(pds.DataFrame.from_records(item, index=epoch_name))
-    out = pds.concat(out, axis=0)
+    if variables is not None:
+        if isinstance(variables, basestring):
+            variables = [variables]
+        variables = [var.lower() for var in variables] + [epoch_name.lower()]
+
+    labels = {'units_label': units_label, 'name_label': name_label,
+              'notes_label': notes_label, 'desc_label': desc_label,
+              'plot_label': plot_label, 'axis_label': axis_label,
+              'scale_label': scale_label, 'min_label': min_label,
+              'max_label': max_label, 'fill_label': fill_label}
+
+    read = functools.partial(_load_netcdf4_file, file_format=file_format,
+                             epoch_name=epoch_name, name_label=name_label,
+                             variables=variables, start=start, stop=stop)
+    # the netCDF C library is not thread-safe
+    reads, _ = read_files(read, fnames, workers=workers, processes=True)
+
+    saved_meta = None
+    for frame, file_meta in reads:
+        if strict_meta:
+            if saved_meta is None:
+                saved_meta = file_meta
+            elif not _nc_meta_equal(file_meta, saved_meta):
+                raise ValueError('Metadata across filenames is not the ' +
+                                 'same.')
+
+    # combine all of the data loaded across files together, metadata comes
+    # from the last file
+    out = pds.concat([frame for frame, file_meta in reads], axis=0)
+    mdata = _nc_meta(file_meta, labels)
     return out, mdata
+
+
+def _load_netcdf4_file(fname, file_format='NETCDF4', epoch_name='Epoch',
+                       name_label='long_name', variables=None, start=None,
+                       stop=None):
+    """Load data and metadata from a single netCDF-3/4 file.
+
+    Parameters are the same as load_netcdf4, except variables must already
+    be lower case and include the epoch.
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+        data within file
+    file_meta : tuple
+        global attributes, list of (variable, attributes) pairs, and list of
+        (dimension, metadata) pairs for higher order variables
+
+    """
+
+    import netCDF4
+    import pandas as pds
+
+    with netCDF4.Dataset(fname, mode='r', format=file_format) as data:
+        # global attributes, added to the pysat Meta object later
+        global_attrs = dict((attr, data.getncattr(attr))
+                            for attr in data.ncattrs())
+        # attributes of each variable, in file order
+        var_meta = []
+        ho_meta = []
+
+        # range of records to be read, located with a binary search
+        # on the monotonic epoch
+        tslice = slice(None)
+        if (start is not None) or (stop is not None):
+            epoch = pds.to_datetime((1E6 * data.variables[epoch_name][:]
+                                     ).astype(int))
+            first = 0 if start is None else \
+                epoch.searchsorted(start, side='left')
+            last = len(epoch) if stop is None else \
+                epoch.searchsorted(stop, side='left')
+            tslice = slice(first, last)
+
+        # group variables by their dimensions, 2D variables are
+        # identified by their second dimension
+        loadedVars = {}
+        two_d_keys = {}
+        three_d_keys = []
+        for key, var in data.variables.items():
+            dims = var.dimensions
+            if variables is not None:
+                name = dims[1] if len(dims) == 2 else key
+                if name.lower() not in variables:
+                    continue
+            if len(dims) == 1:
+                # basic time series, read in one go
+                loadedVars[key] = var[tslice]
+                var_meta.append((key, _nc_attrs(var)))
+            elif len(dims) == 2:
+                # part of a Series of DataFrames or Series
+                two_d_keys.setdefault(dims[1], []).append(key)
+            elif len(dims) == 3:
+                # full DataFrame at each time
+                three_d_keys.append(key)
+
+        for obj_key_name, obj_var_keys in two_d_keys.items():
+            loadedVars[obj_key_name], dim_meta = \
+                _load_netcdf4_2d(data, obj_key_name, obj_var_keys, tslice,
+                                 epoch_name, name_label)
+            if dim_meta is not None:
+                ho_meta.append((obj_key_name, dim_meta))
+
+        for key in three_d_keys:
+            loadedVars[key] = _load_netcdf4_3d(data.variables[key], tslice)
+            var_meta.append((key, _nc_attrs(data.variables[key])))
+
+        # prepare dataframe index for this netcdf file, converting from
+        # milliseconds to nanoseconds used by pandas (unix time, no leap)
+        time_var = loadedVars.pop(epoch_name)
+        loadedVars[epoch_name] = pds.to_datetime((1E6 *
+                                                  time_var).astype(int))
+        frame = pds.DataFrame.from_records(loadedVars, index=epoch_name)
+
+    return frame, (global_attrs, var_meta, ho_meta)
+
+
+def _nc_attrs(variable):
+    """Dictionary of the attributes of a netCDF4 variable."""
+
+    return dict((attr, variable.getncattr(attr))
+                for attr in variable.ncattrs())
+
+
+def _nc_attrs_equal(attrs1, attrs2):
+    """Compare attribute dictionaries, treating NaN values as equal."""
+
+    if sorted(attrs1.keys()) != sorted(attrs2.keys()):
+        return False
+    for key in attrs1:
+        value1 = attrs1[key]
+        value2 = attrs2[key]
+        if np.shape(value1) != np.shape(value2):
+            return False
+        if np.all(value1 == value2):
+            continue
+        try:
+            if not np.all(np.isnan(value1) & np.isnan(value2)):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+def _nc_meta_equal(file_meta1, file_meta2):
+    """Compare the variable metadata read from two files.
+
+    Global attributes are not compared, consistent with the comparison of
+    pysat.Meta objects.
+
+    """
+
+    _, var_meta1, ho_meta1 = file_meta1
+    _, var_meta2, ho_meta2 = file_meta2
+    var_meta1 = dict(var_meta1)
+    var_meta2 = dict(var_meta2)
+    if sorted(var_meta1.keys()) != sorted(var_meta2.keys()):
+        return False
+    for key in var_meta1:
+        if not _nc_attrs_equal(var_meta1[key], var_meta2[key]):
+            return False
+
+    ho_meta1 = dict(ho_meta1)
+    ho_meta2 = dict(ho_meta2)
+    if sorted(ho_meta1.keys()) != sorted(ho_meta2.keys()):
+        return False
+    for key in ho_meta1:
+        sub_meta1, index_meta1 = ho_meta1[key]
+        sub_meta2, index_meta2 = ho_meta2[key]
+        if not _nc_attrs_equal(index_meta1, index_meta2):
+            return False
+        sub_meta1 = dict(sub_meta1)
+        sub_meta2 = dict(sub_meta2)
+        if sorted(sub_meta1.keys()) != sorted(sub_meta2.keys()):
+            return False
+        for sub_key in sub_meta1:
+            if not _nc_attrs_equal(sub_meta1[sub_key], sub_meta2[sub_key]):
+                return False
+    return True
+
+
+def _nc_meta(file_meta, labels):
+    """Create a pysat.Meta object from the metadata read from a file.
+
+    Parameters
+    ----------
+    file_meta : tuple
+        global attributes, list of (variable, attributes) pairs, and list of
+        (dimension, (list of (variable, attributes) pairs, index attributes))
+        pairs for higher order variables
+    labels : dict
+        metadata labels passed to pysat.Meta
+
+    Returns
+    -------
+    pysat.Meta
+
+    """
+
+    global_attrs, var_meta, ho_meta = file_meta
+    mdata = pysat.Meta(**labels)
+    for attr, value in global_attrs.items():
+        if hasattr(mdata, attr):
+            mdata.__setattr__(attr + '_', value)
+        else:
+            mdata.__setattr__(attr, value)
+    for key, meta_dict in var_meta:
+        mdata[key] = meta_dict
+    for obj_key_name, (sub_meta, index_meta) in ho_meta:
+        dim_meta_data = pysat.Meta(**labels)
+        for key, meta_dict in sub_meta:
+            dim_meta_data[key] = meta_dict
+        dim_meta_dict = dict(index_meta)
+        dim_meta_dict['meta'] = dim_meta_data
+        mdata[obj_key_name] = dim_meta_dict
+    return mdata
+
+
+def _unmask(values):
+    """Data of a masked array, with NaN for any masked numbers."""
+
+    if isinstance(values, np.ma.MaskedArray):
+        if not np.ma.is_masked(values):
+            return values.data
+        if values.dtype.kind in 'iuf':
+            return values.astype(float).filled(np.nan)
+    return values
+
+
+def _load_netcdf4_2d(data, obj_key_name, obj_var_keys, tslice, epoch_name,
+                     name_label):
+    """Load variables sharing a dimension as a Series of Frames or Series.
+
+    Parameters
+    ----------
+    data : netCDF4.Dataset
+        open file
+    obj_key_name : string
+        name of the second dimension, used as the variable name
+    obj_var_keys : list of strings
+        netCDF4 variables with dimensions (epoch, obj_key_name)
+    tslice : slice
+        range of records to read
+    epoch_name : string
+        Label in file for datetime index
+    name_label : string
+        keyword for informative name label
+
+    Returns
+    -------
+    loop_list : list
+        DataFrame or Series for each time
+    dim_meta : tuple or NoneType
+        list of (variable, attributes) pairs and the attributes of the index
+        variable, None if there is no index variable
+
+    """
+
+    import pandas as pds
+
+    # strip the dimension name from the variable names
+    clean_var_keys = [key.split(obj_key_name + '_')[-1]
+                      for key in obj_var_keys]
+    # each variable is read once as a (time, obj_key_name) array
+    values = [_unmask(data.variables[key][tslice, :])
+              for key in obj_var_keys]
+    loop_lim, step_size = values[0].shape
+
+    # the dimension may be stored as its own variable, providing the index,
+    # otherwise simple integer based DataFrame access is used
+    if obj_key_name in obj_var_keys:
+        index_var = data.variables[obj_key_name]
+        index_values = values.pop(obj_var_keys.index(obj_key_name))
+        # if the object index uses UNIX time, process into datetime index
+        if index_var.getncattr(name_label) == epoch_name:
+            new_index = pds.to_datetime(1E6 * index_values.flatten())
+            new_index.name = epoch_name
+            index = [new_index[step_size * i:step_size * (i + 1)]
+                     for i in range(loop_lim)]
+        elif (loop_lim > 0) and np.all(index_values == index_values[0]):
+            # same index (e.g. altitude grid) at every time, frames get
+            # views of one Index so names may still be changed separately
+            new_index = pds.Index(index_values[0],
+                                  name=index_var.getncattr(name_label))
+            index = [new_index.view() for i in range(loop_lim)]
+        else:
+            new_index = pds.Index(index_values.flatten(),
+                                  name=index_var.getncattr(name_label))
+            index = [new_index[step_size * i:step_size * (i + 1)]
+                     for i in range(loop_lim)]
+        dim_meta = ([(clean_key, _nc_attrs(data.variables[key]))
+                     for key, clean_key in zip(obj_var_keys, clean_var_keys)],
+                    _nc_attrs(index_var))
+    else:
+        new_index = pds.Index(np.arange(step_size), name='index')
+        index = [new_index.view() for i in range(loop_lim)]
+        dim_meta = None
+
+    data_keys = [key for key in obj_var_keys if key != obj_key_name]
+    columns = [clean_key for clean_key in clean_var_keys
+               if clean_key != obj_key_name]
+    if len(columns) > 1:
+        if len(set(value.dtype for value in values)) == 1:
+            # all columns have the same type, each frame is a view of one
+            # (time, obj_key_name, column) array
+            block = np.stack(values, axis=-1)
+            columns = pds.Index(columns)
+            loop_list = [pds.DataFrame(block[i], index=index[i],
+                                       columns=columns, copy=False)
+                         for i in range(loop_lim)]
+        else:
+            loop_list = [pds.DataFrame(dict((column, value[i]) for column,
+                                            value in zip(columns, values)),
+                                       index=index[i], columns=columns)
+                         for i in range(loop_lim)]
+    else:
+        loop_list = [pds.Series(values[0][i], index=index[i],
+                                name=data_keys[0])
+                     for i in range(loop_lim)]
+    return loop_list, dim_meta
+
+
+def _load_netcdf4_3d(variable, tslice):
+    """Load a variable with a full DataFrame at each time.
+
+    Parameters
+    ----------
+    variable : netCDF4.Variable
+        variable with dimensions (epoch, rows, columns)
+    tslice : slice
+        range of records to read
+
+    Returns
+    -------
+    list
+        DataFrame for each time, with an integer index
+
+    """
+
+    import pandas as pds
+
+    values = _unmask(variable[tslice, :, :])
+    index = pds.Index(np.arange(values.shape[1]), name='index')
+    return [pds.DataFrame(value, index=index.view(), copy=False)
+            for value in values]
+
+
+class NetCDF4Writer(object):
+    """Write Instrument data to a netCDF4 file one load at a time.
+
+    Parameters
+    ----------
+    fname : string
+        full path of file to write
+    base_instrument : pysat.Instrument or NoneType
+        used as a comparison, only attributes that are present with
+        the written Instrument and not on base_instrument are written to
+        netCDF. Default Instrument() if None. (default=None)
+    epoch_name : string
+        Label in file for datetime index of Instrument object
+        (default='Epoch')
+    zlib : boolean
+        Flag for engaging zlib compression (True - compression on)
+        (default=False)
+    complevel : int
+        an integer between 1 and 9 describing the level of compression
+        desired. Ignored if zlib=False (default=4)
+    shuffle : boolean
+        the HDF5 shuffle filter will be applied before compressing the data.
+        Ignored if zlib=False. (default=True)
+    chunk_size : int
+        number of samples in each chunk along the epoch dimension
+        (default=4096)
+    preserve_meta_case : boolean
+        if True, then the variable strings within the MetaData object are
+        used to name variables in the written netCDF file (default=False)
+
+    Note
+    ----
+    Files have the same layout as those from Instrument.to_netcdf4, and
+    may be read with load_netcdf4, except that the epoch dimension is
+    unlimited. Variables, metadata, chunking, and compression are set up
+    from the first data written, and all later data must have the same
+    variables. Each write is flushed to disk so memory use does not grow
+    with the number of loads. Global attributes, including Date_Start and
+    Date_End, are written on close. Only pandas Instruments are supported.
+
+    Examples
+    --------
+    ::
+
+        inst.bounds = (start, stop)
+        with pysat.utils.NetCDF4Writer('season.nc', zlib=True) as writer:
+            writer.write_season(inst)
+
+        # or, writing derived products
+        writer = pysat.utils.NetCDF4Writer('season.nc')
+        for inst in inst:
+            inst['mlt_deg'] = inst['mlt'] * 15.
+            writer.write(inst)
+        writer.close()
+
+    """
+
+    def __init__(self, fname, base_instrument=None, epoch_name='Epoch',
+                 zlib=False, complevel=4, shuffle=True, chunk_size=4096,
+                 preserve_meta_case=False):
+        import netCDF4
+
+        self.fname = fname
+        self.base_instrument = base_instrument
+        self.epoch_name = epoch_name
+        self.zlib = zlib
+        self.complevel = complevel
+        self.shuffle = shuffle
+        self.chunk_size = chunk_size
+        self.preserve_meta_case = preserve_meta_case
+        # number of samples written
+        self.num = 0
+        self._start = None
+        self._stop = None
+        self._last_inst = None
+        # how each Instrument variable is stored, set by first write
+        self._vars = None
+        self._out = netCDF4.Dataset(fname, mode='w', format='NETCDF4')
+        self._out.createDimension(epoch_name, None)
+
+    def __repr__(self):
+        return ''.join(('pysat NetCDF4Writer(fname=', repr(self.fname),
+                        ', num=', str(self.num), ')'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _create_variable(self, name, coltype, dims, chunks):
+        """Create a variable with the writer's compression settings."""
+
+        return self._out.createVariable(name, coltype, dimensions=dims,
+                                        zlib=self.zlib,
+                                        complevel=self.complevel,
+                                        shuffle=self.shuffle,
+                                        chunksizes=chunks)
+
+    def _variable_meta(self, inst, meta, coltype, depend_1=None,
+                       display='Time Series', remove=False):
+        """Metadata for a variable, filtered for netCDF4."""
+
+        meta['Depend_0'] = self.epoch_name
+        if depend_1 is not None:
+            meta['Depend_1'] = depend_1
+        meta['Display_Type'] = display
+        meta['Format'] = inst._get_var_type_code(coltype)
+        meta['Var_Type'] = 'data'
+        return inst._filter_netcdf4_metadata(meta, coltype, remove=remove)
+
+    def _setup(self, inst):
+        """Create variables and metadata from the first data written."""
+
+        lower_variables = [var.lower() for var in inst.variables]
+        if len(np.unique(lower_variables)) != len(lower_variables):
+            raise ValueError('There are multiple variables with the same ' +
+                             'name but different case which results in a ' +
+                             'loss of metadata. Please make the names unique.')
+
+        export_meta, export_labels = inst._netcdf4_export_meta()
+        epoch = self._create_variable(self.epoch_name, 'i8',
+                                      (self.epoch_name,), (self.chunk_size,))
+        epoch.setncatts(inst._netcdf4_epoch_meta(export_meta, export_labels,
+                                                 self.epoch_name))
+
+        self._vars = {}
+        for key in inst.variables:
+            if self.preserve_meta_case:
+                case_key = inst.meta.var_case_name(key)
+            else:
+                case_key = key
+            data, coltype, datetime_flag = inst._get_data_info(inst[key],
+                                                               'NETCDF4')
+            if inst[key].dtype != np.dtype('O'):
+                # simple 1D data
+                cdfkey = self._create_variable(case_key, coltype,
+                                               (self.epoch_name,),
+                                               (self.chunk_size,))
+                if case_key in export_meta:
+                    cdfkey.setncatts(self._variable_meta(
+                        inst, export_meta[case_key], coltype))
+                self._vars[key] = ('1D', case_key, coltype, datetime_flag)
+            elif (coltype == type(' ')) or (coltype == type(u' ')):
+                # strings, with no fill value
+                cdfkey = self._create_variable(case_key, coltype,
+                                               (self.epoch_name,),
+                                               (self.chunk_size,))
+                if case_key in export_meta:
+                    cdfkey.setncatts(self._variable_meta(
+                        inst, export_meta[case_key], coltype, remove=True))
+                self._vars[key] = ('string', case_key)
+            else:
+                self._setup_higher_order(inst, key, case_key, export_meta,
+                                         export_labels)
+
+    def _setup_higher_order(self, inst, key, case_key, export_meta,
+                            export_labels):
+        """Create variables for a Series of DataFrames or Series."""
+
+        # first element with data determines the dimensions and types
+        first = inst[key].iloc[0]
+        for item in inst[key]:
+            if len(item) > 0:
+                first = item
+                break
+        size = len(first)
+        self._out.createDimension(case_key, size)
+        dims = (self.epoch_name, case_key)
+        chunks = (max(1, min(self.chunk_size, self.chunk_size // size)),
+                  size) if size > 0 else None
+
+        try:
+            # Series of DataFrames, one variable per column
+            cols = list(first.columns)
+            names = [case_key + '_' + col for col in cols]
+        except AttributeError:
+            # Series of Series
+            cols = [None]
+            names = [case_key + '_data']
+        for col, name in zip(cols, names):
+            values = first[col] if col is not None else first
+            _, coltype, _ = inst._get_data_info(values, 'NETCDF4')
+            cdfkey = self._create_variable(name, coltype, dims, chunks)
+            meta_key = name if col is not None else case_key
+            if meta_key in export_meta:
+                cdfkey.setncatts(self._variable_meta(
+                    inst, export_meta[meta_key], coltype,
+                    depend_1=case_key, display='Spectrogram'))
+
+        # index of the higher order data
+        _, coltype, datetime_flag = inst._get_data_info(first.index,
+                                                        'NETCDF4')
+        cdfkey = self._create_variable(case_key, coltype, dims, chunks)
+        new_dict = export_meta[case_key] if case_key in export_meta else {}
+        if datetime_flag:
+            for label in export_labels['name_label']:
+                new_dict[label] = self.epoch_name
+            for label in export_labels['units_label']:
+                new_dict[label] = 'Milliseconds since 1970-1-1 00:00:00'
+        else:
+            index_name = first.index.name
+            for label in export_labels['name_label']:
+                new_dict[label] = key if index_name is None else index_name
+        cdfkey.setncatts(self._variable_meta(inst, new_dict, coltype,
+                                             depend_1=case_key))
+        self._vars[key] = ('higher', case_key, cols, names, coltype,
+                           datetime_flag)
+
+    def write(self, inst):
+        """Append the data loaded in inst to the file.
+
+        Parameters
+        ----------
+        inst : pysat.Instrument
+            Instrument with data, empty Instruments are skipped
+
+        """
+
+        if not inst.pandas_format:
+            raise ValueError('NetCDF4Writer only supports pandas Instruments.')
+        if inst.empty:
+            return
+        if self._vars is None:
+            self._setup(inst)
+        elif sorted(self._vars.keys()) != sorted(inst.variables):
+            raise ValueError('Variables must be the same for every write.')
+
+        start = self.num
+        stop = start + len(inst.index)
+        self._out[self.epoch_name][start:stop] = \
+            (inst.index.values.astype(np.int64) * 1.E-6).astype(np.int64)
+        for key, info in self._vars.items():
+            if info[0] == '1D':
+                _, case_key, coltype, datetime_flag = info
+                values = inst[key].values
+                if datetime_flag:
+                    # datetime is in nanoseconds, storing milliseconds
+                    values = (values.astype(coltype) * 1.E-6).astype(coltype)
+                self._out[case_key][start:stop] = values.astype(coltype)
+            elif info[0] == 'string':
+                self._out[info[1]][start:stop] = inst[key].values
+            else:
+                _, case_key, cols, names, coltype, datetime_flag = info
+                items = list(inst[key])
+                for col, name in zip(cols, names):
+                    if col is None:
+                        values = np.vstack([item.values for item in items])
+                    else:
+                        values = np.vstack([item[col].values
+                                            for item in items])
+                    cdfkey = self._out[name]
+                    cdfkey[start:stop, :] = values.astype(cdfkey.dtype)
+                index = np.vstack([np.asarray(item.index) for item in items])
+                if datetime_flag:
+                    index = (index.astype(np.int64) * 1.E-6)
+                self._out[case_key][start:stop, :] = index.astype(coltype)
+
+        if self._start is None:
+            self._start = inst.index[0]
+        self._stop = inst.index[-1]
+        self._last_inst = inst
+        self.num = stop
+        self._out.sync()
+
+    def write_season(self, inst):
+        """Append each day (or file) of data within inst.bounds.
+
+        Parameters
+        ----------
+        inst : pysat.Instrument
+            Instrument iterated over to load data
+
+        """
+
+        for inst in inst:
+            self.write(inst)
+
+    def close(self):
+        """Write global attributes and close the file."""
+
+        if not self._out.isopen():
+            return
+        if self._last_inst is not None:
+            base_instrument = self.base_instrument
+            if base_instrument is None:
+                base_instrument = pysat.Instrument()
+            self._out.setncatts(self._last_inst._netcdf4_file_attrs(
+                self.fname, base_instrument, self._start, self._stop))
+        self._out.close()